@@ -0,0 +1,166 @@
+"""Filter engine micro-benchmarks.
+
+    python benchmarks/bench_filter_engine.py                 # print results as JSON
+    python benchmarks/bench_filter_engine.py --check         # fail on regressions
+    python benchmarks/bench_filter_engine.py --output out.json
+
+Measures per-sale latency (p50/p99) and throughput of filter_item on an
+indexed filter set, throughput of filter_batch, and of a plain linear scan
+over the compiled filters (on the first --linear-sales sales), for each
+filter count. Both indexed paths run one untimed pass over the sales first,
+so the numbers are the monitor's steady state (the index caches candidates
+per item).
+
+Absolute figures depend on the machine, so --check gates on ratios measured
+in the same run instead: index vs linear scan, batch vs item, and the p99/p50
+tail of filter_item. The limits live in thresholds.json next to this file.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "core")))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from filter_engine import build_filter_index, compile_filters, filter_batch, filter_item
+from synthetic import make_filters, make_sales
+
+THRESHOLDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "thresholds.json")
+
+
+def _percentile(ordered, p):
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def bench_filter_item(index, sales):
+    for sale in sales:
+        filter_item(sale, index)
+    timings = []
+    matches = 0
+    clock = time.perf_counter_ns
+    started = clock()
+    for sale in sales:
+        t0 = clock()
+        if filter_item(sale, index)[0]:
+            matches += 1
+        timings.append(clock() - t0)
+    total = (clock() - started) / 1e9
+    timings.sort()
+    return {
+        "sales_per_sec": round(len(sales) / total, 1),
+        "p50_us": round(_percentile(timings, 0.5) / 1000, 3),
+        "p99_us": round(_percentile(timings, 0.99) / 1000, 3),
+        "matches": matches,
+    }
+
+
+def bench_filter_batch(index, sales, batch_size):
+    for start in range(0, len(sales), batch_size):
+        filter_batch(sales[start:start + batch_size], index)
+    started = time.perf_counter()
+    matches = 0
+    for start in range(0, len(sales), batch_size):
+        matches += len(filter_batch(sales[start:start + batch_size], index))
+    total = time.perf_counter() - started
+    return {"sales_per_sec": round(len(sales) / total, 1), "matches": matches}
+
+
+def bench_linear_scan(plans, sales):
+    started = time.perf_counter()
+    matches = sum(1 for sale in sales if filter_item(sale, plans)[0])
+    total = time.perf_counter() - started
+    return {"sales_per_sec": round(len(sales) / total, 1), "matches": matches}
+
+
+def ratios(result):
+    """Machine independent figures of one filter count, see check()"""
+    item, batch, linear = result["filter_item"], result["filter_batch"], result["linear_scan"]
+    return {
+        "index_vs_linear": round(item["sales_per_sec"] / linear["sales_per_sec"], 3),
+        "batch_vs_item": round(batch["sales_per_sec"] / item["sales_per_sec"], 3),
+        "item_p99_vs_p50": round(item["p99_us"] / item["p50_us"], 3) if item["p50_us"] else None,
+    }
+
+
+def run(filter_counts, sale_count, batch_size, seed, linear_sales=500):
+    sales = make_sales(sale_count, seed=seed)
+    results = {}
+    for count in filter_counts:
+        params = make_filters(count, seed=seed + 1)
+        index = build_filter_index(params)
+        filter_item_result = bench_filter_item(index, sales)
+        filter_batch_result = bench_filter_batch(index, sales, batch_size)
+        if filter_item_result["matches"] != filter_batch_result["matches"]:
+            raise AssertionError(f"filter_item and filter_batch disagree for {count} filters")
+        linear_result = bench_linear_scan(compile_filters(params), sales[:linear_sales])
+        results[str(count)] = {"filter_item": filter_item_result, "filter_batch": filter_batch_result,
+                               "linear_scan": linear_result}
+        results[str(count)]["ratios"] = ratios(results[str(count)])
+    return {
+        "python": platform.python_version(),
+        "sales": sale_count,
+        "linear_sales": min(linear_sales, sale_count),
+        "batch_size": batch_size,
+        "seed": seed,
+        "results": results,
+    }
+
+
+def check(report, thresholds):
+    """Return a list of human readable regressions.
+
+    `thresholds` maps a filter count to {ratio: {"min": x} or {"max": y}},
+    with the ratio names from ratios().
+    """
+    failures = []
+    for count, limits in thresholds.items():
+        measured = report["results"].get(count)
+        if measured is None:
+            continue
+        for name, bounds in limits.items():
+            value = measured["ratios"].get(name)
+            if value is None:
+                continue
+            if "min" in bounds and value < bounds["min"]:
+                failures.append(f"{name} with {count} filters: {value} < {bounds['min']}")
+            if "max" in bounds and value > bounds["max"]:
+                failures.append(f"{name} with {count} filters: {value} > {bounds['max']}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filters", default="1,100,10000", help="comma separated filter counts")
+    parser.add_argument("--sales", type=int, default=5000, help="number of synthetic sales")
+    parser.add_argument("--batch-size", type=int, default=200, help="sales per filter_batch call")
+    parser.add_argument("--linear-sales", type=int, default=500, help="sales for the linear scan baseline")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--check", action="store_true", help="exit with 1 if a threshold is violated")
+    parser.add_argument("--thresholds", default=THRESHOLDS_FILE)
+    args = parser.parse_args()
+
+    report = run([int(c) for c in args.filters.split(",")], args.sales, args.batch_size, args.seed,
+                 args.linear_sales)
+
+    if args.check:
+        with open(args.thresholds, "r") as f:
+            report["regressions"] = check(report, json.load(f))
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    print(text)
+
+    if args.check and report["regressions"]:
+        for failure in report["regressions"]:
+            print("REGRESSION:", failure, file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Seeded generator of realistic-looking sales and filters for benchmarks"""
+import random
+from typing import Any, Dict, List
+
+WEAPONS = [
+    "AK-47", "M4A4", "M4A1-S", "AWP", "Desert Eagle", "USP-S", "Glock-18", "MP9", "MAC-10",
+    "P250", "FAMAS", "Galil AR", "SSG 08", "UMP-45", "P90", "Five-SeveN", "Tec-9", "CZ75-Auto",
+]
+KNIVES = ["Karambit", "Butterfly Knife", "M9 Bayonet", "Bayonet", "Flip Knife", "Talon Knife", "Skeleton Knife"]
+GLOVES = ["Sport Gloves", "Specialist Gloves", "Driver Gloves", "Moto Gloves"]
+SKINS = [
+    "Redline", "Asiimov", "Doppler", "Fade", "Tiger Tooth", "Case Hardened", "Slaughter", "Hyper Beast",
+    "Vulcan", "Neo-Noir", "Printstream", "The Bronze", "Nexus", "Crimson Web", "Marble Fade", "Bloodsport",
+]
+# (name, wear range)
+EXTERIORS = [
+    ("Factory New", 0.0, 0.07),
+    ("Minimal Wear", 0.07, 0.15),
+    ("Field-Tested", 0.15, 0.38),
+    ("Well-Worn", 0.38, 0.45),
+    ("Battle-Scarred", 0.45, 1.0),
+]
+
+
+def _item(rng: random.Random):
+    kind = rng.random()
+    if kind < 0.15:
+        base, category = rng.choice(KNIVES), "Knife"
+    elif kind < 0.2:
+        base, category = rng.choice(GLOVES), "Gloves"
+    else:
+        base, category = rng.choice(WEAPONS), "Rifle"
+    return base, rng.choice(SKINS), category
+
+
+def make_sales(count: int, seed: int = 1) -> List[Dict[str, Any]]:
+    """Feed events shaped like the relay output"""
+    rng = random.Random(seed)
+    sales = []
+    for sale_id in range(count):
+        base, skin, category = _item(rng)
+        exterior, low, high = rng.choice(EXTERIORS)
+        stattrak = category != "Gloves" and rng.random() < 0.2
+        prefix = ("★ " if category in ("Knife", "Gloves") else "") + ("StatTrak™ " if stattrak else "")
+        market_name = f"{prefix}{base} | {skin} ({exterior})"
+        price = int(rng.lognormvariate(8, 1.5)) + 3  # cents
+        sales.append({
+            "eventType": "listed",
+            "sale": {
+                "saleId": 60_000_000 + sale_id,
+                "marketName": market_name,
+                "marketHashName": market_name,
+                "category": category,
+                "salePrice": price,
+                "wear": rng.uniform(low, high),
+                "pattern": rng.randint(0, 1000),
+                "exterior": exterior,
+                "stattrak": stattrak,
+                "currency": "EUR",
+            },
+            "timestamp": 1746650292048 + sale_id,
+        })
+    return sales
+
+
+def make_filters(count: int, seed: int = 2) -> Dict[str, Any]:
+    """script_params.json style dict with `count` filters"""
+    rng = random.Random(seed)
+    filters = []
+    for _ in range(count):
+        base, skin, _ = _item(rng)
+        roll = rng.random()
+        if roll < 0.4:
+            name = f"{base} | {skin}"
+        elif roll < 0.7:
+            name = base
+        elif roll < 0.85:
+            name = skin
+        else:
+            name = f"StatTrak™ {base}"
+        filter_params = {"name": name}
+        if rng.random() < 0.6:
+            low = rng.randint(100, 50_000)
+            filter_params["minPrice"] = str(low)
+            filter_params["maxPrice"] = str(low + rng.randint(100, 200_000))
+        if rng.random() < 0.3:
+            filter_params["exterior"] = rng.choice(EXTERIORS)[0]
+        if rng.random() < 0.3:
+            filter_params["maxWear"] = f"{rng.uniform(0.01, 0.5):.4f}"
+        if rng.random() < 0.1:
+            filter_params["patterns"] = ", ".join(str(rng.randint(0, 1000)) for _ in range(rng.randint(1, 20)))
+        filters.append(filter_params)
+    return {"filters": filters}
@@ -2,6 +2,10 @@ import discord
 from discord.ext import commands
 import os
 from dotenv import load_dotenv
+from .notifiers import (
+    CircuitBreaker, DiscordChannelSink, DiscordWebhookSink, HttpWebhookSink, JsonlFileSink,
+    NotificationFanout, SinkQueue,
+)
 
 load_dotenv()
 
@@ -16,26 +20,52 @@ intents.guilds = True
 
 bot = commands.Bot(command_prefix="!", intents=intents)
 
-async def send_to_discord(sale):
-    channel = bot.get_channel(DISCORD_CHANNEL_ID)
+def build_embed(sale):
+    """Build the notification embed for a single sale (a core Sale record)"""
     steam_image_base = "https://steamcommunity.com/economy/image/"
 
-    if channel:
-        embed = discord.Embed(
-            title=f"🛒 New: {sale.get('marketHashName', 'Unknown skin')}",
-            description=f"Price: {sale.get('salePrice', 'Unknown')} {sale.get('currency', '')}",
-            color=discord.Color.green()
+    price = f"{sale.display_price:.2f}" if sale.price is not None else "Unknown"
+    embed = discord.Embed(
+        title=f"🛒 New: {sale.market_hash_name or 'Unknown skin'}",
+        description=f"Price: {price} {sale.currency}",
+        color=discord.Color.green()
+    )
+    image_url = steam_image_base + sale.image
+    embed.set_thumbnail(url=image_url)
+    embed.add_field(name="Exterior", value=sale.exterior.label or 'Unknown', inline=True)
+    embed.add_field(name="Wear", value=sale.wear if sale.wear is not None else 'Unknown', inline=True)
+    embed.add_field(name="Pattern", value=sale.pattern if sale.pattern is not None else 'Unknown', inline=True)
+    embed.add_field(name="Stattrak", value=sale.stattrak if sale.stattrak is not None else 'Unknown', inline=True)
+    embed.add_field(name="Inspect", value=f"[Picture]({image_url})", inline=True)
+    embed.add_field(name="Link", value=f"[Show skin](https://skinport.com/item/{sale.url})", inline=True)
+    return embed
+
+def build_notifications():
+    """Fan-out to the Discord channel plus every sink configured in the environment"""
+    sinks = [DiscordChannelSink(bot, DISCORD_CHANNEL_ID, build_embed,
+                                workers=int(os.getenv('NOTIFY_WORKERS', '2')))]
+    if os.getenv('DISCORD_WEBHOOK_URL'):
+        sinks.append(DiscordWebhookSink(os.getenv('DISCORD_WEBHOOK_URL'), build_embed))
+    if os.getenv('NOTIFY_WEBHOOK_URL'):
+        sinks.append(HttpWebhookSink(os.getenv('NOTIFY_WEBHOOK_URL')))
+    if os.getenv('NOTIFY_JSONL_FILE'):
+        sinks.append(JsonlFileSink(os.getenv('NOTIFY_JSONL_FILE')))
+
+    return NotificationFanout(
+        SinkQueue(
+            sink,
+            maxsize=int(os.getenv('NOTIFY_QUEUE_SIZE', '1000')),
+            timeout=float(os.getenv('NOTIFY_TIMEOUT', '10')),
+            breaker=CircuitBreaker(
+                failure_threshold=int(os.getenv('NOTIFY_BREAKER_FAILURES', '5')),
+                reset_timeout=float(os.getenv('NOTIFY_BREAKER_RESET', '30')),
+            ),
         )
-        image_url = steam_image_base + sale.get('image', '')
-        embed.set_thumbnail(url=image_url)
-        embed.add_field(name="Exterior", value=sale.get('exterior', 'Unknown'), inline=True)
-        embed.add_field(name="Wear", value=sale.get('wear', 'Unknown'), inline=True)
-        embed.add_field(name="Pattern", value=sale.get('pattern', 'Unknown'), inline=True)
-        embed.add_field(name="Stattrak", value=sale.get('stattrak', 'Unknown'), inline=True)
-        embed.add_field(name="Inspect", value=f"[Picture]({image_url})", inline=True)
-        embed.add_field(name="Link", value=f"[Show skin](https://skinport.com/item/{sale.get('url', '')})", inline=True)
-        
-        await channel.send(embed=embed)
+        for sink in sinks
+    )
+
+
+notifications = build_notifications()
 
 
 @bot.event
@@ -45,4 +75,4 @@ async def on_ready():
 
 @bot.command()
 async def ping(ctx):
-    await ctx.send('@everyone Pong!')
\ No newline at end of file
+    await ctx.send('@everyone Pong!')
@@ -0,0 +1,376 @@
+import asyncio
+import json
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+
+import aiohttp
+import discord
+
+# Discord accepts at most 10 embeds per message
+MAX_EMBEDS_PER_MESSAGE = 10
+
+
+class SinkError(Exception):
+    """A sink could not deliver a batch"""
+
+
+class CircuitBreaker:
+    """Stops calling a failing backend for a while.
+
+    After `failure_threshold` consecutive failures the breaker opens and
+    allow() refuses everything for `reset_timeout` seconds. Then a single
+    trial batch is let through (half-open): success closes the breaker,
+    failure opens it again.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.trips = 0
+        self._opened_at = None
+        self._trial = False
+
+    @property
+    def state(self):
+        if self._opened_at is None:
+            return 'closed'
+        if self._trial or self.clock() - self._opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def allow(self):
+        if self._opened_at is None:
+            return True
+        if self._trial or self.clock() - self._opened_at < self.reset_timeout:
+            return False
+        self._trial = True
+        return True
+
+    def record_success(self):
+        self.failures = 0
+        self._opened_at = None
+        self._trial = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._trial or self.failures >= self.failure_threshold:
+            if self._opened_at is None or self._trial:
+                self.trips += 1
+            self._opened_at = self.clock()
+            self._trial = False
+
+
+class Sink(ABC):
+    """A notification backend. send() delivers up to `max_batch` sales or raises"""
+
+    name = 'sink'
+    max_batch = 1
+    workers = 1
+
+    def __init__(self):
+        self.rate_limited = 0
+
+    async def ready(self):
+        """Wait until the backend can be used"""
+
+    @abstractmethod
+    async def send(self, sales):
+        ...
+
+    async def close(self):
+        pass
+
+
+class DiscordChannelSink(Sink):
+    """Embeds in a channel through the bot connection, up to 10 per message"""
+
+    name = 'discord'
+    max_batch = MAX_EMBEDS_PER_MESSAGE
+
+    def __init__(self, bot, channel_id, build_embed, workers=2, max_retries=5):
+        super().__init__()
+        self.bot = bot
+        self.channel_id = channel_id
+        self.build_embed = build_embed
+        self.workers = workers
+        self.max_retries = max_retries
+
+    async def ready(self):
+        await self.bot.wait_until_ready()
+
+    async def send(self, sales):
+        channel = self.bot.get_channel(self.channel_id)
+        if channel is None:
+            raise SinkError(f"Discord channel not found: {self.channel_id}")
+
+        embeds = [self.build_embed(sale) for sale in sales]
+        for _ in range(self.max_retries):
+            try:
+                await channel.send(embeds=embeds)
+                return
+            except discord.RateLimited as e:
+                self.rate_limited += 1
+                await asyncio.sleep(e.retry_after)
+            except discord.HTTPException as e:
+                if e.status != 429:
+                    raise
+                self.rate_limited += 1
+                await asyncio.sleep(float(e.response.headers.get('Retry-After', 1)))
+        raise SinkError(f"still rate limited after {self.max_retries} attempts")
+
+
+class _HttpSink(Sink):
+    """Shared aiohttp session handling for the webhook sinks"""
+
+    def __init__(self, url, max_retries=3):
+        super().__init__()
+        self.url = url
+        self.max_retries = max_retries
+        self._session = None
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        return self._session
+
+    async def _post(self, payload):
+        session = self._get_session()
+        for _ in range(self.max_retries):
+            async with session.post(self.url, json=payload) as response:
+                if response.status == 429:
+                    self.rate_limited += 1
+                    await asyncio.sleep(float(response.headers.get('Retry-After', 1)))
+                    continue
+                if response.status >= 400:
+                    raise SinkError(f"{self.name} answered {response.status}")
+                return
+        raise SinkError(f"still rate limited after {self.max_retries} attempts")
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+class DiscordWebhookSink(_HttpSink):
+    """Embeds posted to a Discord webhook URL, independent of the bot connection"""
+
+    name = 'discord_webhook'
+    max_batch = MAX_EMBEDS_PER_MESSAGE
+
+    def __init__(self, url, build_embed, max_retries=3):
+        super().__init__(url, max_retries)
+        self.build_embed = build_embed
+
+    async def send(self, sales):
+        await self._post({'embeds': [self.build_embed(sale).to_dict() for sale in sales]})
+
+
+class HttpWebhookSink(_HttpSink):
+    """Generic JSON webhook: POST {"sales": [...]}"""
+
+    name = 'webhook'
+    max_batch = 50
+
+    async def send(self, sales):
+        await self._post({'sales': [sale.to_dict() for sale in sales]})
+
+
+class JsonlFileSink(Sink):
+    """Local audit log, one JSON line per matched sale.
+
+    Writes happen in a thread so a slow disk never blocks the event loop.
+    """
+
+    name = 'jsonl'
+    max_batch = 100
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = os.path.abspath(path)
+        self._file = None
+
+    def _write(self, lines):
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._file = open(self.path, 'a', encoding='utf-8')
+        self._file.write(''.join(lines))
+        self._file.flush()
+
+    async def send(self, sales):
+        notified_at = time.time()
+        lines = [json.dumps({**sale.to_dict(), 'notifiedAt': notified_at}, ensure_ascii=False) + '\n'
+                 for sale in sales]
+        await asyncio.to_thread(self._write, lines)
+
+    async def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class SinkQueue:
+    """Bounded queue in front of one sink, drained by its own workers.
+
+    enqueue() never waits: when the queue is full the sale is dropped and
+    counted. Every send is limited to `timeout` seconds and goes through a
+    circuit breaker; while it is open, batches are dropped instead of
+    waiting on a backend that is down. Nothing here can hold up another
+    sink or the producer.
+    """
+
+    def __init__(self, sink, maxsize=1000, timeout=10.0, breaker=None, latency_window=1000):
+        self.sink = sink
+        self.name = sink.name
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker()
+        self.latencies = deque(maxlen=latency_window)
+        self.sent = 0
+        self.dropped = 0
+        self.failed = 0
+        self.rejected = 0
+        self.on_sent = None
+        self.on_failed = None
+        self._tasks = []
+
+    def start(self):
+        """Spawn the worker tasks (needs a running event loop)"""
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.sink.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.sink.close()
+
+    def health(self):
+        if len(self._tasks) < self.sink.workers or any(task.done() for task in self._tasks):
+            return f"{self.name} worker exited"
+        return None
+
+    def enqueue(self, sale):
+        try:
+            self.queue.put_nowait(sale)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            self._failed(1)
+            print(f"{self.name} queue full, dropping sale", sale.sale_id)
+            return False
+
+    def _failed(self, count):
+        if self.on_failed is not None:
+            self.on_failed(self.name, count)
+
+    async def _worker(self):
+        await self.sink.ready()
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < self.sink.max_batch and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            try:
+                await self._deliver(batch)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    async def _deliver(self, batch):
+        if not self.breaker.allow():
+            self.rejected += len(batch)
+            self._failed(len(batch))
+            return
+
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.sink.send(batch), self.timeout)
+        except Exception as e:
+            self.breaker.record_failure()
+            self.failed += len(batch)
+            self._failed(len(batch))
+            print(f"Error while sending to {self.name}:", repr(e))
+            return
+
+        elapsed = time.perf_counter() - started
+        self.breaker.record_success()
+        self.latencies.append(elapsed)
+        self.sent += len(batch)
+        if self.on_sent is not None:
+            self.on_sent(self.name, elapsed, batch)
+
+    def stats(self):
+        """Queue depth, counters and send latency percentiles in milliseconds"""
+        ordered = sorted(self.latencies)
+
+        def percentile(p):
+            if not ordered:
+                return None
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 3)
+
+        return {
+            'depth': self.queue.qsize(),
+            'sent': self.sent,
+            'dropped': self.dropped,
+            'failed': self.failed,
+            'rejected': self.rejected,
+            'rate_limited': self.sink.rate_limited,
+            'breaker': self.breaker.state,
+            'send_p50_ms': percentile(0.5),
+            'send_p99_ms': percentile(0.99),
+        }
+
+
+class NotificationFanout:
+    """Hands every matched sale to each configured sink queue.
+
+    Same interface as a single queue (start / stop / health / enqueue), so
+    the monitor and the supervisor don't care how many backends there are.
+    The monitor can hook its metrics in through on_sent(sink, send_seconds,
+    sales) and on_failed(sink, count).
+    """
+
+    def __init__(self, queues):
+        self.queues = list(queues)
+        self.on_sent = None
+        self.on_failed = None
+        for queue in self.queues:
+            queue.on_sent = self._sent
+            queue.on_failed = self._failed
+
+    def _sent(self, sink, seconds, sales):
+        if self.on_sent is not None:
+            self.on_sent(sink, seconds, sales)
+
+    def _failed(self, sink, count):
+        if self.on_failed is not None:
+            self.on_failed(sink, count)
+
+    def start(self):
+        for queue in self.queues:
+            queue.start()
+
+    async def stop(self):
+        await asyncio.gather(*(queue.stop() for queue in self.queues))
+
+    def health(self):
+        for queue in self.queues:
+            reason = queue.health()
+            if reason:
+                return reason
+        return None
+
+    def enqueue(self, sale):
+        """Queue a sale on every sink. Returns False if any sink had to drop it"""
+        accepted = True
+        for queue in self.queues:
+            accepted = queue.enqueue(sale) and accepted
+        return accepted
+
+    def stats(self):
+        return {queue.name: queue.stats() for queue in self.queues}
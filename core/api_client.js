@@ -104,11 +104,16 @@ socket.emit("saleFeedJoin", { currency: "EUR", locale: "en", appid: 730 });
 // http route with dynamic filter 
 app.get("/skinport-live", (req, res) => {
   const queryParams = req.query; // z. B. ?names=Karambit | Tiger Tooth,M9 Bayonet | Freehand
-  const filteredSales = latestSales.filter((sale) => filterItems(sale, queryParams));
+  // optional cursor: only sales newer than ?since=<saleId>
+  const since = queryParams.since ? Number(queryParams.since) : null;
+  const filteredSales = latestSales.filter((sale) =>
+    (since === null || sale.sale.saleId > since) && filterItems(sale, queryParams)
+  );
+  // express adds an ETag and answers If-None-Match with 304 when nothing changed
   res.json(filteredSales);
 });
 
-const PORT = 3000;
+const PORT = Number(process.env.PORT) || 3000; // data_parser.py alternates ports for overlapping restarts
 app.listen(PORT, () => {
   console.log(`HTTP Server läuft auf http://localhost:${PORT}`);
 });
@@ -1,77 +1,299 @@
 from dotenv import load_dotenv
-import requests
 import asyncio
-from listing_logger import write_to_file, get_params
-from filter_engine import filter_item
+from listing_logger import listing_log, write_to_file
+from filter_engine import filter_batch
+from filter_reloader import FilterReloader
+from sharded_engine import ShardedFilterEngine
+from sale import Sale
+from price_stats import PriceStats
+from seen_sales import SeenSales
+from feed_client import FeedClient
+from feed_capture import FeedRecorder
+from sale_history import HistoryWriter, history_dir
+from feed_stream import StreamWorker, SocketIOTransport, WebSocketTransport, SKINPORT_WS_URL
+from poll_scheduler import AdaptivePollScheduler
+from heartbeat import Heartbeat
+from monitor_control import MonitorControl, DEFAULT_CONTROL_PORT
+import metrics
+from supervisor import Supervisor, TaskWorker, ServiceWorker, RelayWorker, FeedLiveness
 
+import argparse
 import sys
 import os
+import signal
+import time
 
 from pathlib import Path
 project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(project_root))
-from bot.discord_bot import send_to_discord, bot
+from bot.discord_bot import notifications, bot
 
 load_dotenv()
 
 API_URL = os.getenv('API_URL')
 TOKEN = os.getenv('DISCORD_BOT_TOKEN')
+FEED_MODE = os.getenv('FEED_MODE', 'poll').lower()
+FEED_WS_URL = os.getenv('FEED_WS_URL', SKINPORT_WS_URL)
+FEED_TRANSPORT = os.getenv('FEED_TRANSPORT', 'socketio').lower()
+SEEN_SALES_CAPACITY = int(os.getenv('SEEN_SALES_CAPACITY', '10000'))
+SEEN_SALES_TTL = float(os.getenv('SEEN_SALES_TTL', '0')) or None
+FEED_CONNECT_TIMEOUT = float(os.getenv('FEED_CONNECT_TIMEOUT', '2'))
+FEED_READ_TIMEOUT = float(os.getenv('FEED_READ_TIMEOUT', '5'))
+FEED_SINCE_CURSOR = os.getenv('FEED_SINCE_CURSOR', '').lower() in ('1', 'true', 'yes')
+POLL_MIN_INTERVAL = float(os.getenv('POLL_MIN_INTERVAL', '0.5'))
+POLL_MAX_INTERVAL = float(os.getenv('POLL_MAX_INTERVAL', '5'))
+FILTER_RELOAD_INTERVAL = float(os.getenv('FILTER_RELOAD_INTERVAL', '1'))
+# Typical price per item for minRelativePrice / maxRelativePrice filters
+PRICE_STATS_CAPACITY = int(os.getenv('PRICE_STATS_CAPACITY', '50000'))
+PRICE_STATS_ALPHA = float(os.getenv('PRICE_STATS_ALPHA', '0.1'))
+PRICE_STATS_MIN_SAMPLES = int(os.getenv('PRICE_STATS_MIN_SAMPLES', '5'))
+# Evaluate filters in this many worker processes, 0 keeps them in the monitor process
+FILTER_WORKERS = int(os.getenv('FILTER_WORKERS', '0'))
+# In poll mode the monitor runs and supervises the Node relay itself
+MANAGE_RELAY = os.getenv('MANAGE_RELAY', '1').lower() in ('1', 'true', 'yes')
+RELAY_PORTS = [int(port) for port in os.getenv('RELAY_PORTS', '3000,3001').split(',')]
+RELAY_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'api_client.js')
+SUPERVISOR_INTERVAL = float(os.getenv('SUPERVISOR_INTERVAL', '5'))
+FEED_STALL_TIMEOUT = float(os.getenv('FEED_STALL_TIMEOUT', '30'))
+FEED_EVENT_TIMEOUT = float(os.getenv('FEED_EVENT_TIMEOUT', '300'))
+# Prometheus endpoint of the monitor, 0 disables it
+METRICS_PORT = int(os.getenv('METRICS_PORT', '9108'))
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+# Append every feed response to this gzip JSON lines file for core/replay.py
+CAPTURE_FILE = os.getenv('CAPTURE_FILE')
+# Columnar history of every sale seen, queried by the dashboard's /history; empty disables it
+HISTORY_DIR = os.getenv('HISTORY_DIR', history_dir)
+HISTORY_MAX_SEGMENTS = int(os.getenv('HISTORY_MAX_SEGMENTS', '0'))
+# Local channel the dashboard arms / disarms a standby monitor through, 0 disables it
+CONTROL_PORT = int(os.getenv('CONTROL_PORT', str(DEFAULT_CONTROL_PORT)))
 
-def resize_list(ls: list) -> list:
-    return ls[-100:]
+price_stats = PriceStats(capacity=PRICE_STATS_CAPACITY, alpha=PRICE_STATS_ALPHA,
+                         min_samples=PRICE_STATS_MIN_SAMPLES)
+# Sale IDs already handled, shared by poller and stream restarts
+known_sales = SeenSales(capacity=SEEN_SALES_CAPACITY, ttl=SEEN_SALES_TTL)
+# Armed unless started with --standby; see MonitorControl
+control = MonitorControl()
 
-async def monitor_sales():
-    known_sales = []
-    
-    query_params = get_params()
+async def process_sales(new_sales, filter_plans):
+    """Filter a batch of unseen Sale records and notify about the matches"""
+    if not control.armed:
+        # Standing by: keep the price statistics current, filter and notify nothing
+        price_stats.observe_sales(new_sales)
+        return
+
+    # Reference prices from earlier listings only; this batch is added after filtering
+    price_stats.annotate(new_sales)
+
+    # Evaluate the whole batch at once - returns (sale, filter_config) pairs
+    with metrics.timed('filter'):
+        if isinstance(filter_plans, ShardedFilterEngine):
+            # The workers do the matching, the event loop keeps serving meanwhile
+            matched = await asyncio.to_thread(filter_plans.filter_batch, new_sales)
+        else:
+            matched = filter_batch(new_sales, filter_plans)
+    matches = {id(sale): matching_filter for sale, matching_filter in matched}
+    price_stats.observe_sales(new_sales)
+    metrics.sales_total.inc(len(matches), event='matched')
+
+    for sale in new_sales:
+        listing_text = format_listing(sale)
+
+        if id(sale) in matches:
+            matching_filter = matches[id(sale)]
+            # Hand off to the notification workers, filtering continues immediately
+            with metrics.timed('enqueue'):
+                notifications.enqueue(sale)
+            filter_name = matching_filter.get('name', 'Unknown') if matching_filter else 'Unknown'
+            print(f"[MATCH - {filter_name}] {listing_text}")
+            write_to_file(f"[MATCH - {filter_name}] {listing_text}")
+        else:
+            print(f"[NEW] {listing_text}")
+    control.polled()
+
+def record_history(history, new_sales):
+    """Append decoded sales to the history; a failing disk must not stop the monitor"""
+    if history is None:
+        return
+    try:
+        history.append(new_sales)
+    except OSError as e:
+        print("Error while writing sale history:", e)
+
+async def monitor_sales(filters, heartbeat, feed, liveness, recorder=None, history=None):
+    scheduler = AdaptivePollScheduler(min_interval=POLL_MIN_INTERVAL, max_interval=POLL_MAX_INTERVAL)
     
     while True:
+        started = time.perf_counter()
+        heartbeat.beat()
         try:
-            response = requests.get(API_URL)
-            if response.ok:
-                print("looking for filtered offers")
-                sales = response.json()
-                
-                for sale in sales:
-                    sId = sale['sale']['saleId']
-                    if sId not in known_sales:
-                        known_sales.append(sId)
-                        s = sale['sale']
-                        
-                        listing_text = f"{s['marketName']} - {s['wear']:.4f} - {s['salePrice'] / 100:.2f} EUR ({s['saleId']})"
-                        
-                        # Updated filter call - now returns tuple (match, filter_config)
-                        is_match, matching_filter = filter_item(sale=sale, query_params=query_params)
-                        
-                        if is_match:
-                            await send_to_discord(format_price(sale['sale']))
-                            filter_name = matching_filter.get('name', 'Unknown') if matching_filter else 'Unknown'
-                            print(f"[MATCH - {filter_name}] {listing_text}")
-                            write_to_file(f"[MATCH - {filter_name}] {listing_text}")
-                        else:
-                            print(f"[NEW] {listing_text}")
+            response = await feed.fetch()
+            if response.not_modified:
+                liveness.mark_ok()
+                scheduler.record(new_sales=0)
+            elif response.ok:
+                liveness.mark_ok()
+                print(f"looking for filtered offers ({response.latency * 1000:.1f} ms)")
+                if recorder is not None:
+                    recorder.record(response.sales)
+
+                # Only unseen events are decoded into Sale records
+                new_sales = [Sale.from_event(event) for event in response.sales
+                             if known_sales.add(event['sale']['saleId'])]
+                metrics.sales_total.inc(len(response.sales), event='seen')
+                metrics.sales_total.inc(len(response.sales) - len(new_sales), event='deduped')
+                liveness.mark_events(len(new_sales))
+                # filters.current may be swapped by a reload, but only between batches
+                await process_sales(new_sales, filters.current)
+                # Only after the notifications are queued, the disk write is not on the hot path
+                record_history(history, new_sales)
+
+                scheduler.record(new_sales=len(new_sales))
             else:
-                print("Error while parsing the websocket data:", response.status_code)
+                print("Error while parsing the websocket data:", response.status)
+                scheduler.record(error=True)
         
         except Exception as e:
             print("Error:", e)
+            scheduler.record(error=True)
         
-        known_sales[:] = resize_list(known_sales)
-        
-        await asyncio.sleep(5)
+        # Cut short when the dashboard arms a standby monitor
+        await control.wait(scheduler.next_delay(time.perf_counter() - started))
+
+def stream_worker(filters, heartbeat, recorder=None, history=None):
+    """Supervised worker consuming the sale feed directly instead of polling the Node relay"""
+    async def on_sales(new_sales):
+        heartbeat.beat()
+        try:
+            sales = [Sale.from_event(event) for event in new_sales]
+            await process_sales(sales, filters.current)
+            record_history(history, sales)
+        except Exception as e:
+            print("Error:", e)
+
+    def transport():
+        if FEED_TRANSPORT == 'websocket':
+            return WebSocketTransport(FEED_WS_URL)
+        return SocketIOTransport(FEED_WS_URL)
+
+    # Recorded before deduplication, like the poller records whole responses
+    return StreamWorker(transport, on_sales,
+                        seen=known_sales,
+                        event_timeout=FEED_EVENT_TIMEOUT,
+                        on_events=recorder.record if recorder is not None else None)
 
-def format_price(sale):
-    price = sale.get('salePrice')
-    if isinstance(price, int):
-        formatted_price = price / 100
-        sale['salePrice'] = formatted_price
-    return sale
+def build_supervisor(filters, heartbeat, recorder=None, history=None):
+    """Ingestion and notifier workers, restarted when they die or the feed stalls"""
+    supervisor = Supervisor(check_interval=SUPERVISOR_INTERVAL)
+    supervisor.add(ServiceWorker('notifier', notifications))
 
-async def main():
-    await asyncio.gather(
+    if FEED_MODE == 'stream':
+        supervisor.add(stream_worker(filters, heartbeat, recorder, history))
+        return supervisor
+
+    liveness = FeedLiveness()
+    feed = FeedClient(API_URL, connect_timeout=FEED_CONNECT_TIMEOUT, read_timeout=FEED_READ_TIMEOUT,
+                      use_cursor=FEED_SINCE_CURSOR)
+
+    if MANAGE_RELAY:
+        def switch_feed(url):
+            # New relay is serving: point the poller at it before the old one stops
+            feed.url = url
+            feed.etag = None
+
+        supervisor.add(RelayWorker(RELAY_SCRIPT, RELAY_PORTS, liveness,
+                                   ok_timeout=FEED_STALL_TIMEOUT, event_timeout=FEED_EVENT_TIMEOUT,
+                                   on_switch=switch_feed))
+
+    supervisor.add(TaskWorker('poller', lambda: monitor_sales(filters, heartbeat, feed, liveness, recorder, history)))
+    return supervisor
+
+def record_sent(sink, send_seconds, sales):
+    metrics.observe_stage('send', send_seconds)
+    now = time.time()
+    for sale in sales:
+        metrics.observe_detection(sale.timestamp, now, sink)
+
+def record_failed(sink, count):
+    metrics.sales_total.inc(count, event='failed')
+
+def format_listing(sale):
+    wear = f"{sale.wear:.4f}" if sale.wear is not None else "?"
+    price = f"{sale.display_price:.2f}" if sale.price is not None else "?"
+    return f"{sale.market_name} - {wear} - {price} EUR ({sale.sale_id})"
+
+async def main(standby=False, requested_at=None):
+    # Parse and index the filters once; the reloader swaps in new ones when script_params.json changes
+    engine = ShardedFilterEngine(FILTER_WORKERS) if FILTER_WORKERS > 0 else None
+    filters = FilterReloader(build=engine.update) if engine else FilterReloader()
+    if hasattr(signal, 'SIGHUP'):
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, filters.request_reload)
+
+    # Liveness and restart metrics for the dashboard's status check
+    def details():
+        status = {'workers': supervisor.stats(), 'notifications': notifications.stats(),
+                  'price_stats': price_stats.stats(), 'seen_sales': known_sales.stats()}
+        if engine is not None:
+            status['filter_shards'] = engine.stats()
+        status['control'] = control.status()
+        if history is not None:
+            status['history'] = history.stats()
+        return status
+
+    heartbeat = Heartbeat(details=details)
+    if standby:
+        control.disarm()
+    else:
+        control.arm(requested_at)
+    # Arming reloads script_params.json right away instead of on the next watch tick;
+    # if that fails the monitor stays disarmed and the error goes back to the dashboard
+    control.on_arm = filters.reload
+    # Publish the new state immediately so the dashboard status follows without delay
+    control.on_change = heartbeat.write
+    recorder = FeedRecorder(CAPTURE_FILE) if CAPTURE_FILE else None
+    history = HistoryWriter(HISTORY_DIR, max_segments=HISTORY_MAX_SEGMENTS) if HISTORY_DIR else None
+    supervisor = build_supervisor(filters, heartbeat, recorder, history)
+
+    notifications.on_sent = record_sent
+    notifications.on_failed = record_failed
+
+    # Stop the workers (and with them the relay process) on SIGTERM from /stop-script
+    main_task = asyncio.current_task()
+    if hasattr(signal, 'SIGTERM'):
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, main_task.cancel)
+        except NotImplementedError:
+            pass
+
+    tasks = [
         bot.start(TOKEN),
-        monitor_sales()
-    )
+        filters.watch(FILTER_RELOAD_INTERVAL),
+        heartbeat.run(),
+        supervisor.run()
+    ]
+    if METRICS_PORT:
+        tasks.append(metrics.serve(METRICS_PORT, METRICS_HOST))
+    if CONTROL_PORT:
+        tasks.append(control.serve(CONTROL_PORT))
+
+    try:
+        await asyncio.gather(*tasks)
+    except asyncio.CancelledError:
+        pass
+    finally:
+        # Write out match lines still queued for the listing log before exiting
+        listing_log.close()
+        if recorder is not None:
+            recorder.close()
+        if history is not None:
+            history.close()
+        if engine is not None:
+            engine.close()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Skinport sale monitor")
+    parser.add_argument('--standby', action='store_true',
+                        help="start disarmed and wait for an arm command on the control channel")
+    parser.add_argument('--requested-at', type=float, default=None,
+                        help="unix time the start was requested, for the start-to-first-poll report")
+    args = parser.parse_args()
+    asyncio.run(main(standby=args.standby, requested_at=args.requested_at))
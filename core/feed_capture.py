@@ -0,0 +1,47 @@
+import gzip
+import json
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+class FeedRecorder:
+    """Appends every feed response to a gzip compressed JSON lines capture.
+
+    One line per response: {"t": <receive time>, "sales": [...]}. The file
+    is only ever appended to; each run adds a new gzip member, which
+    gzip readers (and read_capture) treat as one continuous stream. Lines
+    are flushed as they are written so a crash loses at most the last one.
+    """
+
+    def __init__(self, path: str, compresslevel: int = 6):
+        self.path = os.path.abspath(path)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._file = gzip.open(self.path, 'ab', compresslevel=compresslevel)
+        self.records = 0
+
+    def record(self, sales: List[Dict[str, Any]], received_at: Optional[float] = None):
+        line = json.dumps({"t": time.time() if received_at is None else received_at, "sales": sales},
+                          separators=(',', ':'))
+        self._file.write(line.encode('utf-8') + b'\n')
+        self._file.flush()
+        self.records += 1
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+def read_capture(path: str) -> Iterator[Tuple[float, List[Dict[str, Any]]]]:
+    """Yield (receive time, sales) per recorded response. A truncated last line is skipped"""
+    with gzip.open(path, 'rb') as f:
+        try:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                yield record["t"], record["sales"]
+        except EOFError:
+            # Capture of a monitor that is still running or was killed mid-write
+            return
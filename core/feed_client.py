@@ -0,0 +1,124 @@
+from collections import deque
+import json
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import aiohttp
+
+from metrics import observe_stage
+
+
+class FeedResponse(NamedTuple):
+    """One poll; `sales` is a list whenever the response is ok, None otherwise"""
+
+    status: int
+    sales: Optional[List[Dict[str, Any]]]
+    latency: float
+    decode_latency: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+
+class FeedClient:
+    """Non-blocking client for the local sale feed (API_URL).
+
+    Keeps one aiohttp session with a keep-alive connection pool for the
+    lifetime of the monitor and records the latency of every request.
+    Polls are conditional: the last ETag is sent as If-None-Match, and with
+    `use_cursor` only sales newer than the highest saleId seen are requested.
+    """
+
+    def __init__(self, url: str, connect_timeout: float = 2.0, read_timeout: float = 5.0,
+                 pool_size: int = 4, latency_window: int = 1000, use_cursor: bool = False):
+        self.url = url
+        self.use_cursor = use_cursor
+        self.etag: Optional[str] = None
+        self.cursor: Optional[int] = None
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.pool_size = pool_size
+        self.latencies = deque(maxlen=latency_window)
+        self.requests = 0
+        self.failures = 0
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Created lazily so the session binds to the running event loop
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(
+                    total=None, sock_connect=self.connect_timeout, sock_read=self.read_timeout
+                ),
+            )
+        return self._session
+
+    async def fetch(self) -> FeedResponse:
+        """GET the feed once. Network errors and timeouts are raised to the caller"""
+        session = self._get_session()
+        headers = {'If-None-Match': self.etag} if self.etag else None
+        params = {'since': str(self.cursor)} if self.use_cursor and self.cursor is not None else None
+
+        self.requests += 1
+        started = time.perf_counter()
+        try:
+            async with session.get(self.url, headers=headers, params=params) as response:
+                status = response.status
+                body = await response.read() if 200 <= status < 300 else None
+                if status == 200:
+                    self.etag = response.headers.get('ETag')
+        except Exception:
+            self.failures += 1
+            raise
+        latency = time.perf_counter() - started
+        self.latencies.append(latency)
+        observe_stage('fetch', latency)
+
+        # Timed apart from the request so the decode stage shows up on its own
+        decode_started = time.perf_counter()
+        sales = json.loads(body) if body else None
+        if sales is None and 200 <= status < 300:
+            # 204 or an empty body: nothing new
+            sales = []
+        decode_latency = time.perf_counter() - decode_started
+        observe_stage('decode', decode_latency)
+
+        if sales and self.use_cursor:
+            newest = max(sale['sale']['saleId'] for sale in sales)
+            self.cursor = newest if self.cursor is None else max(self.cursor, newest)
+
+        return FeedResponse(status, sales, latency, decode_latency)
+
+    def stats(self) -> Dict[str, Any]:
+        """Request counters and latency percentiles in milliseconds"""
+        ordered = sorted(self.latencies)
+
+        def percentile(p):
+            if not ordered:
+                return None
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 3)
+
+        return {
+            'requests': self.requests,
+            'failures': self.failures,
+            'last_ms': round(self.latencies[-1] * 1000, 3) if self.latencies else None,
+            'p50_ms': percentile(0.5),
+            'p99_ms': percentile(0.99),
+        }
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
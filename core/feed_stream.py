@@ -0,0 +1,250 @@
+import asyncio
+import json
+from abc import ABC, abstractmethod
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import aiohttp
+
+from metrics import sales_total, timed
+from seen_sales import SeenSales
+from supervisor import Worker
+
+SKINPORT_WS_URL = "wss://skinport.com"
+
+# Same pre-filter as api_client.js: only weapons, gloves and knives
+CATEGORY_BLACKLIST = frozenset([
+    "Container", "Sticker", "Graffiti", "Agent", "Charm", "Key", "Patch", "Collectible", "Pass", "Music Kit",
+])
+
+SALE_FEED_JOIN = {"currency": "EUR", "locale": "en", "appid": 730}
+
+
+class FeedTransport(ABC):
+    """Source of raw `saleFeed` payloads ({"eventType": ..., "sales": [...]}).
+
+    Subclasses implement connect/receive/close. receive() raises
+    ConnectionError once the connection is gone so the stream reconnects.
+    """
+
+    @abstractmethod
+    async def connect(self):
+        ...
+
+    @abstractmethod
+    async def receive(self) -> Dict[str, Any]:
+        ...
+
+    async def close(self):
+        pass
+
+
+class SocketIOTransport(FeedTransport):
+    """Skinport's socket.io sale feed (msgpack encoded), as used by api_client.js"""
+
+    def __init__(self, url: str = SKINPORT_WS_URL, join: Optional[Dict[str, Any]] = None):
+        self.url = url
+        self.join = join or SALE_FEED_JOIN
+        self._client = None
+        self._queue: Optional[asyncio.Queue] = None
+
+    async def connect(self):
+        import socketio
+
+        self._queue = asyncio.Queue()
+        self._client = socketio.AsyncClient(serializer='msgpack', reconnection=False)
+        self._client.on('saleFeed', self._queue.put_nowait)
+        # None wakes up receive() so it can report the disconnect
+        self._client.on('disconnect', lambda *args: self._queue.put_nowait(None))
+
+        await self._client.connect(self.url, transports=['websocket'])
+        await self._client.emit('saleFeedJoin', self.join)
+
+    async def receive(self) -> Dict[str, Any]:
+        payload = await self._queue.get()
+        if payload is None:
+            raise ConnectionError("socket.io feed disconnected")
+        return payload
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.disconnect()
+            self._client = None
+
+
+class WebSocketTransport(FeedTransport):
+    """Plain JSON WebSocket feed.
+
+    Every text frame is one saleFeed payload. Used for local stand-in feed
+    servers (tests, replays); the join message is sent as
+    {"event": "saleFeedJoin", "data": {...}} after connecting.
+    """
+
+    def __init__(self, url: str, join: Optional[Dict[str, Any]] = None):
+        self.url = url
+        self.join = join or SALE_FEED_JOIN
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._ws = None
+
+    async def connect(self):
+        self._session = aiohttp.ClientSession()
+        try:
+            self._ws = await self._session.ws_connect(self.url, heartbeat=30)
+            await self._ws.send_json({"event": "saleFeedJoin", "data": self.join})
+        except Exception:
+            await self.close()
+            raise
+
+    async def receive(self) -> Dict[str, Any]:
+        message = await self._ws.receive()
+        if message.type == aiohttp.WSMsgType.TEXT:
+            return json.loads(message.data)
+        raise ConnectionError(f"websocket feed closed ({message.type.name})")
+
+    async def close(self):
+        if self._ws is not None:
+            await self._ws.close()
+            self._ws = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+def normalize_payload(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Turn a saleFeed payload into the event dicts the relay used to serve"""
+    if payload.get("eventType") != "listed":
+        return []
+    timestamp = int(time.time() * 1000)
+    return [
+        {"eventType": payload["eventType"], "sale": sale, "timestamp": timestamp}
+        for sale in payload.get("sales", [])
+        if sale.get("category") not in CATEGORY_BLACKLIST
+    ]
+
+
+class FeedStream:
+    """Push-based ingestion: consumes a FeedTransport and hands new sales to `on_sales`.
+
+    Reconnects with exponential backoff whenever the transport fails. After a
+    reconnect the feed is joined again and anything already delivered before
+    the drop is filtered out through `seen`, so consumers never get a sale twice.
+    `on_events` gets every normalized batch before deduplication (e.g. to
+    record it, like the poller records whole responses).
+    """
+
+    def __init__(self, transport: FeedTransport,
+                 on_sales: Callable[[List[Dict[str, Any]]], Awaitable[None]],
+                 seen: Optional[SeenSales] = None,
+                 reconnect_delay: float = 0.5, max_reconnect_delay: float = 30.0,
+                 on_events: Optional[Callable[[List[Dict[str, Any]]], Any]] = None):
+        self.transport = transport
+        self.on_sales = on_sales
+        self.on_events = on_events
+        self.seen = seen if seen is not None else SeenSales()
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+
+        self.connects = 0
+        self.events = 0
+        self.last_event_at: Optional[float] = None
+        self.last_sale_id = None
+        self._stopped = False
+
+    def stop(self):
+        self._stopped = True
+
+    async def run(self):
+        delay = self.reconnect_delay
+        while not self._stopped:
+            try:
+                await self.transport.connect()
+                self.connects += 1
+                delay = self.reconnect_delay
+                print(f"Connected to sale feed (connection #{self.connects})")
+
+                while not self._stopped:
+                    payload = await self.transport.receive()
+                    await self._handle(payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print("Sale feed error:", e)
+            finally:
+                await self.transport.close()
+
+            if not self._stopped:
+                await asyncio.sleep(delay)
+                delay = min(self.max_reconnect_delay, delay * 2)
+
+    async def _handle(self, payload: Dict[str, Any]):
+        self.last_event_at = time.monotonic()
+        with timed('decode'):
+            events = normalize_payload(payload)
+        if events and self.on_events is not None:
+            try:
+                self.on_events(events)
+            except Exception as e:
+                print("Error while handing off feed events:", e)
+        new_sales = [event for event in events if self.seen.add(event["sale"]["saleId"])]
+        sales_total.inc(len(events), event='seen')
+        sales_total.inc(len(events) - len(new_sales), event='deduped')
+        if not new_sales:
+            return
+        self.events += len(new_sales)
+        self.last_sale_id = new_sales[-1]["sale"]["saleId"]
+        await self.on_sales(new_sales)
+
+
+class StreamWorker(Worker):
+    """Runs a FeedStream under the Supervisor.
+
+    Every replacement opens its own connection but shares the SeenSales set,
+    so during the overlap handover sales seen by both streams are only
+    delivered once.
+    """
+
+    def __init__(self, transport_factory: Callable[[], FeedTransport],
+                 on_sales: Callable[[List[Dict[str, Any]]], Awaitable[None]],
+                 seen: SeenSales, event_timeout: float = 300.0,
+                 on_events: Optional[Callable[[List[Dict[str, Any]]], Any]] = None):
+        self.name = 'stream'
+        self.transport_factory = transport_factory
+        self.on_sales = on_sales
+        self.on_events = on_events
+        self.seen = seen
+        self.event_timeout = event_timeout
+        self.stream: Optional[FeedStream] = None
+        self._task: Optional[asyncio.Task] = None
+        self._started_at = time.monotonic()
+
+    async def start(self):
+        self._started_at = time.monotonic()
+        self.stream = FeedStream(self.transport_factory(), self.on_sales, seen=self.seen,
+                                 on_events=self.on_events)
+        self._task = asyncio.create_task(self.stream.run(), name='stream')
+
+    async def ready(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.stream.connects:
+                return True
+            await asyncio.sleep(0.1)
+        return False
+
+    async def stop(self):
+        if self._task is not None:
+            self.stream.stop()
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def health(self) -> Optional[str]:
+        if self._task is None or self._task.done():
+            return "stream task exited"
+        last_event = self.stream.last_event_at or self._started_at
+        if time.monotonic() - last_event > self.event_timeout:
+            return f"no feed events for {time.monotonic() - last_event:.0f}s"
+        return None
+
+    def replacement(self) -> 'StreamWorker':
+        return StreamWorker(self.transport_factory, self.on_sales, self.seen, self.event_timeout, self.on_events)
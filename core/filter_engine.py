@@ -1,86 +1,570 @@
-def filter_item_single(sale, filter_params):
-    """Filter a single sale against a single filter configuration"""
-    if sale["eventType"] != "listed":
-        return False
-    
-    item = sale["sale"]
-    
-    # Min price
-    if filter_params.get("minPrice"):
-        try:
-            if int(item.get("salePrice", 0)) < int(filter_params["minPrice"]):
+from collections import defaultdict
+from dataclasses import dataclass, field
+from heapq import merge
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from name_automaton import NameAutomaton
+from sale import Exterior, Sale, _to_float, _to_int, normalize_name
+
+
+@dataclass(frozen=True, slots=True)
+class FilterPlan:
+    """Typed, pre-parsed form of a single filter configuration"""
+    config: Dict[str, Any] = field(compare=False, repr=False)
+    name: Optional[str] = None
+    exterior: Optional[str] = None
+    min_price: Optional[int] = None
+    max_price: Optional[int] = None
+    min_wear: Optional[float] = None
+    max_wear: Optional[float] = None
+    patterns: Optional[FrozenSet[int]] = None
+    # Exterior code for Sale records, -1 for labels no sale can have
+    exterior_code: Optional[int] = None
+    # Price as a fraction of the item's typical price ("median" or "mean")
+    min_relative_price: Optional[float] = None
+    max_relative_price: Optional[float] = None
+    relative_to: str = "median"
+
+    @property
+    def relative(self) -> bool:
+        return self.min_relative_price is not None or self.max_relative_price is not None
+
+    def relative_price_ok(self, price: Optional[int], median: Optional[float], mean: Optional[float]) -> bool:
+        """Relative price bounds; items without a typical price yet never match"""
+        reference = mean if self.relative_to == "mean" else median
+        if price is None or not reference:
+            return False
+        ratio = price / reference
+        if self.min_relative_price is not None and ratio < self.min_relative_price:
+            return False
+        if self.max_relative_price is not None and ratio > self.max_relative_price:
+            return False
+        return True
+
+    def matches(self, sale) -> bool:
+        """Check a single sale (Sale record or raw feed event) against this plan"""
+        if type(sale) is Sale:
+            return self.matches_sale(sale)
+
+        if sale["eventType"] != "listed":
+            return False
+
+        # Only Sale records carry the typical prices a relative bound needs
+        if self.relative:
+            return False
+
+        item = sale["sale"]
+
+        # Price (unparsable sale prices skip the check, like the filter strings used to)
+        if self.min_price is not None or self.max_price is not None:
+            price = _to_int(item.get("salePrice", 0))
+            if price is not None:
+                if self.min_price is not None and price < self.min_price:
+                    return False
+                if self.max_price is not None and price > self.max_price:
+                    return False
+
+        # Name (single name check)
+        if self.name is not None and self.name not in normalize_name(item.get("marketName", "")):
+            return False
+
+        # Pattern ("pattern matches" OR-Logic)
+        if self.patterns is not None:
+            item_pattern = item.get("pattern")
+            if item_pattern is None or item_pattern not in self.patterns:
                 return False
-        except ValueError:
-            pass
-    
-    # Max price
-    if filter_params.get("maxPrice"):
-        try:
-            if int(item.get("salePrice", 0)) > int(filter_params["maxPrice"]):
+
+        # Wear
+        if self.min_wear is not None:
+            wear = _to_float(item.get("wear", 1))
+            if wear is not None and wear < self.min_wear:
                 return False
-        except ValueError:
-            pass
-    
-    # Name (single name check)
-    if filter_params.get("name"):
-        filter_name = filter_params["name"].strip().lower()
-        market_name = item.get("marketName", "").lower()
-        if filter_name not in market_name:
+        if self.max_wear is not None:
+            wear = _to_float(item.get("wear", 0))
+            if wear is not None and wear > self.max_wear:
+                return False
+
+        # Exterior
+        if self.exterior is not None and item.get("exterior", "").lower() != self.exterior:
             return False
-    
-    # Pattern ("pattern matches" OR-Logic)
-    if filter_params.get("patterns"):
-        try:
-            patterns = [int(p.strip()) for p in filter_params["patterns"].split(",")]
-            item_pattern = item.get("pattern")
-            if item_pattern is None or item_pattern not in patterns:
+
+        return True
+
+    def matches_sale(self, sale: Sale) -> bool:
+        """Same checks as matches() on an already decoded Sale"""
+        if sale.event_type != "listed":
+            return False
+
+        price = sale.price
+        if price is not None:
+            if self.min_price is not None and price < self.min_price:
                 return False
-        except ValueError:
-            pass
-    
-    # Min wear
-    if filter_params.get("minWear"):
-        try:
-            if float(item.get("wear", 1)) < float(filter_params["minWear"]):
+            if self.max_price is not None and price > self.max_price:
                 return False
-        except ValueError:
-            pass
-    
-    # Max wear
-    if filter_params.get("maxWear"):
-        try:
-            if float(item.get("wear", 0)) > float(filter_params["maxWear"]):
+
+        if self.name is not None and self.name not in sale.name_key:
+            return False
+
+        if self.patterns is not None and sale.pattern not in self.patterns:
+            return False
+
+        wear = sale.wear
+        if wear is not None:
+            if self.min_wear is not None and wear < self.min_wear:
                 return False
-        except ValueError:
-            pass
-    
-    # Exterior
-    if filter_params.get("exterior"):
-        exterior_value = filter_params["exterior"].strip().lower()
-        item_exterior = item.get("exterior", "").lower()
-        if item_exterior != exterior_value:
+            if self.max_wear is not None and wear > self.max_wear:
+                return False
+
+        if self.exterior_code is not None and sale.exterior != self.exterior_code:
             return False
-    
-    return True
 
+        if self.relative and not self.relative_price_ok(price, sale.median_price, sale.mean_price):
+            return False
 
-def filter_item(sale, query_params):
-    """Filter a sale against multiple filter configurations"""
+        return True
+
+def compile_filter(filter_params: Dict[str, Any]) -> FilterPlan:
+    """Parse a filter configuration once into a FilterPlan.
+
+    Values that can't be parsed disable their check, matching the old
+    per-sale behaviour of ignoring a ValueError.
+    """
+    patterns = None
+    if filter_params.get("patterns"):
+        try:
+            patterns = frozenset(int(p.strip()) for p in filter_params["patterns"].split(","))
+        except ValueError:
+            patterns = None
+
+    def bound(key, cast):
+        if filter_params.get(key):
+            try:
+                return cast(filter_params[key])
+            except ValueError:
+                return None
+        return None
+
+    exterior = filter_params["exterior"].strip().lower() if filter_params.get("exterior") else None
+    exterior_code = None
+    if exterior is not None:
+        exterior_code = Exterior.parse(exterior) or -1
+
+    return FilterPlan(
+        config=filter_params,
+        name=(normalize_name(filter_params["name"]) or None) if filter_params.get("name") else None,
+        exterior=exterior,
+        min_price=bound("minPrice", int),
+        max_price=bound("maxPrice", int),
+        min_wear=bound("minWear", float),
+        max_wear=bound("maxWear", float),
+        patterns=patterns,
+        exterior_code=exterior_code,
+        min_relative_price=bound("minRelativePrice", float),
+        max_relative_price=bound("maxRelativePrice", float),
+        relative_to="mean" if str(filter_params.get("relativeTo", "")).strip().lower() == "mean" else "median",
+    )
+
+
+def compile_filters(query_params: Dict[str, Any]) -> Tuple[FilterPlan, ...]:
+    """Compile every filter of a script_params.json style dict"""
     # Handle both old and new format
     if "filters" in query_params:
-        # New format with multiple filters
-        filters = query_params["filters"]
-        
-        # Check if sale matches ANY of the filters (OR logic between filters)
-        for filter_config in filters:
-            if filter_item_single(sale, filter_config):
-                return True, filter_config  # Return True and the matching filter
-        
-        return False, None
+        return tuple(compile_filter(f) for f in query_params["filters"])
+    return (compile_filter(query_params),)
+
+
+# Lower-cased exterior labels, the keys the index buckets plans under
+_EXTERIOR_KEYS = {code: code.label.lower() for code in Exterior}
+# Distinct (market name, exterior) keys FilterIndex keeps candidate arrays for
+CANDIDATE_CACHE_SIZE = 50_000
+
+
+def _candidate_key(sale) -> Tuple[str, str]:
+    """(normalized market name, lower-cased exterior) the index looks candidates up by"""
+    if type(sale) is Sale:
+        return sale.name_key, _EXTERIOR_KEYS[sale.exterior]
+    item = sale["sale"]
+    return normalize_name(item.get("marketName", "")), item.get("exterior", "").lower()
+
+
+class FilterIndex:
+    """Candidate lookup over compiled filters.
+
+    All filter names go into one NameAutomaton, built when the filters are
+    loaded. A sale's normalized market name is scanned once to find every
+    filter name it contains; the candidates are the plans with one of those
+    names and a compatible exterior, plus the plans without a name.
+    Candidates are walked in original filter order, so the first match is
+    the same one a linear scan reports. filter_batch uses the same lookup
+    through candidate_array(), so the monitor's batches get the pruning too.
+    """
+
+    def __init__(self, plans: Iterable[FilterPlan]):
+        self.plans = tuple(plans)
+        self.names = NameAutomaton(plan.name for plan in self.plans if plan.name)
+        name_ids = {name: name_id for name_id, name in enumerate(self.names.names)}
+
+        by_name = defaultdict(list)
+        by_exterior = defaultdict(list)
+        for position, plan in enumerate(self.plans):
+            if plan.name:
+                by_name[(name_ids[plan.name], plan.exterior)].append(position)
+            else:
+                by_exterior[plan.exterior].append(position)
+
+        self._by_name: Dict[Tuple[int, Optional[str]], List[int]] = dict(by_name)
+        self._by_exterior: Dict[Optional[str], List[int]] = dict(by_exterior)
+        # The plans' bounds for filter_batch, built on first use
+        self._batch_tables = None
+        self._bucket_arrays = None
+        self._candidate_cache: Dict[Tuple[str, str], np.ndarray] = {}
+
+    def __iter__(self):
+        return iter(self.plans)
+
+    def __len__(self):
+        return len(self.plans)
+
+    def _buckets(self, market_name: str, exterior: str, by_name, by_exterior) -> list:
+        """The buckets of plans whose name and exterior fit the sale; no plan is in two of them"""
+        buckets = []
+        for ext in (exterior, None):
+            if ext in by_exterior:
+                buckets.append(by_exterior[ext])
+
+        if by_name:
+            for name_id in self.names.find(market_name):
+                for ext in (exterior, None):
+                    bucket = by_name.get((name_id, ext))
+                    if bucket is not None:
+                        buckets.append(bucket)
+        return buckets
+
+    def candidates(self, sale) -> Iterable[int]:
+        """Positions of the plans that could match, in ascending order"""
+        buckets = self._buckets(*_candidate_key(sale), self._by_name, self._by_exterior)
+        if len(buckets) == 1:
+            return buckets[0]
+        return merge(*buckets)
+
+    def candidate_array(self, sale) -> np.ndarray:
+        """Same candidates as candidates(), as one sorted array.
+
+        Cached per (market name, exterior): a feed repeats the same items
+        over and over, so the name scan mostly runs once per item.
+        """
+        key = _candidate_key(sale)
+        positions = self._candidate_cache.get(key)
+        if positions is None:
+            if len(self._candidate_cache) >= CANDIDATE_CACHE_SIZE:
+                self._candidate_cache.clear()
+            if self._bucket_arrays is None:
+                self._bucket_arrays = (
+                    {key: np.array(bucket, dtype=np.int64) for key, bucket in self._by_name.items()},
+                    {key: np.array(bucket, dtype=np.int64) for key, bucket in self._by_exterior.items()},
+                )
+            buckets = self._buckets(*key, *self._bucket_arrays)
+            if len(buckets) == 1:
+                positions = buckets[0]
+            else:
+                positions = np.concatenate(buckets) if buckets else _NO_CANDIDATES
+                positions.sort()
+            self._candidate_cache[key] = positions
+        return positions
+
+    def batch_tables(self) -> Dict[str, Any]:
+        """The plans' bounds as NumPy arrays for filter_batch.
+
+        One array per plan field, indexed by plan position, with NaN where a
+        plan has no such bound. Pattern lists become sorted keys plan
+        position * len(pattern_codes) + code of the pattern value. `checks`
+        lists the bounds at least one plan sets; the others are skipped.
+        """
+        if self._batch_tables is None:
+            def bounds(attribute):
+                return _column((getattr(plan, attribute) for plan in self.plans), len(self.plans))
+
+            def flags(predicate):
+                return np.fromiter((predicate(plan) for plan in self.plans), dtype=bool, count=len(self.plans))
+
+            pattern_codes: Dict[int, int] = {}
+            for plan in self.plans:
+                for pattern in plan.patterns or ():
+                    pattern_codes.setdefault(pattern, len(pattern_codes))
+            pattern_keys = sorted(position * len(pattern_codes) + pattern_codes[pattern]
+                                  for position, plan in enumerate(self.plans)
+                                  for pattern in plan.patterns or ())
+
+            table = {
+                "min_price": bounds("min_price"),
+                "max_price": bounds("max_price"),
+                "min_wear": bounds("min_wear"),
+                "max_wear": bounds("max_wear"),
+                "min_relative_price": bounds("min_relative_price"),
+                "max_relative_price": bounds("max_relative_price"),
+                "patterns": flags(lambda plan: plan.patterns is not None),
+                "relative": flags(lambda plan: plan.relative),
+                "relative_to_mean": flags(lambda plan: plan.relative_to == "mean"),
+                "pattern_codes": pattern_codes,
+                "pattern_keys": np.array(pattern_keys, dtype=np.int64),
+            }
+            table["checks"] = frozenset(key for key in ("min_price", "max_price", "min_wear", "max_wear",
+                                                        "patterns", "relative")
+                                        if (table[key].any() if table[key].dtype == bool
+                                            else not np.isnan(table[key]).all()))
+            self._batch_tables = table
+        return self._batch_tables
+
+    def match(self, sale) -> Optional[FilterPlan]:
+        """Return the first plan (in filter order) matching the sale"""
+        if type(sale) is Sale:
+            if sale.event_type != "listed":
+                return None
+            plans = self.plans
+            for position in self.candidates(sale):
+                if plans[position].matches_sale(sale):
+                    return plans[position]
+            return None
+
+        if sale["eventType"] != "listed":
+            return None
+        for position in self.candidates(sale):
+            plan = self.plans[position]
+            if plan.matches(sale):
+                return plan
+        return None
+
+
+def build_filter_index(query_params: Dict[str, Any]) -> FilterIndex:
+    """Compile a script_params.json style dict and index the plans"""
+    return FilterIndex(compile_filters(query_params))
+
+
+def filter_item_single(sale, filter_params):
+    """Filter a single sale against a single filter configuration"""
+    if not isinstance(filter_params, FilterPlan):
+        filter_params = compile_filter(filter_params)
+    return filter_params.matches(sale)
+
+
+def filter_item(sale, query_params):
+    """Filter a sale against multiple filter configurations.
+
+    `query_params` is either the raw params dict, the result of
+    compile_filters() or a FilterIndex; pass an index on the hot path.
+    """
+    if isinstance(query_params, FilterIndex):
+        plan = query_params.match(sale)
+        return (True, plan.config) if plan else (False, None)
+
+    if isinstance(query_params, dict):
+        plans = compile_filters(query_params)
+    else:
+        plans = query_params
+
+    # Check if sale matches ANY of the filters (OR logic between filters)
+    for plan in plans:
+        if plan.matches(sale):
+            return True, plan.config  # Return True and the matching filter
+
+    return False, None
+
+
+def filter_batch(sales, plans) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """Filter a whole poll response at once.
+
+    Price, wear, pattern and exterior are turned into NumPy columns and
+    the plans' numeric predicates are evaluated as array masks. Returns
+    (sale, matching filter) pairs in sale order, using the same first-match
+    rule as filter_item. `sales` is either all Sale records or all raw feed
+    events.
+
+    Pass a FilterIndex on the hot path: then only the (sale, candidate plan)
+    pairs from the index are evaluated, see _filter_candidates. A plain
+    sequence of plans gets one mask row per plan, with the name checked in
+    Python for the pairs that survive the masks.
+    """
+    index = plans if isinstance(plans, FilterIndex) else None
+    plans = index.plans if index is not None else tuple(plans)
+    if not sales or not plans:
+        return []
+
+    count = len(sales)
+    typed = type(sales[0]) is Sale
+    if typed:
+        # Decoded records: the columns are read straight off the typed fields
+        listed = np.fromiter((sale.event_type == "listed" for sale in sales), dtype=bool, count=count)
+        price = _column((sale.price for sale in sales), count)
+        wear_low = wear_high = _column((sale.wear for sale in sales), count)
+        raw_patterns = [sale.pattern for sale in sales]
+        references = {}
+        if ("relative" in index.batch_tables()["checks"] if index is not None
+                else any(plan.relative for plan in plans)):
+            references["median"] = _column((sale.median_price for sale in sales), count)
+            references["mean"] = _column((sale.mean_price for sale in sales), count)
+    else:
+        items = [sale["sale"] for sale in sales]
+        listed = np.fromiter((sale["eventType"] == "listed" for sale in sales), dtype=bool, count=count)
+        price = _column((_to_int(item.get("salePrice", 0)) for item in items), count)
+        # Missing wear passes both bounds, exactly like the .get() defaults in FilterPlan.matches
+        wear_low = _column((_to_float(item.get("wear", 1)) for item in items), count)
+        wear_high = _column((_to_float(item.get("wear", 0)) for item in items), count)
+        raw_patterns = [item.get("pattern") for item in items]
+        references = None
+
+    if index is not None:
+        return _filter_candidates(sales, index, listed, price, wear_low, wear_high, raw_patterns, references)
+
+    if typed:
+        exterior = np.fromiter((sale.exterior for sale in sales), dtype=np.int64, count=count)
+        plan_exteriors = [plan.exterior_code for plan in plans]
+        market_names = [sale.name_key for sale in sales]
     else:
-        # Old format compatibility
-        result = filter_item_single(sale, query_params)
-        return result, query_params if result else None
+        exterior_codes: Dict[str, int] = {}
+        exterior = np.fromiter(
+            (exterior_codes.setdefault(item.get("exterior", "").lower(), len(exterior_codes)) for item in items),
+            dtype=np.int64, count=count,
+        )
+        plan_exteriors = [exterior_codes.get(plan.exterior, -1) if plan.exterior is not None else None
+                          for plan in plans]
+        market_names = None
+
+    has_pattern = np.fromiter((type(p) is int for p in raw_patterns), dtype=bool, count=count)
+    pattern = np.fromiter((p if type(p) is int else 0 for p in raw_patterns), dtype=np.int64, count=count)
+
+    masks = np.empty((len(plans), count), dtype=bool)
+    for row, plan in enumerate(plans):
+        mask = masks[row]
+        mask[:] = listed
+        # NaN marks an unparsable sale value; comparisons against it are False so the check is skipped
+        if plan.min_price is not None:
+            mask &= ~(price < plan.min_price)
+        if plan.max_price is not None:
+            mask &= ~(price > plan.max_price)
+        if plan.min_wear is not None:
+            mask &= ~(wear_low < plan.min_wear)
+        if plan.max_wear is not None:
+            mask &= ~(wear_high > plan.max_wear)
+        if plan.patterns is not None:
+            mask &= has_pattern & np.isin(pattern, np.fromiter(plan.patterns, dtype=np.int64))
+        if plan_exteriors[row] is not None:
+            mask &= exterior == plan_exteriors[row]
+        if plan.relative:
+            if references is None:
+                mask[:] = False
+                continue
+            # NaN price or reference (no typical price yet) fails every comparison
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ratio = price / references[plan.relative_to]
+            valid = references[plan.relative_to] > 0
+            if plan.min_relative_price is not None:
+                valid &= ratio >= plan.min_relative_price
+            if plan.max_relative_price is not None:
+                valid &= ratio <= plan.max_relative_price
+            mask &= valid
+
+    # Pairs come out grouped by sale, with plans in filter order inside each group
+    sale_positions, plan_positions = np.nonzero(masks.T)
+    if market_names is None:
+        market_names = [None] * count
+    matches = []
+    last_matched = -1
+    for position, row in zip(sale_positions.tolist(), plan_positions.tolist()):
+        if position == last_matched:
+            continue
+        name = plans[row].name
+        if name is not None:
+            market_name = market_names[position]
+            if market_name is None:
+                market_name = market_names[position] = normalize_name(items[position].get("marketName", ""))
+            if name not in market_name:
+                continue
+        matches.append((sales[position], plans[row].config))
+        last_matched = position
+
+    return matches
+
+
+def _filter_candidates(sales, index, listed, price, wear_low, wear_high, raw_patterns, references):
+    """filter_batch over the index's candidate pairs.
+
+    Candidacy already covers the name and the exterior. The sorted candidate
+    arrays are laid end to end, so the (sale, plan) pairs come out grouped
+    by sale and in filter order within each sale: the remaining bounds are
+    one vectorised pass over all pairs, and the first surviving pair of a
+    sale is its match.
+    """
+    candidate_array = index.candidate_array
+    chunks = [candidate_array(sale) if is_listed else _NO_CANDIDATES
+              for sale, is_listed in zip(sales, listed.tolist())]
+    plan_at = np.concatenate(chunks)
+    if not len(plan_at):
+        return []
+    sizes = np.fromiter(map(len, chunks), dtype=np.int64, count=len(chunks))
+    sale_at = np.repeat(np.arange(len(sales)), sizes)
+    table = index.batch_tables()
+    checks = table["checks"]
+
+    # NaN on either side (no bound, or an unparsable sale value) skips that check
+    ok = np.ones(len(plan_at), dtype=bool)
+    pair_price = price[sale_at] if checks & {"min_price", "max_price", "relative"} else None
+    if "min_price" in checks:
+        ok &= ~(pair_price < table["min_price"][plan_at])
+    if "max_price" in checks:
+        ok &= ~(pair_price > table["max_price"][plan_at])
+    if "min_wear" in checks:
+        ok &= ~(wear_low[sale_at] < table["min_wear"][plan_at])
+    if "max_wear" in checks:
+        ok &= ~(wear_high[sale_at] > table["max_wear"][plan_at])
+
+    if "relative" in checks:
+        relative = table["relative"][plan_at]
+        if references is None:
+            ok &= ~relative
+        elif relative.any():
+            pairs = np.flatnonzero(relative & ok)
+            pair_sales, pair_plans = sale_at[pairs], plan_at[pairs]
+            reference = np.where(table["relative_to_mean"][pair_plans],
+                                 references["mean"][pair_sales], references["median"][pair_sales])
+            # Unknown price or no typical price yet never matches
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ratio = pair_price[pairs] / reference
+                relative_ok = (reference > 0) & ~np.isnan(ratio)
+                relative_ok &= ~(ratio < table["min_relative_price"][pair_plans])
+                relative_ok &= ~(ratio > table["max_relative_price"][pair_plans])
+            ok[pairs] = relative_ok
+
+    if "patterns" in checks:
+        pairs = np.flatnonzero(table["patterns"][plan_at] & ok)
+        if len(pairs):
+            codes = table["pattern_codes"]
+            # Sale patterns no plan lists (or that aren't ints) get -1 and match no pattern list
+            sale_codes = np.fromiter((codes.get(p, -1) if type(p) is int else -1 for p in raw_patterns),
+                                     dtype=np.int64, count=len(raw_patterns))
+            pair_codes = sale_codes[sale_at[pairs]]
+            keys = plan_at[pairs] * len(codes) + pair_codes
+            pattern_keys = table["pattern_keys"]
+            slots = np.minimum(np.searchsorted(pattern_keys, keys), len(pattern_keys) - 1)
+            ok[pairs] = (pair_codes >= 0) & (pattern_keys[slots] == keys)
+
+    # First surviving pair of every sale
+    survivors = np.flatnonzero(ok)
+    if not len(survivors):
+        return []
+    matched = sale_at[survivors]
+    first = np.r_[True, matched[1:] != matched[:-1]]
+    plans = index.plans
+    return [(sales[position], plans[plan].config)
+            for position, plan in zip(matched[first].tolist(), plan_at[survivors[first]].tolist())]
+
+
+_NO_CANDIDATES = np.empty(0, dtype=np.int64)
+
+
+def _column(values, count):
+    return np.fromiter((np.nan if v is None else v for v in values), dtype=np.float64, count=count)
 
 '''
 query_params = {
@@ -91,4 +575,4 @@ query_params = {
     "minWear": "0.1",   # Mindest-Wear von 0.1
     "maxWear": "0.5",   # Maximal-Wear vom 0.5
     "exterior": "Well-Worn"    # Nur Well-Worn Items
-}'''
\ No newline at end of file
+}'''
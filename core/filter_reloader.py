@@ -0,0 +1,74 @@
+import asyncio
+import os
+import threading
+from typing import Any, Callable, Dict, Optional
+
+from filter_engine import FilterIndex, build_filter_index
+from listing_logger import SCRIPT_PARAMS_FILE, get_params
+
+
+class FilterReloader:
+    """Keeps the compiled filters in sync with script_params.json.
+
+    `current` always holds a complete FilterIndex. A reload compiles the new
+    filters first and then swaps the reference in one assignment, so a batch
+    that already picked up `current` finishes with the old filters and the
+    next one sees the new ones. Reloads are triggered by a changed mtime or
+    by request_reload() (e.g. from SIGHUP). watch() runs the reload in a
+    thread, so compiling (or redistributing shards) never stalls the event loop.
+    """
+
+    def __init__(self, params_file: str = SCRIPT_PARAMS_FILE,
+                 load: Callable[[], Dict[str, Any]] = get_params,
+                 build: Callable[[Dict[str, Any]], FilterIndex] = build_filter_index):
+        self.params_file = params_file
+        self._load = load
+        self._build = build
+        self._mtime = self._stat()
+        self._requested = False
+        self._lock = threading.Lock()
+        self.reloads = 0
+        self.current: FilterIndex = build(load())
+
+    def _stat(self) -> Optional[float]:
+        try:
+            return os.stat(self.params_file).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def request_reload(self):
+        self._requested = True
+
+    def reload(self) -> FilterIndex:
+        """Reload right away (thread-safe).
+
+        Raises when the new filters can't be built; the running ones stay in place.
+        """
+        with self._lock:
+            mtime = self._stat()
+            self._requested = False
+            index = self._build(self._load())
+            self._mtime = mtime
+            self.current = index
+            self.reloads += 1
+        print(f"Reloaded {len(index)} filters")
+        return index
+
+    def check(self) -> bool:
+        """Reload if the params file changed or a reload was requested"""
+        if self._stat() == self._mtime and not self._requested:
+            return False
+        try:
+            self.reload()
+        except Exception as e:
+            # Half-written or invalid file (bad JSON, entries of the wrong type, a dead
+            # shard worker): keep the running filters, retry on the next change
+            print("Error while reloading filters:", e)
+            return False
+        return True
+
+    async def watch(self, interval: float = 1.0):
+        """Check for changes every `interval` seconds"""
+        while True:
+            await asyncio.sleep(interval)
+            await asyncio.to_thread(self.check)
@@ -0,0 +1,62 @@
+import asyncio
+import json
+import os
+import time
+from typing import Optional
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+heartbeat_file_path = os.path.join(script_dir, '..', 'logs', 'heartbeat.json')
+
+
+class Heartbeat:
+    """Periodically writes the monitor's liveness to a small JSON file.
+
+    The dashboard reads it instead of scanning the process table. beat() is
+    called once per loop iteration (poll or stream batch) and is just a
+    counter increment.
+    """
+
+    def __init__(self, filename=heartbeat_file_path, details=None):
+        self.filename = os.path.abspath(filename)
+        self.details = details
+        self.iterations = 0
+        self._last_iterations = 0
+        self._last_write: Optional[float] = None
+
+    def beat(self):
+        self.iterations += 1
+
+    def write(self):
+        now = time.time()
+        rate = None
+        if self._last_write is not None and now > self._last_write:
+            rate = (self.iterations - self._last_iterations) / (now - self._last_write)
+        self._last_write, self._last_iterations = now, self.iterations
+
+        os.makedirs(os.path.dirname(self.filename), exist_ok=True)
+        tmp_file = self.filename + '.tmp'
+        with open(tmp_file, 'w') as f:
+            json.dump({
+                'pid': os.getpid(),
+                'time': now,
+                'iterations': self.iterations,
+                'rate': round(rate, 3) if rate is not None else None,
+                'details': self.details() if self.details else None,
+            }, f)
+        os.replace(tmp_file, self.filename)
+
+    async def run(self, interval: float = 2.0):
+        while True:
+            try:
+                self.write()
+            except OSError as e:
+                print("Error while writing heartbeat:", e)
+            await asyncio.sleep(interval)
+
+
+def read_heartbeat(filename=heartbeat_file_path):
+    try:
+        with open(filename, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
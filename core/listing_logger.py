@@ -1,7 +1,9 @@
 from datetime import datetime
 import os
 import json 
-from typing import Dict, Any
+import queue
+import threading
+from typing import Dict, Any, List, Optional
 
 script_dir = os.path.dirname(os.path.abspath(__file__))
 log_file_path = os.path.join(script_dir, '..', 'logs', 'listings.txt')
@@ -10,6 +12,9 @@ SCRIPT_PARAMS_FILE = os.path.abspath(
     os.path.join(os.path.dirname(__file__), '..', 'fastapi', 'app', 'script_params.json')
 )
 
+# Block size used when reading log files backwards
+_TAIL_BLOCK = 8192
+
 def get_params() -> Dict[str, Any]:
     if os.path.exists(SCRIPT_PARAMS_FILE):
         with open(SCRIPT_PARAMS_FILE, 'r') as f:
@@ -18,23 +23,129 @@ def get_params() -> Dict[str, Any]:
         return {}
 
 
-def write_to_file(content: str, filename=log_file_path, max_lines=20):
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    log_line = f'{timestamp} - {content}\n'
-
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    log_file_path = os.path.join(script_dir, '..', '..', filename)
+def segment_paths(filename: str, keep_segments: int) -> List[str]:
+    """Log segments from newest to oldest: listings.txt, listings.txt.1, ..."""
+    return [filename] + [f'{filename}.{i}' for i in range(1, keep_segments + 1)]
 
-    os.makedirs(os.path.dirname(log_file_path), exist_ok=True)
 
+def _tail_file(path: str, n: int) -> List[str]:
+    """Return up to n last lines of a file, newest first, reading from the end"""
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+        f = open(path, 'rb')
     except FileNotFoundError:
-        lines = []
+        return []
+
+    with f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        buffer = b''
+        # n + 1 newlines are enough to isolate the last n lines
+        while position > 0 and buffer.count(b'\n') <= n:
+            step = min(_TAIL_BLOCK, position)
+            position -= step
+            f.seek(position)
+            buffer = f.read(step) + buffer
+
+    lines = buffer.decode('utf-8', errors='replace').splitlines()
+    if position > 0:
+        lines = lines[1:]  # first line may be cut off
+    return lines[::-1][:n]
+
+
+def read_latest(n: int = 20, filename=log_file_path, keep_segments: int = 5) -> List[str]:
+    """Newest n log lines, newest first, without parsing whole segments"""
+    lines = []
+    for path in segment_paths(filename, keep_segments):
+        lines.extend(_tail_file(path, n - len(lines)))
+        if len(lines) >= n:
+            break
+    return lines
+
+
+class ListingLog:
+    """Append-only listing log with rotating segments.
+
+    write() only queues the line; a background thread appends queued lines
+    in batches. Once the active file grows past `segment_bytes` it is rotated
+    to listings.txt.1 (older segments shift up, at most `keep_segments` are kept).
+    """
+
+    def __init__(self, filename=log_file_path, segment_bytes: int = 256 * 1024, keep_segments: int = 5):
+        self.filename = os.path.abspath(filename)
+        self.segment_bytes = segment_bytes
+        self.keep_segments = keep_segments
+        self._queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def write(self, content: str):
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self._ensure_writer()
+        self._queue.put(f'{timestamp} - {content}\n')
+
+    def tail(self, n: int = 20) -> List[str]:
+        return read_latest(n, self.filename, self.keep_segments)
+
+    def flush(self):
+        """Block until every queued line is on disk"""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _ensure_writer(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='listing-log-writer', daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        os.makedirs(os.path.dirname(self.filename), exist_ok=True)
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = None in batch
+            lines = [line for line in batch if line is not None]
+            try:
+                if lines:
+                    self._append(lines)
+            except OSError as e:
+                print("Error while writing listing log:", e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _append(self, lines: List[str]):
+        with open(self.filename, 'a', encoding='utf-8') as f:
+            f.writelines(lines)
+            size = f.tell()
+        if size >= self.segment_bytes:
+            self._rotate()
+
+    def _rotate(self):
+        paths = segment_paths(self.filename, self.keep_segments)
+        if os.path.exists(paths[-1]):
+            os.remove(paths[-1])
+        for newer, older in zip(reversed(paths[:-1]), reversed(paths[1:])):
+            if os.path.exists(newer):
+                os.replace(newer, older)
+
+
+listing_log = ListingLog()
 
-    lines.insert(0, log_line)
-    lines = lines[:max_lines]
 
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.writelines(lines)
+def write_to_file(content: str):
+    """Queue a line for the listing log (see ListingLog)"""
+    listing_log.write(content)
@@ -0,0 +1,173 @@
+import asyncio
+from bisect import bisect_left
+from contextlib import contextmanager
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Seconds; covers sub-millisecond filter runs up to slow Discord sends
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Sale timestamp -> notification sent, dominated by feed and Discord delays
+DETECTION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+STAGES = ('fetch', 'decode', 'filter', 'enqueue', 'send')
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _format_labels(labelnames: Sequence[str], values: Tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels"""
+
+    type = 'counter'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self.values.get(tuple(str(labels[name]) for name in self.labelnames), 0)
+
+    def samples(self) -> Iterable[str]:
+        for key, value in sorted(self.values.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+
+
+class Histogram:
+    """Fixed-bucket histogram, optionally split by labels.
+
+    observe() is a bisect and three additions, cheap enough for the hot path.
+    """
+
+    type = 'histogram'
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (+Inf last), sum, count]
+        self.series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def count(self, **labels) -> int:
+        series = self.series.get(tuple(str(labels[name]) for name in self.labelnames))
+        return series[2] if series else 0
+
+    def samples(self) -> Iterable[str]:
+        for key, (counts, total, count) in sorted(self.series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, key)} {count}"
+
+
+class Registry:
+    """Collection of metrics rendered together in Prometheus text format"""
+
+    def __init__(self):
+        self.metrics: List = []
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, help, labelnames)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, help, labelnames, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+# Monitor-wide metrics, served on METRICS_PORT by data_parser.py
+registry = Registry()
+stage_seconds = registry.histogram(
+    'skinport_stage_seconds', 'Time spent per pipeline stage (fetch, decode, filter, enqueue, send)', ('stage',))
+detection_seconds = registry.histogram(
+    'skinport_detection_latency_seconds', 'Sale timestamp to notification delivered, per sink', ('sink',),
+    buckets=DETECTION_BUCKETS)
+sales_total = registry.counter(
+    'skinport_sales_total', 'Sale events by outcome (seen, deduped, matched, failed)', ('event',))
+start_seconds = registry.histogram(
+    'skinport_start_to_first_poll_seconds', 'Start requested on the dashboard to the first filtered batch',
+    buckets=DETECTION_BUCKETS)
+
+
+def observe_stage(stage: str, seconds: float):
+    stage_seconds.observe(seconds, stage=stage)
+
+
+@contextmanager
+def timed(stage: str):
+    """Record the duration of the with-block as one `stage` observation"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage_seconds.observe(time.perf_counter() - started, stage=stage)
+
+
+def observe_detection(timestamp_ms: Optional[float], now: Optional[float] = None, sink: str = 'discord'):
+    """Sale event timestamp (ms since epoch, as in the feed) to now"""
+    if timestamp_ms is None:
+        return
+    now = time.time() if now is None else now
+    detection_seconds.observe(max(0.0, now - timestamp_ms / 1000), sink=sink)
+
+
+async def serve(port: int, host: str = '127.0.0.1', source: Registry = registry):
+    """Serve GET /metrics until cancelled"""
+    from aiohttp import web
+
+    async def handle(request):
+        return web.Response(body=source.render().encode(), headers={'Content-Type': CONTENT_TYPE})
+
+    app = web.Application()
+    app.router.add_get('/metrics', handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, host, port).start()
+        print(f"Serving metrics on http://{host}:{port}/metrics")
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
@@ -0,0 +1,157 @@
+import asyncio
+import json
+import time
+from typing import Any, Callable, Dict, Optional
+
+import metrics
+
+# Port of the local control channel of a standby monitor
+DEFAULT_CONTROL_PORT = 9109
+
+
+class MonitorControl:
+    """Armed / disarmed state of the monitor and its local control channel.
+
+    A disarmed monitor keeps everything warm - bot login, relay, feed,
+    seen sales and price statistics - but filters and notifies nothing.
+    arm() reloads the filters (in a thread when it comes over the channel)
+    and lets the next batch through the filters;
+    the time from the start request to that first filtered batch is kept
+    as `first_poll_seconds`.
+
+    The channel is one JSON object per line over TCP on localhost:
+    {"cmd": "arm", "requested_at": <unix time>}, {"cmd": "disarm"} and
+    {"cmd": "status"}; every command is answered with the status.
+    """
+
+    def __init__(self, armed: bool = True, on_arm: Optional[Callable[[], Any]] = None,
+                 on_change: Optional[Callable[[], Any]] = None, clock: Callable[[], float] = time.time):
+        self.armed = armed
+        self.on_arm = on_arm
+        self.on_change = on_change
+        self.clock = clock
+        self.requested_at: Optional[float] = None
+        self.first_poll_seconds: Optional[float] = None
+        self.arms = 0
+        self.port: Optional[int] = None
+        self._wake = asyncio.Event()
+
+    def arm(self, requested_at: Optional[float] = None):
+        if self.on_arm is not None:
+            self.on_arm()
+        self._armed(requested_at)
+
+    async def arm_async(self, requested_at: Optional[float] = None):
+        """arm() for the event loop: the reload runs in a thread"""
+        if self.on_arm is not None:
+            await asyncio.to_thread(self.on_arm)
+        self._armed(requested_at)
+
+    def _armed(self, requested_at: Optional[float]):
+        self.armed = True
+        self.requested_at = requested_at or self.clock()
+        self.first_poll_seconds = None
+        self.arms += 1
+        self._wake.set()
+        self._changed()
+
+    def disarm(self):
+        self.armed = False
+        self._changed()
+
+    def _changed(self):
+        if self.on_change is not None:
+            try:
+                self.on_change()
+            except OSError as e:
+                print("Error while reporting monitor state:", e)
+
+    def polled(self):
+        """Call after a batch went through the filters"""
+        if self.armed and self.first_poll_seconds is None and self.requested_at is not None:
+            self.first_poll_seconds = max(0.0, self.clock() - self.requested_at)
+            metrics.start_seconds.observe(self.first_poll_seconds)
+            print(f"First filtered poll {self.first_poll_seconds * 1000:.0f} ms after start")
+
+    async def wait(self, delay: float):
+        """Sleep up to `delay` seconds, returning early when the monitor gets armed"""
+        if not self._wake.is_set():
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+        self._wake.clear()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'armed': self.armed,
+            'arms': self.arms,
+            'requested_at': self.requested_at,
+            'start_to_first_poll_ms': round(self.first_poll_seconds * 1000, 1)
+            if self.first_poll_seconds is not None else None,
+        }
+
+    async def handle(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        cmd = command.get('cmd')
+        if cmd == 'arm':
+            await self.arm_async(command.get('requested_at'))
+        elif cmd == 'disarm':
+            self.disarm()
+        elif cmd != 'status':
+            return {'ok': False, 'error': f"unknown command: {cmd}"}
+        return {'ok': True, **self.status()}
+
+    async def _client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    command = json.loads(line)
+                    if not isinstance(command, dict):
+                        raise ValueError("expected a JSON object")
+                except ValueError as e:
+                    reply = {'ok': False, 'error': f"invalid command: {e}"}
+                else:
+                    try:
+                        reply = await self.handle(command)
+                    except Exception as e:
+                        # e.g. the filters could not be reloaded; the monitor keeps its state
+                        reply = {'ok': False, 'error': str(e)}
+                writer.write(json.dumps(reply).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, port: int = DEFAULT_CONTROL_PORT, host: str = '127.0.0.1'):
+        """Accept control commands until cancelled (port 0 picks a free one, see .port)"""
+        server = await asyncio.start_server(self._client, host, port)
+        self.port = server.sockets[0].getsockname()[1]
+        print(f"Control channel on {host}:{self.port}")
+        async with server:
+            await server.serve_forever()
+
+
+async def send_command(command: Dict[str, Any], port: int = DEFAULT_CONTROL_PORT,
+                       host: str = '127.0.0.1', timeout: float = 2.0) -> Dict[str, Any]:
+    """Send one command to a running monitor and return its reply.
+
+    Raises OSError (ConnectionRefusedError when no monitor listens) or
+    asyncio.TimeoutError.
+    """
+    async def exchange():
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            writer.write(json.dumps(command).encode() + b'\n')
+            await writer.drain()
+            line = await reader.readline()
+        finally:
+            writer.close()
+        if not line:
+            raise ConnectionResetError("monitor closed the control connection")
+        return json.loads(line)
+
+    return await asyncio.wait_for(exchange(), timeout)
@@ -0,0 +1,75 @@
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+
+class NameAutomaton:
+    """Aho-Corasick automaton over a fixed set of names.
+
+    find() reports every name occurring in a text with a single left to
+    right scan, regardless of how many names there are. The transition
+    table is filled lazily: the first time a state sees a character the
+    fail links are followed once and the result is cached, so repeated
+    scans only do one dict lookup per character.
+    """
+
+    def __init__(self, names: Iterable[str]):
+        self.names: Tuple[str, ...] = tuple(dict.fromkeys(name for name in names if name))
+
+        # Trie: goto[state][char] -> state, outputs as name ids
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for name_id, name in enumerate(self.names):
+            state = 0
+            for char in name:
+                following = goto[state].get(char)
+                if following is None:
+                    following = len(goto)
+                    goto[state][char] = following
+                    goto.append({})
+                    outputs.append([])
+                state = following
+            outputs[state].append(name_id)
+
+        # Breadth-first fail links; outputs also inherit what their fail state reports
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, following in goto[state].items():
+                queue.append(following)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[following] = goto[fallback].get(char, 0)
+                outputs[following].extend(outputs[fail[following]])
+
+        self._goto = goto
+        self._fail = fail
+        self._delta: List[Dict[str, int]] = [dict(edges) for edges in goto]
+        self._outputs: List[FrozenSet[int]] = [frozenset(out) for out in outputs]
+
+    def __len__(self):
+        return len(self.names)
+
+    def _transition(self, state: int, char: str) -> int:
+        original = state
+        while state and char not in self._goto[state]:
+            state = self._fail[state]
+        following = self._goto[state].get(char, 0)
+        self._delta[original][char] = following
+        return following
+
+    def find(self, text: str) -> FrozenSet[int]:
+        """Ids (positions in .names) of all names that occur in text"""
+        delta = self._delta
+        outputs = self._outputs
+        found = set()
+        state = 0
+        for char in text:
+            following = delta[state].get(char)
+            if following is None:
+                following = self._transition(state, char)
+            state = following
+            if outputs[state]:
+                found.update(outputs[state])
+        return frozenset(found)
@@ -0,0 +1,48 @@
+from typing import Optional
+
+
+class AdaptivePollScheduler:
+    """Chooses the delay before the next feed poll.
+
+    The interval shrinks towards `min_interval` while new sales keep arriving
+    and grows towards `max_interval` while the feed is unchanged. Errors back
+    off exponentially up to `error_interval` and reset on the next success.
+    Time spent processing a poll is deducted from the delay.
+    """
+
+    def __init__(self, min_interval: float = 0.5, max_interval: float = 5.0,
+                 error_interval: float = 30.0, tighten: float = 0.5, relax: float = 1.5):
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("expected 0 < min_interval <= max_interval")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.error_interval = error_interval
+        self.tighten = tighten
+        self.relax = relax
+
+        self.interval = min_interval
+        self.errors = 0
+
+    def record(self, new_sales: int = 0, error: bool = False) -> float:
+        """Feed back the outcome of a poll and return the new base interval"""
+        if error:
+            self.errors += 1
+            self.interval = min(self.error_interval, self.max_interval * 2 ** (self.errors - 1))
+            return self.interval
+
+        if self.errors:
+            # First success after a failure: resume at the calm rate
+            self.errors = 0
+            self.interval = self.max_interval
+
+        if new_sales:
+            self.interval = max(self.min_interval, self.interval * self.tighten)
+        else:
+            self.interval = min(self.max_interval, self.interval * self.relax)
+        return self.interval
+
+    def next_delay(self, elapsed: Optional[float] = None) -> float:
+        """Seconds to sleep before the next poll, minus processing time"""
+        if elapsed is None:
+            return self.interval
+        return max(0.0, self.interval - elapsed)
@@ -0,0 +1,148 @@
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class P2Quantile:
+    """Streaming quantile estimate in constant memory (the P² algorithm).
+
+    Keeps five markers whose heights approximate the minimum, the p/2, p and
+    (1+p)/2 quantiles and the maximum; each observation moves them with a
+    piecewise-parabolic correction. Exact until five values have been seen.
+    """
+
+    __slots__ = ('p', 'count', 'heights', 'positions', 'desired', 'increments')
+
+    def __init__(self, p: float = 0.5):
+        self.p = p
+        self.count = 0
+        self.heights: List[float] = []
+        self.positions = [0, 1, 2, 3, 4]
+        self.desired = [0, 2 * p, 4 * p, 2 + 2 * p, 4]
+        self.increments = (0, p / 2, p, (1 + p) / 2, 1)
+
+    def add(self, value: float):
+        self.count += 1
+        heights = self.heights
+        if self.count <= 5:
+            heights.append(value)
+            heights.sort()
+            return
+
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = 0
+            while value >= heights[cell + 1]:
+                cell += 1
+
+        positions = self.positions
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        for i in (1, 2, 3):
+            offset = self.desired[i] - positions[i]
+            if (offset >= 1 and positions[i + 1] - positions[i] > 1) or \
+                    (offset <= -1 and positions[i - 1] - positions[i] < -1):
+                step = 1 if offset > 0 else -1
+                candidate = self._parabolic(i, step)
+                if not heights[i - 1] < candidate < heights[i + 1]:
+                    candidate = heights[i] + step * (heights[i + step] - heights[i]) / (positions[i + step] - positions[i])
+                heights[i] = candidate
+                positions[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        q, n = self.heights, self.positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self) -> Optional[float]:
+        if not self.count:
+            return None
+        if self.count <= 5:
+            # Exact quantile of the few values seen so far
+            return self.heights[min(len(self.heights) - 1, int(self.p * len(self.heights)))]
+        return self.heights[2]
+
+
+class ItemPrices:
+    """Rolling price statistics of one item: P² median and an exponentially decayed mean"""
+
+    __slots__ = ('count', 'mean', 'median')
+
+    def __init__(self):
+        self.count = 0
+        self.mean: Optional[float] = None
+        self.median = P2Quantile(0.5)
+
+    def add(self, price: int, alpha: float):
+        self.count += 1
+        self.mean = price if self.mean is None else self.mean + alpha * (price - self.mean)
+        self.median.add(price)
+
+
+class PriceStats:
+    """Per-item price statistics from the listings the monitor sees.
+
+    Keyed by marketHashName and bounded to `capacity` items; the least
+    recently listed item is forgotten first. annotate() copies the current
+    reference prices onto Sale records (one dict lookup each), so relative
+    price filters need no access to this object, also in filter worker
+    processes. Call it before filtering and observe() after, so a listing is
+    never compared against a reference that already contains itself.
+    """
+
+    def __init__(self, capacity: int = 50000, alpha: float = 0.1, min_samples: int = 5):
+        self.capacity = capacity
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self._items: 'OrderedDict[str, ItemPrices]' = OrderedDict()
+        self.observed = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, name: str) -> Optional[ItemPrices]:
+        return self._items.get(name)
+
+    def observe(self, name: str, price: Optional[int]):
+        if price is None or price <= 0:
+            return
+        item = self._items.get(name)
+        if item is None:
+            item = self._items[name] = ItemPrices()
+            if len(self._items) > self.capacity:
+                self._items.popitem(last=False)
+                self.evictions += 1
+        else:
+            self._items.move_to_end(name)
+        item.add(price, self.alpha)
+        self.observed += 1
+
+    def observe_sales(self, sales: Iterable[Any]):
+        for sale in sales:
+            self.observe(sale.market_hash_name, sale.price)
+
+    def annotate(self, sales: Iterable[Any]):
+        """Set median_price / mean_price on Sale records with enough history"""
+        for sale in sales:
+            item = self._items.get(sale.market_hash_name)
+            if item is not None and item.count >= self.min_samples:
+                sale.median_price = item.median.value()
+                sale.mean_price = item.mean
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'items': len(self._items),
+            'capacity': self.capacity,
+            'observed': self.observed,
+            'evictions': self.evictions,
+        }
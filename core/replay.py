@@ -0,0 +1,105 @@
+"""Replay a feed capture through the filters as fast as possible.
+
+    python core/replay.py logs/feed_capture.jsonl.gz
+    python core/replay.py capture.jsonl.gz --params my_filters.json --json
+
+Sales are deduplicated like in the monitor (a SeenSales of the same
+capacity and TTL, aged by the capture's receive times) and run through
+filter_item; nothing is sent to Discord. Reports how often each filter fired and the
+throughput achieved.
+"""
+import argparse
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from feed_capture import read_capture
+from filter_engine import FilterIndex, build_filter_index, filter_item
+from listing_logger import SCRIPT_PARAMS_FILE
+from price_stats import PriceStats
+from sale import Sale
+from seen_sales import SeenSales
+
+
+def replay(responses: Iterable[Tuple[float, List[Dict[str, Any]]]], index: FilterIndex,
+           verbose: bool = False, price_stats: Optional[PriceStats] = None,
+           seen_capacity: int = 10000, seen_ttl: Optional[float] = None) -> Dict[str, Any]:
+    """Run recorded responses through `index` and summarize what would have fired.
+
+    Price statistics are rebuilt from the capture as it is replayed, so
+    relative price filters see the same history the monitor would have had.
+    Duplicates are dropped by a SeenSales like the monitor's, whose TTL runs
+    on the recorded receive times instead of the replay's wall clock.
+    """
+    price_stats = price_stats if price_stats is not None else PriceStats()
+    received_at = [0.0]
+    seen = SeenSales(capacity=seen_capacity, ttl=seen_ttl, clock=lambda: received_at[0])
+    fired: Dict[int, int] = {}
+    response_count = sale_count = unique_count = match_count = 0
+
+    started = time.perf_counter()
+    for received_at[0], sales in responses:
+        response_count += 1
+        sale_count += len(sales)
+        new_sales = [Sale.from_event(event) for event in sales if seen.add(event['sale']['saleId'])]
+        unique_count += len(new_sales)
+
+        # Same order as the monitor: reference prices before, statistics update after the batch
+        price_stats.annotate(new_sales)
+        for sale in new_sales:
+            matched, config = filter_item(sale, index)
+            if matched:
+                match_count += 1
+                fired[id(config)] = fired.get(id(config), 0) + 1
+                if verbose:
+                    print(f"[MATCH - {config.get('name', 'Unknown')}] {sale.market_name} ({sale.sale_id})")
+        price_stats.observe_sales(new_sales)
+    elapsed = time.perf_counter() - started
+
+    return {
+        'responses': response_count,
+        'sales': sale_count,
+        'unique_sales': unique_count,
+        'matches': match_count,
+        'seconds': round(elapsed, 3),
+        'sales_per_sec': round(unique_count / elapsed, 1) if elapsed else None,
+        'seen_sales': seen.stats(),
+        'filters': [
+            {'name': plan.config.get('name'), 'filter': plan.config, 'fired': fired.get(id(plan.config), 0)}
+            for plan in index
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('capture', help='gzip JSON lines file written by the monitor (CAPTURE_FILE)')
+    parser.add_argument('--params', default=SCRIPT_PARAMS_FILE, help='filters to test (script_params.json format)')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    parser.add_argument('--verbose', action='store_true', help='print every match')
+    parser.add_argument('--seen-capacity', type=int, default=int(os.getenv('SEEN_SALES_CAPACITY', '10000')),
+                        help='sale IDs remembered for duplicate detection (default: SEEN_SALES_CAPACITY)')
+    parser.add_argument('--seen-ttl', type=float, default=float(os.getenv('SEEN_SALES_TTL', '0')),
+                        help='forget sale IDs after this many seconds, 0 = never (default: SEEN_SALES_TTL)')
+    args = parser.parse_args()
+
+    with open(args.params, 'r') as f:
+        index = build_filter_index(json.load(f))
+
+    report = replay(read_capture(args.capture), index, verbose=args.verbose,
+                    seen_capacity=args.seen_capacity, seen_ttl=args.seen_ttl or None)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{report['responses']} responses, {report['sales']} sales, {report['unique_sales']} unique, "
+          f"{report['matches']} matches")
+    print(f"{report['seconds']} s, {report['sales_per_sec']} sales/s")
+    for entry in sorted(report['filters'], key=lambda entry: -entry['fired']):
+        print(f"{entry['fired']:>8}  {entry['name'] or '(any)'}")
+
+
+if __name__ == '__main__':
+    main()
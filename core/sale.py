@@ -0,0 +1,135 @@
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Any, Dict, Optional
+
+
+class Exterior(IntEnum):
+    """Skin condition as a small integer code"""
+    UNKNOWN = 0
+    FACTORY_NEW = 1
+    MINIMAL_WEAR = 2
+    FIELD_TESTED = 3
+    WELL_WORN = 4
+    BATTLE_SCARRED = 5
+    NOT_PAINTED = 6
+
+    @property
+    def label(self) -> str:
+        return _LABELS[self]
+
+    @classmethod
+    def parse(cls, text: Optional[str]) -> 'Exterior':
+        """Feed / filter label (any case) to its code, UNKNOWN if not recognised"""
+        if not text:
+            return cls.UNKNOWN
+        return _BY_LABEL.get(text.strip().lower(), cls.UNKNOWN)
+
+
+_LABELS = {
+    Exterior.UNKNOWN: '',
+    Exterior.FACTORY_NEW: 'Factory New',
+    Exterior.MINIMAL_WEAR: 'Minimal Wear',
+    Exterior.FIELD_TESTED: 'Field-Tested',
+    Exterior.WELL_WORN: 'Well-Worn',
+    Exterior.BATTLE_SCARRED: 'Battle-Scarred',
+    Exterior.NOT_PAINTED: 'Not Painted',
+}
+_BY_LABEL = {label.lower(): code for code, label in _LABELS.items() if label}
+
+
+def normalize_name(text: str) -> str:
+    """Key used for name matching: lower case, without the ™ of StatTrak™ and the
+    ★ of knives and gloves, single spaces. Filter names and market names go
+    through the same function, so "StatTrak AK-47" finds "StatTrak™ AK-47 | ..."."""
+    return ' '.join(text.replace('™', ' ').replace('★', ' ').lower().split())
+
+
+def _to_int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(slots=True)
+class Sale:
+    """A listed sale, decoded once from a feed event.
+
+    Only the fields the filters and the notifier use are kept, already
+    coerced: price in int cents, wear as float, exterior as an Exterior
+    code. Values that can't be parsed are None and skip their filter
+    check, like the raw event dicts did.
+    """
+    sale_id: Any
+    event_type: str
+    market_name: str
+    name_key: str
+    price: Optional[int]
+    wear: Optional[float]
+    exterior: Exterior
+    pattern: Optional[int]
+    market_hash_name: str = ''
+    stattrak: Optional[bool] = None
+    currency: str = ''
+    image: str = ''
+    url: str = ''
+    timestamp: Optional[int] = None
+    # Typical price of this item in cents, filled in by PriceStats.annotate
+    median_price: Optional[float] = None
+    mean_price: Optional[float] = None
+
+    @classmethod
+    def from_event(cls, event: Dict[str, Any]) -> 'Sale':
+        """Build a Sale from a feed event ({"eventType", "sale", "timestamp"})"""
+        item = event["sale"]
+        market_name = item.get("marketName", "")
+        pattern = item.get("pattern")
+        return cls(
+            sale_id=item.get("saleId"),
+            event_type=event.get("eventType", ""),
+            market_name=market_name,
+            name_key=normalize_name(market_name),
+            # A missing price counts as 0 and a missing wear skips both bounds, as before
+            price=_to_int(item.get("salePrice", 0)),
+            wear=_to_float(item["wear"]) if "wear" in item else None,
+            exterior=Exterior.parse(item.get("exterior")),
+            # Only integer patterns can match a filter's pattern list
+            pattern=pattern if type(pattern) is int else None,
+            market_hash_name=item.get("marketHashName", market_name),
+            stattrak=item.get("stattrak"),
+            currency=item.get("currency", ""),
+            image=item.get("image", ""),
+            url=item.get("url", ""),
+            timestamp=event.get("timestamp"),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly form for webhooks and audit logs"""
+        return {
+            "saleId": self.sale_id,
+            "marketName": self.market_name,
+            "marketHashName": self.market_hash_name,
+            "salePrice": self.price,
+            "currency": self.currency,
+            "wear": self.wear,
+            "pattern": self.pattern,
+            "exterior": self.exterior.label,
+            "stattrak": self.stattrak,
+            "url": self.url,
+            "image": self.image,
+            "timestamp": self.timestamp,
+            "medianPrice": self.median_price,
+            "meanPrice": self.mean_price,
+        }
+
+    @property
+    def display_price(self) -> Optional[float]:
+        """Price in currency units for display"""
+        return self.price / 100 if self.price is not None else None
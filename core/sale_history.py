@@ -0,0 +1,432 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from sale import normalize_name
+
+# Fixed-width columns of a segment, in file order
+COLUMNS = (
+    ('sale_id', np.dtype('<i8')),
+    ('timestamp', np.dtype('<i8')),  # ms since epoch, as in the feed
+    ('price', np.dtype('<i4')),      # cents, -1 when unknown
+    ('wear', np.dtype('<f8')),       # NaN when unknown
+    ('pattern', np.dtype('<i4')),    # -1 when unknown
+    ('name', np.dtype('<u4')),       # code in names.txt
+)
+# magic, version, capacity (rows), count (rows written)
+HEADER = np.dtype([('magic', 'S8'), ('version', '<u4'), ('capacity', '<u4'), ('count', '<u4')])
+HEADER_SIZE = 64
+MAGIC = b'SKHIST01'
+VERSION = 1
+
+history_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'logs', 'history')
+
+NAMES_FILE = 'names.txt'
+SEGMENT_SUFFIX = '.seg'
+INDEX_SUFFIX = '.idx'
+
+
+def _segment_name(number: int) -> str:
+    return f'segment-{number:06d}{SEGMENT_SUFFIX}'
+
+
+def _segment_files(directory: str) -> List[str]:
+    try:
+        return sorted(name for name in os.listdir(directory) if name.endswith(SEGMENT_SUFFIX))
+    except FileNotFoundError:
+        return []
+
+
+def _column_offsets(capacity: int) -> Dict[str, int]:
+    offsets, offset = {}, HEADER_SIZE
+    for column, dtype in COLUMNS:
+        offsets[column] = offset
+        offset += dtype.itemsize * capacity
+    return offsets
+
+
+def _segment_size(capacity: int) -> int:
+    return HEADER_SIZE + sum(dtype.itemsize for _, dtype in COLUMNS) * capacity
+
+
+class Segment:
+    """One segment file: a small header, then each column as a contiguous array.
+
+    Every column has room for `capacity` rows, so the file has a fixed size
+    and every column can be memory mapped directly. The header count is
+    written after the rows, so a reader never sees a half-written row.
+    """
+
+    def __init__(self, path: str, writable: bool = False):
+        self.path = path
+        self.writable = writable
+        self._map = np.memmap(path, dtype=np.uint8, mode='r+' if writable else 'r')
+        self._header = self._map[:HEADER.itemsize].view(HEADER)
+        if self._header['magic'][0] != MAGIC:
+            raise ValueError(f"not a sale history segment: {path}")
+        self.capacity = int(self._header['capacity'][0])
+        offsets = _column_offsets(self.capacity)
+        self.columns = {
+            column: self._map[offsets[column]:offsets[column] + dtype.itemsize * self.capacity].view(dtype)
+            for column, dtype in COLUMNS
+        }
+
+    @classmethod
+    def create(cls, path: str, capacity: int) -> 'Segment':
+        with open(path, 'wb') as f:
+            # Sparse where the file system supports it; the unused tail costs nothing
+            f.truncate(_segment_size(capacity))
+            header = np.zeros(1, HEADER)
+            header['magic'], header['version'], header['capacity'] = MAGIC, VERSION, capacity
+            f.write(header.tobytes())
+        return cls(path, writable=True)
+
+    @property
+    def count(self) -> int:
+        return int(self._header['count'][0])
+
+    def column(self, name: str) -> np.ndarray:
+        return self.columns[name][:self.count]
+
+    def append(self, rows: Dict[str, np.ndarray], start: int, stop: int) -> int:
+        """Copy rows[start:stop] (as far as they fit), returns how many were written"""
+        count = self.count
+        taken = min(stop - start, self.capacity - count)
+        for column, _ in COLUMNS:
+            self.columns[column][count:count + taken] = rows[column][start:start + taken]
+        self._header['count'] = count + taken
+        return taken
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.capacity
+
+    def summary(self) -> Dict[str, Any]:
+        """Min / max per range column and the item codes present, for skipping the segment"""
+        def bounds(values):
+            if not len(values):
+                return None
+            return [values.min().item(), values.max().item()]
+
+        price = self.column('price')
+        wear = self.column('wear')
+        return {
+            'count': self.count,
+            'timestamp': bounds(self.column('timestamp')),
+            'price': bounds(price[price >= 0]),
+            'wear': bounds(wear[~np.isnan(wear)]),
+            'names': np.unique(self.column('name')),
+        }
+
+    def flush(self):
+        self._map.flush()
+
+    def close(self):
+        if self.writable:
+            self._map.flush()
+        # The mapping is released with the last array referring to it
+        self.columns = {}
+        del self._header, self._map
+
+
+class HistoryWriter:
+    """Append-only, columnar history of every sale the monitor sees.
+
+    Sales go into fixed-size segment files of `segment_rows` rows
+    (see Segment); item names are stored once in names.txt and referenced
+    by their line number. When a segment is full a small .idx file with
+    its min / max timestamp, price and wear and its item codes is written
+    next to it, so queries can skip whole segments. At most `max_segments`
+    segments are kept (0 keeps all), the oldest are deleted first.
+    """
+
+    def __init__(self, directory: str, segment_rows: int = 65536, max_segments: int = 0):
+        self.directory = os.path.abspath(directory)
+        self.segment_rows = segment_rows
+        self.max_segments = max_segments
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._names_path = os.path.join(self.directory, NAMES_FILE)
+        _drop_partial_line(self._names_path)
+        names = _read_names(self._names_path)
+        self._codes = {name: code for code, name in enumerate(names)}
+        self._name_count = len(names)
+        self._names_file = open(self._names_path, 'a', encoding='utf-8')
+        self.appended = 0
+
+        segments = _segment_files(self.directory)
+        self._number = int(segments[-1][len('segment-'):-len(SEGMENT_SUFFIX)]) if segments else 0
+        self._segment: Optional[Segment] = None
+        if segments:
+            segment = Segment(os.path.join(self.directory, segments[-1]), writable=True)
+            if segment.full:
+                self._seal(segment)
+            else:
+                self._segment = segment
+        for name in segments[:-1]:
+            # A crash between filling a segment and writing its index
+            if not os.path.exists(self._index_path(name)):
+                segment = Segment(os.path.join(self.directory, name))
+                self._write_index(segment)
+                segment.close()
+
+    def _index_path(self, segment_name: str) -> str:
+        return os.path.join(self.directory, segment_name[:-len(SEGMENT_SUFFIX)] + INDEX_SUFFIX)
+
+    def _code(self, name: str) -> int:
+        code = self._codes.get(name)
+        if code is None:
+            line = name.replace('\n', ' ')
+            code = self._codes[name] = self._codes[line] = self._name_count
+            self._name_count += 1
+            # One name per line; written before any row refers to it
+            self._names_file.write(line + '\n')
+        return code
+
+    def append(self, sales: Sequence[Any], received_at: Optional[float] = None):
+        """Store a batch of Sale records"""
+        if not sales:
+            return
+        fallback = int((time.time() if received_at is None else received_at) * 1000)
+        codes = [self._code(sale.market_hash_name) for sale in sales]
+        self._names_file.flush()
+
+        rows = {
+            'sale_id': np.array([sale.sale_id if type(sale.sale_id) is int else -1 for sale in sales],
+                                dtype=np.int64),
+            'timestamp': np.array([sale.timestamp if isinstance(sale.timestamp, (int, float)) else fallback
+                                   for sale in sales], dtype=np.int64),
+            'price': np.array([sale.price if sale.price is not None else -1 for sale in sales],
+                              dtype=np.int32),
+            'wear': np.array([sale.wear if sale.wear is not None else np.nan for sale in sales],
+                             dtype=np.float64),
+            'pattern': np.array([sale.pattern if sale.pattern is not None else -1 for sale in sales],
+                                dtype=np.int32),
+            'name': np.array(codes, dtype=np.uint32),
+        }
+
+        position = 0
+        while position < len(sales):
+            if self._segment is None:
+                self._prune()
+                self._number += 1
+                self._segment = Segment.create(os.path.join(self.directory, _segment_name(self._number)),
+                                               self.segment_rows)
+            position += self._segment.append(rows, position, len(sales))
+            if self._segment.full:
+                self._seal(self._segment)
+                self._segment = None
+        self.appended += len(sales)
+
+    def _write_index(self, segment: Segment):
+        path = self._index_path(os.path.basename(segment.path))
+        summary = segment.summary()
+        summary['names'] = summary['names'].tolist()
+        with open(path + '.tmp', 'w') as f:
+            json.dump(summary, f, separators=(',', ':'))
+        os.replace(path + '.tmp', path)
+
+    def _seal(self, segment: Segment):
+        segment.flush()
+        self._write_index(segment)
+        segment.close()
+
+    def _prune(self):
+        if not self.max_segments:
+            return
+        # Called before a new segment is started, which makes max_segments again
+        segments = _segment_files(self.directory)
+        for name in segments[:max(0, len(segments) - self.max_segments + 1)]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+                os.remove(self._index_path(name))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                # e.g. still mapped by a reader on Windows; retried after the next segment
+                print("Error while removing old history segment:", e)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'appended': self.appended,
+            'segments': len(_segment_files(self.directory)),
+            'names': self._name_count,
+        }
+
+    def close(self):
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+        self._names_file.close()
+
+
+def _read_names(path: str) -> List[str]:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read().split('\n')[:-1]
+    except FileNotFoundError:
+        return []
+
+
+def _drop_partial_line(path: str):
+    """Cut an unfinished last name (crash mid-write) so new names start on their own line"""
+    try:
+        with open(path, 'rb+') as f:
+            data = f.read()
+            if data and not data.endswith(b'\n'):
+                f.truncate(data.rfind(b'\n') + 1)
+    except FileNotFoundError:
+        pass
+
+
+def _overlaps(bounds: Optional[List[float]], low: Optional[float], high: Optional[float]) -> bool:
+    if low is None and high is None:
+        return True
+    if bounds is None:
+        return False
+    return (low is None or bounds[1] >= low) and (high is None or bounds[0] <= high)
+
+
+class HistoryReader:
+    """Queries the history written by a HistoryWriter, possibly in another process.
+
+    Sealed segments are immutable: they stay mapped and their .idx
+    summaries cached. The segment still being written is re-read on every
+    query, so new sales show up immediately. Queries may come from several
+    threads; they run one at a time.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = os.path.abspath(directory)
+        self._names: List[str] = []
+        self._keys: List[str] = []
+        self._names_size = -1
+        self._sealed: Dict[str, Tuple[Segment, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def _load_names(self):
+        path = os.path.join(self.directory, NAMES_FILE)
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            return
+        if size != self._names_size:
+            self._names = _read_names(path)
+            self._keys = [normalize_name(name) for name in self._names]
+            self._names_size = size
+
+    def _item_codes(self, item: str) -> np.ndarray:
+        """Codes of every item whose name contains `item`, matched like filter names"""
+        key = normalize_name(item)
+        return np.array([code for code, name in enumerate(self._keys) if key in name], dtype=np.uint32)
+
+    def _segments(self) -> Iterable[Tuple[Segment, Dict[str, Any]]]:
+        """(segment, summary) from newest to oldest"""
+        names = _segment_files(self.directory)
+        for name in list(self._sealed):
+            if name not in names:
+                self._sealed.pop(name)[0].close()
+
+        for name in reversed(names):
+            if name in self._sealed:
+                yield self._sealed[name]
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                segment = Segment(path)
+            except (OSError, ValueError):
+                continue  # deleted or just being created
+            index_path = path[:-len(SEGMENT_SUFFIX)] + INDEX_SUFFIX
+            try:
+                with open(index_path, 'r') as f:
+                    summary = json.load(f)
+                summary['names'] = np.array(summary['names'], dtype=np.uint32)
+            except (FileNotFoundError, ValueError):
+                # Active segment: small enough to summarise on the fly
+                yield segment, segment.summary()
+                continue
+            self._sealed[name] = (segment, summary)
+            yield segment, summary
+
+    def query(self, item: Optional[str] = None, since: Optional[float] = None, until: Optional[float] = None,
+              min_price: Optional[int] = None, max_price: Optional[int] = None,
+              min_wear: Optional[float] = None, max_wear: Optional[float] = None,
+              limit: int = 100) -> Dict[str, Any]:
+        """Newest sales matching all given bounds (inclusive).
+
+        `item` is matched against the item names like a filter name, `since`
+        and `until` are unix times in seconds, prices are in cents.
+        """
+        with self._lock:
+            return self._query(item, since, until, min_price, max_price, min_wear, max_wear, limit)
+
+    def _query(self, item, since, until, min_price, max_price, min_wear, max_wear, limit):
+        self._load_names()
+        codes = self._item_codes(item) if item else None
+        ts_low = int(since * 1000) if since is not None else None
+        ts_high = int(until * 1000) if until is not None else None
+
+        sales: List[Dict[str, Any]] = []
+        scanned = skipped = 0
+        for segment, summary in self._segments():
+            if len(sales) >= limit:
+                break
+            if not (summary['count']
+                    and _overlaps(summary['timestamp'], ts_low, ts_high)
+                    and _overlaps(summary['price'], min_price, max_price)
+                    and _overlaps(summary['wear'], min_wear, max_wear)
+                    and (codes is None or np.isin(codes, summary['names']).any())):
+                skipped += 1
+                continue
+
+            scanned += 1
+            count = summary['count']
+            columns = {column: segment.columns[column][:count] for column, _ in COLUMNS}
+            mask = np.ones(count, dtype=bool)
+            if codes is not None:
+                mask &= np.isin(columns['name'], codes)
+            if ts_low is not None:
+                mask &= columns['timestamp'] >= ts_low
+            if ts_high is not None:
+                mask &= columns['timestamp'] <= ts_high
+            if min_price is not None or max_price is not None:
+                mask &= columns['price'] >= 0
+                if min_price is not None:
+                    mask &= columns['price'] >= min_price
+                if max_price is not None:
+                    mask &= columns['price'] <= max_price
+            if min_wear is not None:
+                mask &= columns['wear'] >= min_wear
+            if max_wear is not None:
+                mask &= columns['wear'] <= max_wear
+
+            # Rows are in arrival order, newest last
+            for row in np.flatnonzero(mask)[::-1][:limit - len(sales)]:
+                sales.append(self._row(columns, row))
+
+        return {'sales': sales, 'segments_scanned': scanned, 'segments_skipped': skipped}
+
+    def _row(self, columns: Dict[str, np.ndarray], row: int) -> Dict[str, Any]:
+        code = int(columns['name'][row])
+        price = int(columns['price'][row])
+        wear = float(columns['wear'][row])
+        pattern = int(columns['pattern'][row])
+        sale_id = int(columns['sale_id'][row])
+        return {
+            'saleId': sale_id if sale_id >= 0 else None,
+            'timestamp': int(columns['timestamp'][row]),
+            'marketHashName': self._names[code] if code < len(self._names) else None,
+            'salePrice': price if price >= 0 else None,
+            'wear': wear if wear == wear else None,
+            'pattern': pattern if pattern >= 0 else None,
+        }
+
+    def close(self):
+        with self._lock:
+            for segment, _ in self._sealed.values():
+                segment.close()
+            self._sealed.clear()
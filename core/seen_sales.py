@@ -0,0 +1,74 @@
+from collections import deque
+import time
+from typing import Callable, Dict, Hashable, Optional
+
+
+class SeenSales:
+    """Bounded set of already processed sale IDs.
+
+    A dict gives O(1) membership checks, a deque keeps insertion order so the
+    oldest ID is evicted once `capacity` is reached. With `ttl` set, IDs older
+    than `ttl` seconds are dropped as well.
+    """
+
+    def __init__(self, capacity: int = 10000, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.ttl = ttl
+        self._clock = clock
+        self._seen: Dict[Hashable, float] = {}
+        self._order = deque()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._seen)
+
+    def __contains__(self, sale_id):
+        self._expire(self._clock())
+        return sale_id in self._seen
+
+    def add(self, sale_id) -> bool:
+        """Remember a sale ID. Returns True if it was new, False for a duplicate"""
+        now = self._clock()
+        self._expire(now)
+
+        if sale_id in self._seen:
+            self.hits += 1
+            return False
+
+        self.misses += 1
+        self._seen[sale_id] = now
+        self._order.append((sale_id, now))
+
+        while len(self._order) > self.capacity:
+            old_id, _ = self._order.popleft()
+            del self._seen[old_id]
+            self.evictions += 1
+
+        return True
+
+    def _expire(self, now: float):
+        if self.ttl is None:
+            return
+        deadline = now - self.ttl
+        while self._order and self._order[0][1] <= deadline:
+            old_id, _ = self._order.popleft()
+            del self._seen[old_id]
+            self.expirations += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for sizing the structure against the real feed rate"""
+        return {
+            'size': len(self._seen),
+            'capacity': self.capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
@@ -0,0 +1,52 @@
+import sys
+import types
+from contextlib import contextmanager
+from typing import Dict
+
+from filter_engine import FilterIndex, compile_filters
+
+
+def serve(connection):
+    """Worker process: keeps one shard of the filters compiled and answers batches.
+
+    Messages are ('filters', offset, configs) to replace the shard and
+    ('batch', sales) to evaluate; a batch is answered with
+    [(sale position, global filter position)] for the first match per sale.
+    None stops the worker.
+    """
+    index = FilterIndex(())
+    positions: Dict[int, int] = {}
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        if message[0] == 'filters':
+            _, offset, configs = message
+            index = FilterIndex(compile_filters({'filters': configs}))
+            positions = {id(plan): offset + local for local, plan in enumerate(index.plans)}
+            connection.send(len(index))
+        else:
+            matches = []
+            for position, sale in enumerate(message[1]):
+                plan = index.match(sale)
+                if plan is not None:
+                    matches.append((position, positions[id(plan)]))
+            connection.send(matches)
+    connection.close()
+
+
+@contextmanager
+def without_main():
+    """Start spawn / forkserver children without re-importing the parent's __main__.
+
+    Such children normally import the parent's main script first (as
+    __mp_main__); for the monitor that is data_parser with the Discord bot,
+    aiohttp and its module-level state. serve() only needs this module and
+    filter_engine, so the parent's __main__ is hidden while the process starts.
+    """
+    main = sys.modules['__main__']
+    sys.modules['__main__'] = types.ModuleType('__main__')
+    try:
+        yield
+    finally:
+        sys.modules['__main__'] = main
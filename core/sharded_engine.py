@@ -0,0 +1,170 @@
+import multiprocessing
+import os
+import pickle
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from filter_engine import compile_filters
+from shard_worker import serve, without_main
+
+
+class ShardedFilterEngine:
+    """Filter evaluation spread over worker processes.
+
+    The filters are split into contiguous shards, one per worker, and each
+    worker keeps its shard compiled for its whole lifetime. A batch is sent
+    to every worker; each reports its first match per sale and the lowest
+    filter position wins, so the result is the same first match (in filter
+    order) as filter_item / filter_batch in a single process.
+
+    Dead workers are restarted with the current filters on the next batch.
+    """
+
+    def __init__(self, workers: Optional[int] = None, context: str = 'spawn'):
+        self.workers = workers or os.cpu_count() or 1
+        self._context = multiprocessing.get_context(context)
+        self._lock = threading.Lock()
+        self._shards: List[Tuple[Any, Any]] = []  # (process, connection)
+        self._configs: List[Dict[str, Any]] = []
+        self._active = 0  # workers holding a non-empty shard
+        self.batches = 0
+        self.restarts = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self._configs)
+
+    def _start_shard(self):
+        parent, child = self._context.Pipe()
+        process = self._context.Process(target=serve, args=(child,), daemon=True)
+        with without_main():
+            process.start()
+        child.close()
+        return process, parent
+
+    def _chunks(self, configs) -> List[Tuple[int, List[Dict[str, Any]]]]:
+        size = -(-len(configs) // self.workers) or 1
+        return [(offset, configs[offset:offset + size])
+                for offset in range(0, max(len(configs), 1), size)][:self.workers]
+
+    def _distribute(self, configs: Optional[List[Dict[str, Any]]] = None):
+        """Send every worker its shard (workers beyond the filter count get an empty one)"""
+        if configs is None:
+            configs = self._configs
+        chunks = self._chunks(configs)
+        self._active = len(chunks) if configs else 0
+        for number, (_, connection) in enumerate(self._shards):
+            offset, shard = chunks[number] if number < len(chunks) else (len(configs), [])
+            connection.send(('filters', offset, shard))
+        for _, connection in self._shards:
+            connection.recv()
+
+    def _ensure_workers(self):
+        alive = [(process, connection) for process, connection in self._shards if process.is_alive()]
+        if len(alive) == self.workers and len(alive) == len(self._shards):
+            return False
+        for process, connection in self._shards:
+            if not process.is_alive():
+                connection.close()
+                self.restarts += 1
+        self._shards = alive + [self._start_shard() for _ in range(self.workers - len(alive))]
+        return True
+
+    def update(self, query_params: Dict[str, Any]) -> 'ShardedFilterEngine':
+        """Replace the filters in every worker.
+
+        The params are compiled here first, so an invalid file raises before
+        any worker is touched. The new filters only become the engine's
+        filters once every worker holds its shard; if that fails the workers
+        are put back on the previous filters and the error is raised, so
+        FilterReloader keeps reporting the filters that actually run.
+        Returns the engine to work as FilterReloader's build.
+        """
+        configs = [plan.config for plan in compile_filters(query_params)]
+        with self._lock:
+            try:
+                self._ensure_workers()
+                try:
+                    self._distribute(configs)
+                except (EOFError, OSError):
+                    # A worker died while compiling its shard: start over with a fresh pool
+                    self._restart_shards(configs)
+            except (EOFError, OSError):
+                try:
+                    self._restart_shards()
+                except (EOFError, OSError):
+                    # Still failing: the next batch starts the pool over with the previous filters
+                    self._stop_shards()
+                raise
+            self._configs = configs
+        return self
+
+    def filter_batch(self, sales: Sequence[Any]) -> List[Tuple[Any, Dict[str, Any]]]:
+        """(sale, matching filter) pairs in sale order, like filter_engine.filter_batch"""
+        if not sales or not self._configs:
+            return []
+
+        with self._lock:
+            if self._ensure_workers():
+                self._distribute()
+            try:
+                results = self._evaluate(sales)
+            except (EOFError, OSError):
+                # A worker died mid-batch. The others may still have answers
+                # queued, so start over with a fresh pool and retry once
+                self._restart_shards()
+                results = self._evaluate(sales)
+            self.batches += 1
+            configs = self._configs
+
+        first: Dict[int, int] = {}
+        for matches in results:
+            for position, filter_position in matches:
+                if position not in first or filter_position < first[position]:
+                    first[position] = filter_position
+        return [(sales[position], configs[first[position]]) for position in sorted(first)]
+
+    def _evaluate(self, sales):
+        shards = self._shards[:self._active]
+        # Pickled once for all workers; recv() on the other end unpickles it like a send()
+        batch = pickle.dumps(('batch', list(sales)), protocol=pickle.HIGHEST_PROTOCOL)
+        for _, connection in shards:
+            connection.send_bytes(batch)
+        return [connection.recv() for _, connection in shards]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'workers': self.workers,
+            'alive': sum(process.is_alive() for process, _ in self._shards),
+            'filters': len(self._configs),
+            'batches': self.batches,
+            'restarts': self.restarts,
+        }
+
+    def _restart_shards(self, configs: Optional[List[Dict[str, Any]]] = None):
+        self.restarts += 1
+        self._stop_shards()
+        self._ensure_workers()
+        self._distribute(configs)
+
+    def _stop_shards(self):
+        for process, connection in self._shards:
+            try:
+                connection.send(None)
+            except OSError:
+                pass
+        for process, connection in self._shards:
+            process.join(timeout=2)
+            if process.is_alive():
+                process.terminate()
+            connection.close()
+        self._shards = []
+
+    def close(self):
+        with self._lock:
+            self._stop_shards()
@@ -0,0 +1,279 @@
+import asyncio
+import os
+from abc import ABC, abstractmethod
+import signal
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import aiohttp
+
+
+class FeedLiveness:
+    """Timestamps the ingestion path updates so the supervisor can spot stalls"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        now = time.monotonic()
+        self.last_ok = now
+        self.last_event = now
+
+    def mark_ok(self):
+        self.last_ok = time.monotonic()
+
+    def mark_events(self, count: int):
+        if count:
+            self.last_event = time.monotonic()
+
+    def stalled(self, ok_timeout: float, event_timeout: float) -> Optional[str]:
+        """Reason string if the feed looks dead, None otherwise"""
+        now = time.monotonic()
+        if now - self.last_ok > ok_timeout:
+            return f"no successful feed response for {now - self.last_ok:.0f}s"
+        if now - self.last_event > event_timeout:
+            return f"no new sales for {now - self.last_event:.0f}s"
+        return None
+
+
+class Worker(ABC):
+    """Something the Supervisor keeps alive.
+
+    health() returns None while the worker is fine or a short reason when it
+    should be restarted. replacement() returns a fresh worker for an overlap
+    handover (started and ready before this one stops), or None to restart
+    this worker in place.
+    """
+
+    name = 'worker'
+
+    @abstractmethod
+    async def start(self):
+        ...
+
+    @abstractmethod
+    async def stop(self):
+        ...
+
+    def health(self) -> Optional[str]:
+        return None
+
+    async def ready(self, timeout: float) -> bool:
+        return True
+
+    def replacement(self) -> Optional['Worker']:
+        return None
+
+
+class TaskWorker(Worker):
+    """Runs a coroutine as a task; dies or stalls -> restart"""
+
+    def __init__(self, name: str, factory: Callable[[], Awaitable[Any]],
+                 liveness: Optional[Callable[[], Optional[str]]] = None):
+        self.name = name
+        self.factory = factory
+        self.liveness = liveness
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        self._task = asyncio.create_task(self.factory(), name=self.name)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def health(self) -> Optional[str]:
+        if self._task is None or self._task.done():
+            return "task exited"
+        return self.liveness() if self.liveness else None
+
+
+class ServiceWorker(Worker):
+    """Adapter for objects with start() / async stop() / health(), e.g. NotificationQueue"""
+
+    def __init__(self, name: str, service):
+        self.name = name
+        self.service = service
+
+    async def start(self):
+        self.service.start()
+
+    async def stop(self):
+        await self.service.stop()
+
+    def health(self) -> Optional[str]:
+        return self.service.health()
+
+
+class RelayWorker(Worker):
+    """The Node relay (api_client.js) as a child process.
+
+    Replacements alternate between `ports`, so the new relay can connect to
+    Skinport and answer HTTP before the old one is terminated. `on_switch`
+    is called with the new feed URL once the handover happened.
+    """
+
+    def __init__(self, script_path: str, ports: List[int], liveness: FeedLiveness,
+                 ok_timeout: float = 30.0, event_timeout: float = 300.0,
+                 on_switch: Optional[Callable[[str], None]] = None, port_index: int = 0):
+        self.name = 'relay'
+        self.script_path = script_path
+        self.ports = ports
+        self.port_index = port_index
+        self.liveness = liveness
+        self.ok_timeout = ok_timeout
+        self.event_timeout = event_timeout
+        self.on_switch = on_switch
+        self.process: Optional[asyncio.subprocess.Process] = None
+
+    @property
+    def port(self) -> int:
+        return self.ports[self.port_index % len(self.ports)]
+
+    @property
+    def url(self) -> str:
+        return f"http://localhost:{self.port}/skinport-live"
+
+    async def start(self):
+        env = dict(os.environ, PORT=str(self.port))
+        self.process = await asyncio.create_subprocess_exec('node', self.script_path, env=env)
+
+    async def ready(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=2)) as session:
+            while time.monotonic() < deadline:
+                if self.process is None or self.process.returncode is not None:
+                    return False
+                try:
+                    async with session.get(self.url) as response:
+                        if response.status == 200:
+                            self.liveness.reset()
+                            if self.on_switch:
+                                self.on_switch(self.url)
+                            return True
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    pass
+                await asyncio.sleep(0.5)
+        return False
+
+    async def stop(self):
+        if self.process is None or self.process.returncode is not None:
+            return
+        self.process.send_signal(signal.SIGTERM)
+        try:
+            await asyncio.wait_for(self.process.wait(), 5)
+        except asyncio.TimeoutError:
+            self.process.kill()
+            await self.process.wait()
+
+    def health(self) -> Optional[str]:
+        if self.process is None or self.process.returncode is not None:
+            return "relay process exited"
+        return self.liveness.stalled(self.ok_timeout, self.event_timeout)
+
+    def replacement(self) -> 'RelayWorker':
+        return RelayWorker(self.script_path, self.ports, self.liveness, self.ok_timeout,
+                           self.event_timeout, self.on_switch, self.port_index + 1)
+
+
+class Supervisor:
+    """Keeps workers healthy: checks them every `check_interval` seconds and
+    restarts unhealthy ones with exponential backoff.
+
+    Restarts use an overlap handover when the worker offers a replacement:
+    the new worker is started and has to report ready before the old one is
+    stopped, so ingestion never has a gap. Restart counts and reasons are
+    kept per worker for the heartbeat / metrics.
+    """
+
+    def __init__(self, check_interval: float = 5.0, ready_timeout: float = 30.0,
+                 base_backoff: float = 1.0, max_backoff: float = 60.0):
+        self.check_interval = check_interval
+        self.ready_timeout = ready_timeout
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.workers: Dict[str, Worker] = {}
+        self.metrics: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, worker: Worker):
+        self.workers[worker.name] = worker
+        self.metrics[worker.name] = {
+            'restarts': 0, 'failed_restarts': 0, 'consecutive_failures': 0,
+            'last_restart': None, 'last_reason': None, 'next_attempt': 0.0,
+        }
+
+    async def run(self):
+        for worker in list(self.workers.values()):
+            try:
+                await worker.start()
+                await worker.ready(self.ready_timeout)
+            except Exception as e:
+                # health() reports it and the regular restart path takes over
+                print(f"Error while starting {worker.name}:", e)
+        try:
+            while True:
+                await asyncio.sleep(self.check_interval)
+                await self.check()
+        finally:
+            await self.stop()
+
+    async def check(self):
+        for name, worker in list(self.workers.items()):
+            reason = worker.health()
+            metrics = self.metrics[name]
+            if reason is None:
+                metrics['consecutive_failures'] = 0
+                continue
+            if time.monotonic() < metrics['next_attempt']:
+                continue
+            await self.restart(name, reason)
+
+    async def restart(self, name: str, reason: str):
+        old = self.workers[name]
+        metrics = self.metrics[name]
+        print(f"Restarting {name}: {reason}")
+
+        new = old.replacement()
+        try:
+            if new is None:
+                await old.stop()
+                await old.start()
+                ok = await old.ready(self.ready_timeout)
+            else:
+                await new.start()
+                ok = await new.ready(self.ready_timeout)
+                if ok:
+                    self.workers[name] = new
+                    await old.stop()
+                else:
+                    await new.stop()
+        except Exception as e:
+            print(f"Error while restarting {name}:", e)
+            ok = False
+
+        metrics['last_restart'] = time.time()
+        metrics['last_reason'] = reason
+        if ok:
+            metrics['restarts'] += 1
+        else:
+            metrics['failed_restarts'] += 1
+
+        # Back off while the worker keeps failing; reset once a check passes
+        metrics['consecutive_failures'] += 1
+        delay = min(self.max_backoff, self.base_backoff * 2 ** (metrics['consecutive_failures'] - 1))
+        metrics['next_attempt'] = time.monotonic() + delay
+
+    async def stop(self):
+        for worker in list(self.workers.values()):
+            try:
+                await worker.stop()
+            except Exception as e:
+                print(f"Error while stopping {worker.name}:", e)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {key: value for key, value in metrics.items() if key != 'next_attempt'}
+            for name, metrics in self.metrics.items()
+        }
@@ -1,8 +1,18 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from app.routers import index
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app):
+    await index.start_standby_monitor()
+    yield
+    await index.stop_standby_monitor()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.mount("/static", StaticFiles(directory="static"), name="static")
-app.include_router(index.router)
\ No newline at end of file
+app.include_router(index.router)
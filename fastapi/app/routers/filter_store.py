@@ -0,0 +1,131 @@
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional
+
+FIELDS = ['fname', 'name', 'min_price', 'max_price', 'patterns', 'min_wear', 'max_wear', 'exterior', 'created_at',
+          'min_relative_price', 'max_relative_price', 'relative_to']
+
+
+class FilterStore:
+    """Saved filters in SQLite (WAL mode), keyed by ID.
+
+    Reads are served from an in-process cache. The cache is dropped after
+    every write through this store and whenever SQLite's data_version shows
+    that another connection committed, so several dashboard processes stay
+    consistent. `version` increases on every change and can key other caches.
+    """
+
+    def __init__(self, db_path: str, json_path: Optional[str] = None):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS filters ('
+            ' id INTEGER PRIMARY KEY AUTOINCREMENT,'
+            + ','.join(f' {field} TEXT' for field in FIELDS) +
+            ')'
+        )
+        # Databases created before a field existed get its column added
+        columns = {row['name'] for row in self._conn.execute('PRAGMA table_info(filters)')}
+        for field in FIELDS:
+            if field not in columns:
+                self._conn.execute(f'ALTER TABLE filters ADD COLUMN {field} TEXT')
+        self._cache: Optional[List[Dict[str, Any]]] = None
+        self._by_id: Dict[int, Dict[str, Any]] = {}
+        self._data_version = None
+        self.version = 0
+
+        if json_path:
+            self.import_json(json_path)
+
+    def import_json(self, json_path: str) -> int:
+        """Import a saved_filters.json file once, keeping its IDs. Returns the number of imported filters"""
+        marker = json_path + '.imported'
+        if not os.path.exists(json_path) or os.path.exists(marker):
+            return 0
+
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                filters = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return 0
+        if isinstance(filters, dict):
+            filters = [filters]
+
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                for filter_data in filters:
+                    values = [_text(filter_data.get(field)) for field in FIELDS]
+                    self._conn.execute(
+                        f'INSERT OR IGNORE INTO filters (id, {", ".join(FIELDS)}) VALUES (?{", ?" * len(FIELDS)})',
+                        [filter_data.get('id')] + values,
+                    )
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+            self._invalidate()
+
+        # Leave the original file in place but don't import it again
+        with open(marker, 'w') as f:
+            f.write(str(len(filters)))
+        return len(filters)
+
+    def _invalidate(self):
+        self._cache = None
+        self._by_id = {}
+        self.version += 1
+
+    def _ensure_cache(self):
+        data_version = self._conn.execute('PRAGMA data_version').fetchone()[0]
+        if self._cache is not None and data_version == self._data_version:
+            return
+        if self._cache is not None:
+            self.version += 1  # changed by another connection
+        rows = self._conn.execute(f'SELECT id, {", ".join(FIELDS)} FROM filters ORDER BY id').fetchall()
+        self._cache = [dict(row) for row in rows]
+        self._by_id = {row['id']: row for row in self._cache}
+        self._data_version = data_version
+
+    def all(self) -> List[Dict[str, Any]]:
+        """All saved filters ordered by ID (cached, don't mutate)"""
+        with self._lock:
+            self._ensure_cache()
+            return self._cache
+
+    def get(self, filter_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._ensure_cache()
+            return self._by_id.get(filter_id)
+
+    def add(self, filter_data: Dict[str, Any]) -> int:
+        """Insert a filter and return its new ID"""
+        with self._lock:
+            cursor = self._conn.execute(
+                f'INSERT INTO filters ({", ".join(FIELDS)}) VALUES ({", ".join("?" * len(FIELDS))})',
+                [_text(filter_data.get(field)) for field in FIELDS],
+            )
+            self._invalidate()
+            return cursor.lastrowid
+
+    def delete(self, filter_id: int) -> bool:
+        with self._lock:
+            cursor = self._conn.execute('DELETE FROM filters WHERE id = ?', (filter_id,))
+            if cursor.rowcount == 0:
+                return False
+            self._invalidate()
+            return True
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _text(value):
+    return None if value is None else str(value)
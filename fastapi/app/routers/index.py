@@ -1,18 +1,29 @@
 from fastapi import APIRouter, Request, Form, Depends, HTTPException
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse, Response
 from typing import Optional
 import os
 import json
 import subprocess
 import sys
 import signal
+import time
 from typing import List, Dict, Any
-import psutil
 from datetime import datetime
-import time 
-import threading
+import asyncio
+import urllib.request
+from dotenv import load_dotenv
 from .models import FilterForm, SaveFilterForm, FilterFormData, SaveFilterFormData, EXTERIOR_CHOICES
+from .log_stream import LogBroadcaster
+from .process_status import ProcessStatus
+from .filter_store import FilterStore
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'core')))
+from listing_logger import read_latest, log_file_path
+from heartbeat import read_heartbeat
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from monitor_control import send_command, DEFAULT_CONTROL_PORT
+from sale_history import HistoryReader, history_dir
 
 router = APIRouter()
 
@@ -24,34 +35,141 @@ templates = Jinja2Templates(directory=templates_dir)
 # PID file path (adjust according to your project structure)
 PID_FILE = os.path.join(BASE_DIR, 'script_pids.json')
 FILTERS_FILE = os.path.join(BASE_DIR, 'saved_filters.json')
+FILTERS_DB = os.path.join(BASE_DIR, 'saved_filters.db')
+
+# Same .env the bot and data_parser.py use
+load_dotenv(os.path.join(BASE_DIR, '..', '..', 'bot', '.env'))
+
+# Number of listing log lines shown on the dashboard
+LOG_OUTPUT_LINES = int(os.getenv('LOG_OUTPUT_LINES', '50'))
+
+# Metrics endpoint of the running monitor (data_parser.py), re-exported under /metrics
+METRICS_URL = f"http://{os.getenv('METRICS_HOST', '127.0.0.1')}:{os.getenv('METRICS_PORT', '9108')}/metrics"
+
+# Keep the monitor running disarmed after stop, so the next start is just an arm command
+MONITOR_STANDBY = os.getenv('MONITOR_STANDBY', '1').lower() in ('1', 'true', 'yes')
+CONTROL_PORT = int(os.getenv('CONTROL_PORT', str(DEFAULT_CONTROL_PORT)))
+# Sale history written by the monitor, served by /history
+HISTORY_DIR = os.getenv('HISTORY_DIR', history_dir)
+HISTORY_QUERY_LIMIT = 1000
+# Seconds /start-script waits for a monitor that is still starting up
+MONITOR_START_TIMEOUT = 30
+# Seconds an arm command may take; the monitor reloads (and redistributes) the filters first
+MONITOR_ARM_TIMEOUT = 60
+MONITOR_SCRIPT = os.path.join(BASE_DIR, '..', '..', 'core', 'data_parser.py')
+
+log_broadcaster = None
+# Disarmed monitor spawned with the dashboard, stopped again on shutdown
+standby_process = None
+
+script_status = ProcessStatus(PID_FILE, read_heartbeat)
+sale_history = HistoryReader(HISTORY_DIR) if HISTORY_DIR else None
 
-restart_thread = None
-should_restart = False
+# Existing saved_filters.json files are imported on first start
+filter_store = FilterStore(FILTERS_DB, json_path=FILTERS_FILE)
+
+def get_log_broadcaster():
+    """Shared tail of the listing log, created on first use"""
+    global log_broadcaster
+    if log_broadcaster is None:
+        log_broadcaster = LogBroadcaster(log_file_path, initial_lines=read_latest(LOG_OUTPUT_LINES)[::-1])
+        log_broadcaster.start()
+    return log_broadcaster
+
+# The forms never change between requests, build them once
+FILTER_FORM = FilterForm()
+SAVE_FILTER_FORM = SaveFilterForm()
+
+# Rendered index page per (filter store version, script running)
+_index_cache = {}
 
 @router.get("/", response_class=HTMLResponse)
 async def index(request: Request):
     """Main index page with forms and saved filters"""
-    # Create empty form instances
-    filter_form = FilterForm()
-    save_filter_form = SaveFilterForm()
-    
-    # Get saved filters from JSON file
+    # Get saved filters from the store (cached per store version)
     saved_filters = load_saved_filters()
+    script_running = is_script_running()
+
+    key = (filter_store.version, script_running)
+    html = _index_cache.get(key)
+    if html is None:
+        html = templates.get_template("index.html").render({
+            "request": request,
+            "filter_form": FILTER_FORM,
+            "save_filter_form": SAVE_FILTER_FORM,
+            "exterior_choices": EXTERIOR_CHOICES,
+            "saved_filters": saved_filters,
+            "script_running": script_running
+        })
+        # Pages rendered for older store versions are never served again
+        if any(cached_version != filter_store.version for cached_version, _ in _index_cache):
+            _index_cache.clear()
+        _index_cache[key] = html
+
+    return HTMLResponse(html)
+
+def build_query_params(filters):
+    """Turn the dashboard's active filters into the script_params.json structure"""
+    # Process each filter individually and build query_params
+    processed_filters = []
     
-    return templates.TemplateResponse("index.html", {
-        "request": request,
-        "filter_form": filter_form,
-        "save_filter_form": save_filter_form,
-        "exterior_choices": EXTERIOR_CHOICES,
-        "saved_filters": saved_filters,
-        "script_running": is_script_running()
-    })
+    for filter_item in filters:
+        filter_params = {}
+        
+        # Add name (required)
+        if filter_item.get('name'):
+            filter_params['name'] = filter_item.get('name')
+        else:
+            continue  # Skip filters without names
+        
+        # Add other parameters if they exist and are not empty
+        if filter_item.get('min_price') and filter_item.get('min_price').strip():
+            filter_params['minPrice'] = filter_item.get('min_price')
+        
+        if filter_item.get('max_price') and filter_item.get('max_price').strip():
+            filter_params['maxPrice'] = filter_item.get('max_price')
+        
+        if filter_item.get('patterns') and filter_item.get('patterns').strip():
+            filter_params['patterns'] = filter_item.get('patterns')
+        
+        if filter_item.get('min_wear') and filter_item.get('min_wear').strip():
+            filter_params['minWear'] = filter_item.get('min_wear')
+        
+        if filter_item.get('max_wear') and filter_item.get('max_wear').strip():
+            filter_params['maxWear'] = filter_item.get('max_wear')
+        
+        if filter_item.get('exterior') and filter_item.get('exterior').strip():
+            filter_params['exterior'] = filter_item.get('exterior')
+        
+        if filter_item.get('min_relative_price') and filter_item.get('min_relative_price').strip():
+            filter_params['minRelativePrice'] = filter_item.get('min_relative_price')
+        
+        if filter_item.get('max_relative_price') and filter_item.get('max_relative_price').strip():
+            filter_params['maxRelativePrice'] = filter_item.get('max_relative_price')
+        
+        if filter_item.get('relative_to') and filter_item.get('relative_to').strip():
+            filter_params['relativeTo'] = filter_item.get('relative_to')
+        
+        processed_filters.append(filter_params)
+    
+    # Structure the data for the script
+    query_params = {
+        'filters': processed_filters
+    }
+    
+    return query_params
+
+def write_script_params(query_params):
+    """Write script_params.json atomically so a running monitor never reads half a file"""
+    params_file = os.path.join(BASE_DIR, 'script_params.json')
+    tmp_file = params_file + '.tmp'
+    with open(tmp_file, 'w') as f:
+        json.dump(query_params, f)
+    os.replace(tmp_file, params_file)
 
 @router.post("/start-script")
 async def start_script(request: Request):
-    """Start the Node.js and Python scripts"""
-    global restart_thread, should_restart
-
+    """Start the monitor script"""
     try:
         # Get JSON data from request body
         data = await request.json()
@@ -62,117 +180,49 @@ async def start_script(request: Request):
         if not filters:
             return JSONResponse({'status': 'error', 'message': 'No filters provided'})
         
-        # Process each filter individually and build query_params
-        processed_filters = []
-        
-        for filter_item in filters:
-            filter_params = {}
-            
-            # Add name (required)
-            if filter_item.get('name'):
-                filter_params['name'] = filter_item.get('name')
-            else:
-                continue  # Skip filters without names
-            
-            # Add other parameters if they exist and are not empty
-            if filter_item.get('min_price') and filter_item.get('min_price').strip():
-                filter_params['minPrice'] = filter_item.get('min_price')
-            
-            if filter_item.get('max_price') and filter_item.get('max_price').strip():
-                filter_params['maxPrice'] = filter_item.get('max_price')
-            
-            if filter_item.get('patterns') and filter_item.get('patterns').strip():
-                filter_params['patterns'] = filter_item.get('patterns')
-            
-            if filter_item.get('min_wear') and filter_item.get('min_wear').strip():
-                filter_params['minWear'] = filter_item.get('min_wear')
-            
-            if filter_item.get('max_wear') and filter_item.get('max_wear').strip():
-                filter_params['maxWear'] = filter_item.get('max_wear')
-            
-            if filter_item.get('exterior') and filter_item.get('exterior').strip():
-                filter_params['exterior'] = filter_item.get('exterior')
-            
-            processed_filters.append(filter_params)
-        
-        # Structure the data for the script
-        query_params = {
-            'filters': processed_filters
-        }
-        
-        # Write query_params to a file that the script can read
-        with open(os.path.join(BASE_DIR, 'script_params.json'), 'w') as f:
-            json.dump(query_params, f)
-        
-        # Start data_parser.py with path to JSON file as argument
-        python_executable = sys.executable
-        python_path = os.path.join(BASE_DIR, '..', '..', 'core', 'data_parser.py')
-        py_proc = subprocess.Popen([python_executable, python_path], stdout=None, stderr=None)
-
-        # Start api_client.js without parameters
-        node_path = os.path.join(BASE_DIR, '..', '..', 'core', 'api_client.js')
-        node_proc = subprocess.Popen(['node', node_path], stdout=None, stderr=None)
-
-        # Save PIDs to file
-        with open(PID_FILE, 'w') as f:
-            json.dump({'node_pid': node_proc.pid, 'python_pid': py_proc.pid}, f)
-        
-        # Set restart flag and start the restart thread
-        should_restart = True
-        restart_thread = threading.Thread(target=auto_restart_node_script, args=(node_path,))
-        restart_thread.daemon = True
-        restart_thread.start()
+        requested_at = time.time()
+        write_script_params(build_query_params(filters))
+
+        # A warm standby monitor only has to reload the filters
+        reply = await arm_monitor(requested_at)
+        if reply is not None:
+            if not reply.get('ok'):
+                return JSONResponse({'status': 'error', 'message': f"Monitor not armed: {reply.get('error')}"})
+            script_status.refresh()
+            return JSONResponse({'status': 'success', 'message': 'Script armed'})
 
+        spawn_monitor('--requested-at', str(requested_at))
         return JSONResponse({'status': 'success', 'message': 'Script started successfully'})
     except Exception as e:
         return JSONResponse({'status': 'error', 'message': str(e)})
 
-def auto_restart_node_script(node_path):
-    """Background thread function to restart Node.js script every 30 minutes"""
-    global should_restart
-    
-    while should_restart:
-        # Wait for 30 minutes (1800 seconds)
-        time.sleep(1800)
+@router.post("/update-filters")
+async def update_filters(request: Request):
+    """Swap the filters of the running monitor without restarting it"""
+    try:
+        data = await request.json()
+        filters = data.get('filters', [])
         
-        if not should_restart:
-            break
-            
-        try:
-            # Read current PIDs
-            if os.path.exists(PID_FILE):
-                with open(PID_FILE, 'r') as f:
-                    pids = json.load(f)
-                
-                # Kill the current Node.js process
-                node_pid = pids.get('node_pid')
-                if node_pid:
-                    try:
-                        os.kill(node_pid, signal.SIGTERM)
-                        # Wait a bit for the process to terminate
-                        time.sleep(2)
-                    except ProcessLookupError:
-                        pass  # Process already dead
-                
-                # Start a new Node.js process
-                node_proc = subprocess.Popen(['node', node_path], stdout=None, stderr=None)
-                
-                # Update the PID file with the new Node.js PID
-                pids['node_pid'] = node_proc.pid
-                with open(PID_FILE, 'w') as f:
-                    json.dump(pids, f)
-                    
-        except Exception as e:
-            print(f"Error during Node.js restart: {e}")
+        if not filters:
+            return JSONResponse({'status': 'error', 'message': 'No filters provided'})
+        
+        # The monitor watches script_params.json and recompiles on change
+        write_script_params(build_query_params(filters))
+        
+        return JSONResponse({'status': 'success', 'message': 'Filters updated'})
+    except Exception as e:
+        return JSONResponse({'status': 'error', 'message': str(e)})
 
 @router.post("/stop-script")
 async def stop_script():
     """Stop the running scripts"""
-    global should_restart
-
     try:
-        should_restart = False
-        
+        # With a standby monitor stopping only disarms it, the process stays warm
+        reply = await control_monitor({'cmd': 'disarm'})
+        if reply is not None and reply.get('ok'):
+            script_status.refresh()
+            return JSONResponse({'status': 'success', 'message': 'Stopped: monitor disarmed (standby)'})
+
         if not os.path.exists(PID_FILE):
             return JSONResponse({'status': 'error', 'message': 'No PID file found'})
         
@@ -190,114 +240,145 @@ async def stop_script():
                     continue
 
         os.remove(PID_FILE)
+        script_status.forget()
         return JSONResponse({'status': 'success', 'message': f'Stopped: {", ".join(stopped)}'})
     except Exception as e:
         return JSONResponse({'status': 'error', 'message': str(e)})
 
 @router.get("/get-script-output")
-async def get_script_output():
-    """Get the output from the script logs"""
-    file_path = os.path.join(BASE_DIR, '..', '..', 'logs', 'listings.txt')
-    if os.path.exists(file_path):
-        with open(file_path, 'r', encoding='utf-8') as file:
-            content = file.read()
-            if not content:
-                content = 'Waiting for logs...'
+async def get_script_output(cursor: Optional[int] = None):
+    """Get the newest lines of the listing log.
+
+    With `cursor` only the lines added after it are returned (oldest first),
+    together with the cursor to send next time.
+    """
+    if cursor is not None:
+        broadcaster = get_log_broadcaster()
+        next_cursor, lines = broadcaster.since(cursor)
+        return JSONResponse({'cursor': next_cursor, 'lines': lines})
+
+    if os.path.exists(log_file_path):
+        lines = read_latest(LOG_OUTPUT_LINES)
+        content = '\n'.join(lines) if lines else 'Waiting for logs...'
     else:
         content = "No listings found"
     return JSONResponse({'output': content})
 
-def is_script_running():
-    """Check if the target scripts are running"""
-    target_scripts = ['api_client.js', 'data_parser.py']
-    for proc in psutil.process_iter(['cmdline']):
-        try:
-            cmdline = proc.info['cmdline']
-            if not cmdline:
-                continue
-            for target in target_scripts:
-                if any(target in part for part in cmdline):
-                    return True
-        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-            pass
-    return False
-
-def generate_filter_id():
-    """Generate a unique ID for a filter"""
-    saved_filters = load_saved_filters()
-    if not saved_filters:
-        return 1
-    
-    max_id = max([f.get('id', 0) for f in saved_filters])
-    return max_id + 1
+@router.get("/stream-script-output")
+async def stream_script_output(request: Request):
+    """Push new listing log lines to the dashboard as Server-Sent Events"""
+    broadcaster = get_log_broadcaster()
+    last_event_id = request.headers.get('last-event-id')
+    cursor = int(last_event_id) if last_event_id and last_event_id.isdigit() else 0
 
-def load_saved_filters():
-    """Load saved filters from JSON file and parse datetime strings"""
-    if not os.path.exists(FILTERS_FILE):
-        return []
-    
+    return StreamingResponse(broadcaster.stream(cursor), media_type="text/event-stream",
+                             headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def spawn_monitor(*args, standby=False):
+    """Start data_parser.py and remember its PID.
+
+    data_parser.py starts and supervises the Node relay itself (or streams the feed directly).
+    """
+    py_proc = subprocess.Popen([sys.executable, MONITOR_SCRIPT, *args], stdout=None, stderr=None)
+    with open(PID_FILE, 'w') as f:
+        json.dump({'python_pid': py_proc.pid}, f)
+    script_status.track('python_pid', py_proc, standby=standby)
+    return py_proc
+
+async def control_monitor(command):
+    """Send a command to the monitor's control channel, None if no standby monitor answers"""
+    if not (MONITOR_STANDBY and CONTROL_PORT):
+        return None
     try:
-        with open(FILTERS_FILE, 'r') as f:
-            filters = json.load(f)
-            
-            # Parse datetime strings back to datetime objects for template rendering
-            for filter_data in filters:
-                if 'created_at' in filter_data:
-                    if isinstance(filter_data['created_at'], str):
-                        try:
-                            filter_data['created_at'] = datetime.fromisoformat(filter_data['created_at'])
-                        except ValueError:
-                            # If parsing fails, use current datetime
-                            filter_data['created_at'] = datetime.now()
-                    # If created_at is missing or None, set to current datetime
-                    elif filter_data['created_at'] is None:
-                        filter_data['created_at'] = datetime.now()
-                else:
-                    # Add created_at if it doesn't exist
-                    filter_data['created_at'] = datetime.now()
-            
-            return filters
-    except (json.JSONDecodeError, FileNotFoundError):
-        return []
-
-def save_filter_to_file(filter_data):
-    """Save a filter to the JSON file"""
-    if not os.path.exists(FILTERS_FILE):
-        saved_filters = []
-    else:
+        return await send_command(command, CONTROL_PORT)
+    except (OSError, asyncio.TimeoutError, ValueError):
+        return None
+
+async def arm_monitor(requested_at):
+    """Arm the standby monitor, None if there is none.
+
+    A monitor process that is alive but doesn't answer yet is still
+    importing and logging in; wait for its control channel instead of
+    starting a second one. The reply reports whether the filters could be
+    reloaded (the monitor stays disarmed if not).
+    """
+    if not (MONITOR_STANDBY and CONTROL_PORT):
+        return None
+    command = {'cmd': 'arm', 'requested_at': requested_at}
+    deadline = time.monotonic() + MONITOR_START_TIMEOUT
+    while True:
         try:
-            with open(FILTERS_FILE, 'r') as f:
-                saved_filters = json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            saved_filters = []
-    
-    saved_filters.append(filter_data)
-    
-    with open(FILTERS_FILE, 'w') as f:
-        json.dump(saved_filters, f, indent=2)
+            return await send_command(command, CONTROL_PORT, timeout=MONITOR_ARM_TIMEOUT)
+        except asyncio.TimeoutError:
+            # Connected, but the reload is still running: sending arm again would only queue another one
+            raise TimeoutError('Monitor did not confirm arming in time, check the script status')
+        except (OSError, ValueError):
+            if not monitor_alive():
+                return None
+        if time.monotonic() > deadline:
+            raise TimeoutError('Monitor is still starting, try again in a moment')
+        await asyncio.sleep(0.25)
 
-def delete_filter_from_file(filter_id):
-    """Delete a saved filter from JSON file"""
-    if not os.path.exists(FILTERS_FILE):
-        return False
-    
+def monitor_alive():
+    return any(name.startswith('python') for name in script_status.get()['processes'])
+
+async def start_standby_monitor():
+    """Pre-start a disarmed monitor with the dashboard, so even the first start is warm"""
+    if not (MONITOR_STANDBY and CONTROL_PORT):
+        return
+    global standby_process
+    if script_status.get()['processes'] or await control_monitor({'cmd': 'status'}) is not None:
+        return
+    standby_process = spawn_monitor('--standby', standby=True)
+
+async def stop_standby_monitor():
+    """Stop the monitor start_standby_monitor() spawned, unless it has been armed since"""
+    global standby_process
+    proc, standby_process = standby_process, None
+    if proc is None or proc.poll() is not None:
+        return
+    reply = await control_monitor({'cmd': 'status'})
+    if reply is not None and reply.get('armed'):
+        # Started from the dashboard: keeps running like any other started monitor
+        return
+
+    proc.terminate()
     try:
-        with open(FILTERS_FILE, 'r') as f:
-            saved_filters = json.load(f)
-    except (json.JSONDecodeError, FileNotFoundError):
-        return False
-    
-    # Remove the filter
-    updated_filters = [f for f in saved_filters if f['id'] != filter_id]
-    
-    if len(updated_filters) == len(saved_filters):
-        return False  # Filter not found
-    
-    # Save updated filters back to file
-    with open(FILTERS_FILE, 'w') as f:
-        json.dump(updated_filters, f, indent=2)
-    
-    return True
+        await asyncio.to_thread(proc.wait, 10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+    if os.path.exists(PID_FILE):
+        os.remove(PID_FILE)
+    script_status.forget()
+
+def is_script_running():
+    """Check if the target scripts are running (cached, see ProcessStatus)"""
+    return script_status.is_running()
+
+_saved_filters_cache = (None, [])
+
+def load_saved_filters():
+    """Load saved filters from the store and parse datetime strings (cached per store version)"""
+    global _saved_filters_cache
+
+    stored_filters = filter_store.all()
+    version, filters = _saved_filters_cache
+    if version == filter_store.version:
+        return filters
+
+    filters = []
+    for stored in stored_filters:
+        filter_data = dict(stored)
+        # Parse datetime strings back to datetime objects for template rendering
+        try:
+            filter_data['created_at'] = datetime.fromisoformat(filter_data['created_at'])
+        except (TypeError, ValueError):
+            # Missing or unparsable: use current datetime
+            filter_data['created_at'] = datetime.now()
+        filters.append(filter_data)
+
+    _saved_filters_cache = (filter_store.version, filters)
+    return filters
 
 @router.post("/save-filter")
 async def save_filter(request: Request):
@@ -315,7 +396,6 @@ async def save_filter(request: Request):
         
         # Create filter setting object - make sure we're getting the right keys
         filter_data = {
-            'id': generate_filter_id(),
             'fname': filter_name,
             'name': data.get('name', ''),
             'min_price': data.get('min_price', ''),
@@ -324,13 +404,16 @@ async def save_filter(request: Request):
             'min_wear': data.get('min_wear', ''),
             'max_wear': data.get('max_wear', ''),
             'exterior': data.get('exterior', ''),
+            'min_relative_price': data.get('min_relative_price', ''),
+            'max_relative_price': data.get('max_relative_price', ''),
+            'relative_to': data.get('relative_to', ''),
             'created_at': datetime.now().isoformat()
         }
         
         # Debug: Print filter data being saved
         print("Filter data being saved:", filter_data)
         
-        save_filter_to_file(filter_data)
+        filter_data['id'] = filter_store.add(filter_data)
         
         return JSONResponse({
             'status': 'success', 
@@ -346,14 +429,7 @@ async def save_filter(request: Request):
 async def load_filter(filter_id: int):
     """Load a saved filter by ID"""
     try:
-        saved_filters = load_saved_filters()
-        
-        # Find the filter with the matching ID
-        filter_data = None
-        for f in saved_filters:
-            if f.get('id') == filter_id:
-                filter_data = f
-                break
+        filter_data = filter_store.get(filter_id)
         
         if not filter_data:
             return JSONResponse({'status': 'error', 'message': 'Filter not found'})
@@ -379,6 +455,9 @@ async def load_filter(filter_id: int):
                 'min_wear': filter_data.get('min_wear', ''),
                 'max_wear': filter_data.get('max_wear', ''),
                 'exterior': filter_data.get('exterior', ''),
+                'min_relative_price': filter_data.get('min_relative_price') or '',
+                'max_relative_price': filter_data.get('max_relative_price') or '',
+                'relative_to': filter_data.get('relative_to') or '',
                 'created_at': created_at
             }
         })
@@ -389,7 +468,7 @@ async def load_filter(filter_id: int):
 async def delete_filter(filter_id: int):
     """Delete a saved filter by ID"""
     try:
-        success = delete_filter_from_file(filter_id)
+        success = filter_store.delete(filter_id)
         
         if success:
             return JSONResponse({
@@ -414,6 +493,9 @@ async def filter_items(
     min_wear: Optional[str] = Form(None),
     max_wear: Optional[str] = Form(None),
     exterior: Optional[str] = Form(None),
+    min_relative_price: Optional[str] = Form(None),
+    max_relative_price: Optional[str] = Form(None),
+    relative_to: Optional[str] = Form(None),
 ):
     """Process filter form submission"""
     # Create form data
@@ -425,11 +507,14 @@ async def filter_items(
         'min_wear': min_wear,
         'max_wear': max_wear,
         'exterior': exterior,
+        'min_relative_price': min_relative_price,
+        'max_relative_price': max_relative_price,
+        'relative_to': relative_to,
     }
     
     # Create form instance with data
     filter_form = FilterForm(form_data)
-    save_filter_form = SaveFilterForm()
+    save_filter_form = SAVE_FILTER_FORM
     
     # Validate form
     if filter_form.is_valid():
@@ -450,27 +535,10 @@ async def filter_items(
 @router.get("/get-filters", response_model=List[Dict[str, Any]])
 async def get_saved_filters():
     """
-    Read saved filters from a JSON file and return them
+    Return all saved filters from the filter store
     """
     try:
-        base_dir = os.path.dirname(__file__)  # Pfad zu index.py
-        json_file_path = os.path.join(base_dir, '..', 'saved_filters.json')  # Gehe ein Verzeichnis hoch
-
-        json_file_path = os.path.abspath(json_file_path)
-
-        if not os.path.exists(json_file_path):
-            return []
-        
-        with open(json_file_path, 'r', encoding='utf-8') as file:
-            filters_data = json.load(file)
-        
-        if isinstance(filters_data, list):
-            return filters_data
-        else:
-            return [filters_data]
-            
-    except json.JSONDecodeError:
-        raise HTTPException(status_code=500, detail="Invalid JSON file format")
+        return filter_store.all()
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error reading filters: {str(e)}")
 
@@ -478,9 +546,45 @@ async def get_saved_filters():
 async def get_script_status():
     """Get the current status of the script"""
     try:
-        if is_script_running():
-            return JSONResponse({'status': 'running'})
-        else:
-            return JSONResponse({'status': 'stopped'})
+        status = script_status.get()
+        return JSONResponse({
+            'status': 'running' if status['running'] else 'stopped',
+            'last_heartbeat': status.get('last_heartbeat'),
+            'heartbeat_age': status.get('heartbeat_age'),
+            'stale': status.get('stale'),
+            'loop_rate': status.get('loop_rate'),
+            'iterations': status.get('iterations'),
+            'standby': status.get('standby'),
+            'start_to_first_poll_ms': status.get('start_to_first_poll_ms'),
+        })
+    except Exception as e:
+        return JSONResponse({'status': 'error', 'message': str(e)})
+
+@router.get("/metrics")
+def get_metrics():
+    """Prometheus metrics of the monitor plus whether it could be scraped"""
+    try:
+        with urllib.request.urlopen(METRICS_URL, timeout=1) as response:
+            body, up = response.read().decode('utf-8'), 1
+    except OSError:
+        body, up = '', 0
+    body += ("# HELP skinport_monitor_up Whether the monitor's metrics endpoint answered\n"
+             "# TYPE skinport_monitor_up gauge\n"
+             f"skinport_monitor_up {up}\n")
+    return Response(content=body, media_type=METRICS_CONTENT_TYPE)
+
+@router.get("/history")
+def get_history(item: Optional[str] = None, since: Optional[float] = None, until: Optional[float] = None,
+                min_price: Optional[int] = None, max_price: Optional[int] = None,
+                min_wear: Optional[float] = None, max_wear: Optional[float] = None, limit: int = 100):
+    """Newest sales the monitor has seen, filtered by item name, time (unix seconds),
+    price (cents) and wear. Segments whose ranges can't match are not read."""
+    if sale_history is None:
+        return JSONResponse({'status': 'error', 'message': 'Sale history is disabled'})
+    try:
+        result = sale_history.query(item=item, since=since, until=until, min_price=min_price,
+                                    max_price=max_price, min_wear=min_wear, max_wear=max_wear,
+                                    limit=max(0, min(limit, HISTORY_QUERY_LIMIT)))
+        return JSONResponse({'status': 'success', **result})
     except Exception as e:
         return JSONResponse({'status': 'error', 'message': str(e)})
@@ -0,0 +1,162 @@
+import asyncio
+import os
+from collections import deque
+from typing import AsyncIterator, List, Optional, Set, Tuple
+
+
+class LogBroadcaster:
+    """Single in-memory tail of the listing log shared by every dashboard.
+
+    One background task follows the active log segment by byte offset and
+    keeps the newest lines in a ring buffer, each tagged with a sequence
+    number that clients use as cursor. New lines are pushed to every
+    subscribed queue, so the file is read once no matter how many
+    dashboards are open.
+    """
+
+    def __init__(self, filename: str, backlog: int = 200, interval: float = 0.5, initial_lines: Optional[List[str]] = None):
+        self.filename = filename
+        self.interval = interval
+        self.lines = deque(maxlen=backlog)
+        self.sequence = 0
+        self._offset = 0
+        self._inode = None
+        self._partial = b''
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._task: Optional[asyncio.Task] = None
+
+        # Seed with existing history (oldest first) and start following from the current end
+        for line in initial_lines or []:
+            self._append(line)
+        try:
+            stat = os.stat(filename)
+            self._offset, self._inode = stat.st_size, stat.st_ino
+        except FileNotFoundError:
+            pass
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._follow())
+
+    def since(self, cursor: int) -> Tuple[int, List[str]]:
+        """Lines after `cursor`, oldest first, and the new cursor"""
+        missing = self.sequence - cursor
+        if missing <= 0:
+            return self.sequence, []
+        return self.sequence, list(self.lines)[-missing:]
+
+    def subscribe(self) -> asyncio.Queue:
+        self.start()
+        subscriber = asyncio.Queue(maxsize=1000)
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: asyncio.Queue):
+        self._subscribers.discard(subscriber)
+
+    async def stream(self, cursor: int = 0, keepalive: float = 15) -> AsyncIterator[str]:
+        """Server-Sent Events for every line after `cursor`, buffered ones first.
+
+        Ends when the client falls too far behind; EventSource then reconnects
+        with Last-Event-ID and picks up the missed lines from the ring buffer.
+        """
+        subscriber = self.subscribe()
+        try:
+            sequence, lines = self.since(cursor)
+            for offset, line in enumerate(lines):
+                yield f"id: {sequence - len(lines) + offset + 1}\ndata: {line}\n\n"
+            while True:
+                try:
+                    item = await asyncio.wait_for(subscriber.get(), timeout=keepalive)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if item is None:
+                    return
+                line_sequence, line = item
+                if line_sequence > sequence:
+                    yield f"id: {line_sequence}\ndata: {line}\n\n"
+        finally:
+            self.unsubscribe(subscriber)
+
+    def _append(self, line: str):
+        self.sequence += 1
+        self.lines.append(line)
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.put_nowait((self.sequence, line))
+            except asyncio.QueueFull:
+                # Slow client: end its stream, it resyncs through its cursor on reconnect
+                self._subscribers.discard(subscriber)
+                while not subscriber.empty():
+                    subscriber.get_nowait()
+                subscriber.put_nowait(None)
+
+    async def _follow(self):
+        while True:
+            try:
+                self.poll()
+            except OSError as e:
+                print("Error while following listing log:", e)
+            await asyncio.sleep(self.interval)
+
+    def poll(self):
+        """Read whatever was appended since the last call"""
+        try:
+            stat = os.stat(self.filename)
+        except FileNotFoundError:
+            stat = None
+
+        if stat is None or stat.st_ino != self._inode:
+            # Rotated: finish the old segment before following the new one from its start
+            self._read_rotated()
+            if stat is None:
+                return
+            self._inode, self._offset, self._partial = stat.st_ino, 0, b''
+        elif stat.st_size < self._offset:
+            # Truncated in place
+            self._offset, self._partial = 0, b''
+        if stat.st_size == self._offset:
+            return
+        self._offset = self._read(self.filename, self._offset)
+
+    def _read_rotated(self):
+        """Read the rest of the segment being followed, now <file>.N, and every segment rotated after it.
+
+        Keeps following the newest rotated segment, at its end, so lines that
+        are written and rotated away before the next poll are not lost either.
+        """
+        if self._inode is None:
+            return
+        rotated = []
+        n = 1
+        while True:
+            path = f'{self.filename}.{n}'
+            try:
+                inode = os.stat(path).st_ino
+            except FileNotFoundError:
+                # Already dropped, the rest of it is lost
+                self._inode, self._offset, self._partial = None, 0, b''
+                return
+            rotated.append((path, inode))
+            if inode == self._inode:
+                break
+            n += 1
+
+        for path, inode in reversed(rotated):
+            if inode != self._inode:
+                self._inode, self._offset, self._partial = inode, 0, b''
+            self._offset = self._read(path, self._offset)
+
+    def _read(self, path: str, offset: int) -> int:
+        """Append the complete lines of `path` after `offset`, return the new offset"""
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            data = self._partial + f.read()
+            offset = f.tell()
+
+        *complete, self._partial = data.split(b'\n')
+        for raw in complete:
+            if raw:
+                self._append(raw.decode('utf-8', errors='replace'))
+        return offset
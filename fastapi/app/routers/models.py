@@ -10,6 +10,11 @@ class ExteriorChoice(str, Enum):
     WELL_WORN = "Well-Worn"
     BATTLE_SCARRED = "Battle-Scarred"
 
+RELATIVE_TO_CHOICES = [
+    ('', 'Median price'),
+    ('mean', 'Mean price'),
+]
+
 EXTERIOR_CHOICES = [
     ('', '--- Select Exterior ---'),
     ('Factory New', 'Factory New'),
@@ -27,6 +32,9 @@ class FilterFormData(BaseModel):
     min_wear: Optional[str] = None
     max_wear: Optional[str] = None
     exterior: Optional[str] = None
+    min_relative_price: Optional[str] = None
+    max_relative_price: Optional[str] = None
+    relative_to: Optional[str] = None
 
     @validator('min_price', 'max_price', pre=True)
     def validate_price(cls, v):
@@ -52,6 +60,18 @@ class FilterFormData(BaseModel):
                 raise ValueError("Wear must be a valid number between 0 and 1")
         return v
 
+    @validator('min_relative_price', 'max_relative_price', pre=True)
+    def validate_relative_price(cls, v):
+        if v and v.strip():
+            try:
+                ratio = float(v)
+                if ratio < 0:
+                    raise ValueError("Relative price must be positive")
+                return str(ratio)
+            except ValueError:
+                raise ValueError("Relative price must be a valid number")
+        return v
+
 class SaveFilterFormData(BaseModel):
     name: str
     names: Optional[str] = None
@@ -61,6 +81,9 @@ class SaveFilterFormData(BaseModel):
     min_wear: Optional[str] = None
     max_wear: Optional[str] = None
     exterior: Optional[str] = None
+    min_relative_price: Optional[str] = None
+    max_relative_price: Optional[str] = None
+    relative_to: Optional[str] = None
 
     @validator('name')
     def validate_name(cls, v):
@@ -175,6 +198,32 @@ class FilterForm:
                     'choices': EXTERIOR_CHOICES,
                 }
             ),
+            'min_relative_price': FormField(
+                'number',
+                required=False,
+                **{
+                    'class': 'form-control',
+                    'step': '0.01',
+                    'placeholder': 'e.g. 0.5',
+                }
+            ),
+            'max_relative_price': FormField(
+                'number',
+                required=False,
+                **{
+                    'class': 'form-control',
+                    'step': '0.01',
+                    'placeholder': 'e.g. 0.9',
+                }
+            ),
+            'relative_to': FormField(
+                'select',
+                required=False,
+                **{
+                    'class': 'form-select',
+                    'choices': RELATIVE_TO_CHOICES,
+                }
+            ),
         }
         
         # Set field values from data
@@ -216,6 +265,9 @@ class SaveFilterForm:
             'min_wear': FormField('hidden'),
             'max_wear': FormField('hidden'),
             'exterior': FormField('hidden'),
+            'min_relative_price': FormField('hidden'),
+            'max_relative_price': FormField('hidden'),
+            'relative_to': FormField('hidden'),
         }
         
         # Set field values from data
@@ -0,0 +1,114 @@
+import json
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import psutil
+
+
+class ProcessStatus:
+    """Cached status of the processes the dashboard spawned.
+
+    Only the known PIDs are checked (from the Popen handles, or the PID file
+    after a dashboard restart), together with the heartbeat written by the
+    monitor. A daemon thread refreshes the snapshot every `interval` seconds,
+    so requests just read it. A standby monitor that is alive but disarmed
+    does not count as running; until it has written its first heartbeat it
+    is taken to be in the state it was spawned in.
+    """
+
+    def __init__(self, pid_file: str, read_heartbeat, interval: float = 2.0, stale_after: float = 15.0):
+        self.pid_file = pid_file
+        self.read_heartbeat = read_heartbeat
+        self.interval = interval
+        self.stale_after = stale_after
+        self._processes = {}
+        self._standby: Dict[int, bool] = {}
+        self._snapshot: Dict[str, Any] = {'running': False}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def track(self, name: str, proc, standby: bool = False):
+        """Remember a spawned subprocess.Popen and refresh right away"""
+        with self._lock:
+            self._processes[name] = proc
+            self._standby[proc.pid] = standby
+        self.refresh()
+
+    def forget(self):
+        with self._lock:
+            self._processes.clear()
+            self._standby.clear()
+        self.refresh()
+
+    def start(self):
+        if self._thread is None:
+            self.refresh()
+            self._thread = threading.Thread(target=self._run, name='process-status', daemon=True)
+            self._thread.start()
+
+    def get(self) -> Dict[str, Any]:
+        self.start()
+        return self._snapshot
+
+    def is_running(self) -> bool:
+        return self.get()['running']
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                print("Error while refreshing script status:", e)
+            time.sleep(self.interval)
+
+    def _pids(self) -> Dict[str, int]:
+        with self._lock:
+            processes = dict(self._processes)
+        if processes:
+            # poll() also reaps exited children so they don't linger as zombies
+            return {name: proc.pid for name, proc in processes.items() if proc.poll() is None}
+
+        try:
+            with open(self.pid_file, 'r') as f:
+                pids = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+        return {name: pid for name, pid in pids.items() if pid and _pid_alive(pid)}
+
+    def refresh(self):
+        alive = self._pids()
+        heartbeat = self.read_heartbeat()
+
+        last_heartbeat = heartbeat.get('time') if heartbeat else None
+        heartbeat_age = time.time() - last_heartbeat if last_heartbeat else None
+        monitor_pids = [pid for name, pid in alive.items() if name.startswith('python')]
+        monitor_alive = bool(monitor_pids)
+        # A heartbeat left behind by an earlier monitor says nothing about the current one
+        current = heartbeat is not None and heartbeat.get('pid') in monitor_pids
+        details = (heartbeat.get('details') if current else None) or {}
+        control = details.get('control') or {}
+        if 'armed' in control:
+            armed = control['armed']
+        else:
+            armed = not any(self._standby.get(pid, False) for pid in monitor_pids)
+
+        self._snapshot = {
+            'running': bool(alive) and armed,
+            'standby': monitor_alive and not armed,
+            'processes': alive,
+            'last_heartbeat': last_heartbeat,
+            'heartbeat_age': round(heartbeat_age, 3) if heartbeat_age is not None else None,
+            'stale': monitor_alive and (heartbeat_age is None or heartbeat_age > self.stale_after),
+            'loop_rate': heartbeat.get('rate') if heartbeat else None,
+            'iterations': heartbeat.get('iterations') if heartbeat else None,
+            'start_to_first_poll_ms': control.get('start_to_first_poll_ms'),
+            'checked_at': time.time(),
+        }
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        return psutil.Process(pid).status() != psutil.STATUS_ZOMBIE
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return False
@@ -97,6 +97,14 @@ function validateFormData(formData) {
         return false;
     }
     
+    // Validate min/max relative price
+    if (formData.min_relative_price && formData.max_relative_price) {
+        if (parseFloat(formData.min_relative_price) > parseFloat(formData.max_relative_price)) {
+            showNotification('Min relative price cannot be greater than max relative price', 'warning');
+            return false;
+        }
+    }
+    
     return true;
 }
 
@@ -163,6 +171,11 @@ function formatFilterData(filter) {
         html += `<p><strong>Exterior:</strong> ${filter.exterior}</p>`;
     }
     
+    if (filter.min_relative_price || filter.max_relative_price) {
+        const reference = filter.relative_to === 'mean' ? 'mean' : 'median';
+        html += `<p><strong>Relative price:</strong> ${filter.min_relative_price || '0'} - ${filter.max_relative_price || 'No limit'} × ${reference}</p>`;
+    }
+    
     html += '</div>';
     return html;
 }
@@ -0,0 +1,24 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "core")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "benchmarks")))
+
+from bench_filter_engine import check, run
+from synthetic import make_filters, make_sales
+
+
+def test_synthetic_data_is_seeded():
+    assert make_sales(50, seed=3) == make_sales(50, seed=3)
+    assert make_filters(20, seed=3) == make_filters(20, seed=3)
+    assert make_sales(50, seed=3) != make_sales(50, seed=4)
+
+
+def test_small_run_and_check():
+    report = run([1, 10], sale_count=200, batch_size=50, seed=1)
+    assert set(report["results"]) == {"1", "10"}
+    assert set(report["results"]["10"]["ratios"]) == {"index_vs_linear", "batch_vs_item", "item_p99_vs_p50"}
+    assert check(report, {"10": {"batch_vs_item": {"min": 1e-6}, "item_p99_vs_p50": {"max": 1e6}}}) == []
+    failures = check(report, {"10": {"index_vs_linear": {"min": 1e12}, "item_p99_vs_p50": {"max": 0}},
+                              "100": {"batch_vs_item": {"min": 1e12}}})
+    assert len(failures) == 2
@@ -0,0 +1,98 @@
+import sys
+import os
+import asyncio
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "core")))
+
+from aiohttp import web
+
+from feed_client import FeedClient
+
+
+async def _serve(handler):
+    app = web.Application()
+    app.router.add_get("/skinport-live", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/skinport-live"
+
+
+def test_fetch_reuses_session_and_records_latency():
+    async def handler(request):
+        return web.json_response([{"eventType": "listed", "sale": {"saleId": 1}}])
+
+    async def run():
+        runner, url = await _serve(handler)
+        try:
+            async with FeedClient(url) as feed:
+                first = await feed.fetch()
+                session = feed._session
+                second = await feed.fetch()
+                assert feed._session is session
+                return first, second, feed.stats()
+        finally:
+            await runner.cleanup()
+
+    first, second, stats = asyncio.run(run())
+    assert first.ok and first.sales[0]["sale"]["saleId"] == 1
+    assert second.ok
+    assert stats['requests'] == 2 and stats['p50_ms'] is not None
+
+
+def test_error_status_has_no_sales():
+    async def handler(request):
+        return web.Response(status=503)
+
+    async def run():
+        runner, url = await _serve(handler)
+        try:
+            async with FeedClient(url) as feed:
+                return await feed.fetch()
+        finally:
+            await runner.cleanup()
+
+    response = asyncio.run(run())
+    assert not response.ok
+    assert response.sales is None
+
+
+def test_ok_status_without_body_has_empty_sales():
+    async def handler(request):
+        return web.Response(status=204)
+
+    async def run():
+        runner, url = await _serve(handler)
+        try:
+            async with FeedClient(url) as feed:
+                return await feed.fetch()
+        finally:
+            await runner.cleanup()
+
+    response = asyncio.run(run())
+    assert response.ok
+    assert response.sales == []
+
+
+def test_conditional_request_and_cursor():
+    seen = []
+
+    async def handler(request):
+        seen.append((request.headers.get("If-None-Match"), request.query.get("since")))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.json_response([{"sale": {"saleId": 7}}, {"sale": {"saleId": 9}}], headers={"ETag": '"v1"'})
+
+    async def run():
+        runner, url = await _serve(handler)
+        try:
+            async with FeedClient(url, use_cursor=True) as feed:
+                return await feed.fetch(), await feed.fetch()
+        finally:
+            await runner.cleanup()
+
+    first, second = asyncio.run(run())
+    assert first.ok and second.not_modified
+    assert seen == [(None, None), ('"v1"', "9")]
@@ -0,0 +1,80 @@
+import sys
+import os
+import asyncio
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "core")))
+
+from aiohttp import web
+
+from feed_stream import FeedStream, WebSocketTransport, normalize_payload
+
+
+def _payload(*sale_ids, category="Knife"):
+    return {
+        "eventType": "listed",
+        "sales": [{"saleId": sale_id, "marketName": "Karambit", "category": category} for sale_id in sale_ids],
+    }
+
+
+def test_normalize_payload_applies_prefilter():
+    events = normalize_payload({"eventType": "listed", "sales": [
+        {"saleId": 1, "category": "Knife"},
+        {"saleId": 2, "category": "Sticker"},
+    ]})
+    assert [e["sale"]["saleId"] for e in events] == [1]
+    assert normalize_payload({"eventType": "sold", "sales": [{"saleId": 3}]}) == []
+
+
+def test_stream_reconnects_and_skips_replayed_sales():
+    connections = []
+
+    async def handler(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        join = await ws.receive_json()
+        connections.append(join)
+        if len(connections) == 1:
+            await ws.send_json(_payload(1, 2))
+            await ws.close()  # drop the connection mid-feed
+        else:
+            # the stand-in server replays sale 2 after the reconnect
+            await ws.send_json(_payload(2, 3))
+            await ws.receive()
+        return ws
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/feed", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        received = []
+        recorded = []
+        done = asyncio.Event()
+
+        async def on_sales(sales):
+            received.extend(s["sale"]["saleId"] for s in sales)
+            if 3 in received:
+                done.set()
+
+        stream = FeedStream(WebSocketTransport(f"http://127.0.0.1:{port}/feed"), on_sales, reconnect_delay=0.01,
+                            on_events=lambda events: recorded.append([e["sale"]["saleId"] for e in events]))
+        task = asyncio.create_task(stream.run())
+        try:
+            await asyncio.wait_for(done.wait(), 5)
+        finally:
+            stream.stop()
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            await runner.cleanup()
+        return received, recorded, stream
+
+    received, recorded, stream = asyncio.run(run())
+    assert received == [1, 2, 3]
+    # Handed off before deduplication, replayed sale included
+    assert recorded == [[1, 2], [2, 3]]
+    assert stream.connects == 2
+    assert connections[0]["event"] == "saleFeedJoin"
@@ -3,7 +3,7 @@ import os
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "core")))
 
-from filter_engine import filter_item
+from filter_engine import filter_item, filter_batch, compile_filter, compile_filters, build_filter_index
 
 
 sales_data = [
@@ -71,4 +71,97 @@ query_params = {
 }
 
 for s in sales_data:
-    print(filter_item(sale=s, query_params=query_params))
\ No newline at end of file
+    print(filter_item(sale=s, query_params=query_params))
+
+def test_compile_filter_parses_once():
+    plan = compile_filter(query_params)
+    assert plan.min_price == 50
+    assert plan.max_price == 210
+    assert plan.patterns == frozenset({100, 231, 31, 321})
+    assert plan.min_wear == 0.001
+    assert plan.exterior == "minimal wear"
+
+
+def test_unparsable_bounds_are_ignored():
+    plan = compile_filter({"name": "Karambit", "minPrice": "10.5", "patterns": "a, 1"})
+    assert plan.min_price is None
+    assert plan.patterns is None
+    assert plan.matches(sales_data[0])
+
+
+def test_filter_item_reports_first_matching_filter():
+    params = {"filters": [{"name": "Desert Eagle"}, {"name": "Karambit", "maxPrice": "100"}, {"name": "karambit"}]}
+    plans = compile_filters(params)
+    assert filter_item(sales_data[0], plans) == (True, params["filters"][2])
+    assert filter_item(sales_data[0], params) == (True, params["filters"][2])
+    assert filter_item(sales_data[2], plans) == (False, None)
+
+
+def test_filter_index_matches_linear_scan():
+    params = {"filters": [
+        {"name": "Nexus", "exterior": "Minimal Wear"},
+        {"name": "MP9", "maxPrice": "40"},
+        {"name": "mp9"},
+        {"name": "Eagle", "exterior": "Minimal Wear"},
+        {"name": "ka"},
+    ]}
+    index = build_filter_index(params)
+    for sale in sales_data:
+        assert filter_item(sale, index) == filter_item(sale, compile_filters(params))
+    assert filter_item(sales_data[2], index) == (True, params["filters"][2])
+
+
+def test_filter_batch_matches_filter_item():
+    params = {"filters": [
+        {"name": "Nexus", "exterior": "Factory New"},
+        {"name": "Karambit", "patterns": "231", "maxWear": "0.1"},
+        {"name": "Eagle", "minPrice": "20"},
+    ]}
+    index = build_filter_index(params)
+    expected = [(s, filter_item(s, index)[1]) for s in sales_data if filter_item(s, index)[0]]
+    assert filter_batch(sales_data, index) == expected
+    assert [s["sale"]["saleId"] for s, _ in expected] == [61598590, 61598592]
+
+
+def test_filter_batch_index_only_evaluates_candidates():
+    # Same answers with and without the index, including the first-match order
+    params = {"filters": [
+        {"name": "Karambit", "patterns": "5, 7"},
+        {"name": "Karambit", "patterns": "231"},
+        {"exterior": "Minimal Wear", "maxPrice": "100"},
+        {"name": "MP9", "minWear": "0.5"},
+        {"name": "Eagle", "minPrice": "20"},
+        {"maxPrice": "1000000"},
+    ]}
+    index = build_filter_index(params)
+    plans = compile_filters(params)
+    assert filter_batch(sales_data, index) == filter_batch(sales_data, plans)
+    assert [f for _, f in filter_batch(sales_data, index)] == [filter_item(s, plans)[1] for s in sales_data
+                                                              if filter_item(s, plans)[0]]
+    assert filter_batch(sales_data, index)[0][1] is params["filters"][1]
+
+
+def test_candidate_arrays_are_sorted_and_cached():
+    params = {"filters": [
+        {"name": "Karambit"},
+        {"exterior": "Minimal Wear"},
+        {"name": "Karambit", "exterior": "Minimal Wear"},
+        {},
+        {"name": "MP9"},
+    ]}
+    index = build_filter_index(params)
+    for sale in sales_data:
+        positions = index.candidate_array(sale)
+        assert positions.tolist() == list(index.candidates(sale))
+        assert index.candidate_array(sale) is positions
+
+
+def test_names_are_normalized():
+    params = {"filters": [
+        {"name": "StatTrak  MP9 |"},
+        {"name": "★ Karambit"},
+    ]}
+    index = build_filter_index(params)
+    assert filter_item(sales_data[2], index) == (True, params["filters"][0])
+    assert filter_item(sales_data[0], index) == (True, params["filters"][1])
+    assert filter_item(sales_data[1], index) == (False, None)
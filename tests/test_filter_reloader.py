@@ -0,0 +1,84 @@
+import sys
+import os
+import json
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "core")))
+
+from filter_reloader import FilterReloader
+
+
+def _write(path, filters, mtime):
+    path.write_text(json.dumps({"filters": filters}))
+    os.utime(path, ns=(mtime, mtime))
+
+
+def _loader(path):
+    return lambda: json.loads(path.read_text())
+
+
+def test_reload_swaps_index_on_change(tmp_path):
+    params = tmp_path / "script_params.json"
+    _write(params, [{"name": "Karambit"}], 1_000_000_000)
+    reloader = FilterReloader(str(params), load=_loader(params))
+    old = reloader.current
+
+    assert not reloader.check()
+    _write(params, [{"name": "Karambit"}, {"name": "Bayonet"}], 2_000_000_000)
+    assert reloader.check()
+    assert reloader.current is not old
+    assert len(reloader.current) == 2
+
+
+def test_invalid_file_keeps_running_filters(tmp_path):
+    params = tmp_path / "script_params.json"
+    _write(params, [{"name": "Karambit"}], 1_000_000_000)
+    reloader = FilterReloader(str(params), load=_loader(params))
+    current = reloader.current
+
+    params.write_text("{not json")
+    os.utime(params, ns=(3_000_000_000, 3_000_000_000))
+    assert not reloader.check()
+    assert reloader.current is current
+
+
+def test_malformed_entries_keep_running_filters(tmp_path):
+    params = tmp_path / "script_params.json"
+    _write(params, [{"name": "Karambit"}], 1_000_000_000)
+    reloader = FilterReloader(str(params), load=_loader(params))
+    current = reloader.current
+
+    for mtime, content in ((2_000_000_000, {"filters": {"name": "x"}}),
+                           (3_000_000_000, {"filters": [{"name": 5}]})):
+        params.write_text(json.dumps(content))
+        os.utime(params, ns=(mtime, mtime))
+        assert not reloader.check()
+        assert reloader.current is current
+
+
+def test_requested_reload_without_change(tmp_path):
+    params = tmp_path / "script_params.json"
+    _write(params, [{"name": "Karambit"}], 1_000_000_000)
+    reloader = FilterReloader(str(params), load=_loader(params))
+    reloader.request_reload()
+    assert reloader.check()
+    assert reloader.reloads == 1
+
+
+def test_reload_raises_and_keeps_running_filters(tmp_path):
+    params = tmp_path / "script_params.json"
+    _write(params, [{"name": "Karambit"}], 1_000_000_000)
+    reloader = FilterReloader(str(params), load=_loader(params))
+    current = reloader.current
+
+    params.write_text("{not json")
+    try:
+        reloader.reload()
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("invalid file was not reported")
+    assert reloader.current is current and reloader.reloads == 0
+
+    _write(params, [{"name": "Bayonet"}], 2_000_000_000)
+    assert len(reloader.reload()) == 1 and reloader.reloads == 1
+    assert not reloader.check()
@@ -0,0 +1,74 @@
+import sys
+import os
+import json
+import sqlite3
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "fastapi", "app", "routers")))
+
+from filter_store import FilterStore
+
+
+def test_add_get_delete(tmp_path):
+    store = FilterStore(str(tmp_path / "filters.db"))
+    first = store.add({'fname': 'knives', 'name': 'Karambit', 'max_price': '500'})
+    second = store.add({'fname': 'pistols', 'name': 'Desert Eagle'})
+    assert second == first + 1
+    assert store.get(first)['max_price'] == '500'
+    assert [f['fname'] for f in store.all()] == ['knives', 'pistols']
+
+    version = store.version
+    assert store.delete(first)
+    assert store.version > version
+    assert store.get(first) is None
+
+    # Deleting a missing ID keeps the cache and version
+    version, cached = store.version, store.all()
+    assert not store.delete(first)
+    assert store.version == version and store.all() is cached
+
+
+def test_reads_are_cached_until_write(tmp_path):
+    store = FilterStore(str(tmp_path / "filters.db"))
+    store.add({'name': 'Karambit'})
+    assert store.all() is store.all()
+    cached = store.all()
+    store.add({'name': 'Bayonet'})
+    assert store.all() is not cached
+
+
+def test_sees_writes_from_other_connections(tmp_path):
+    db = str(tmp_path / "filters.db")
+    dashboard_a = FilterStore(db)
+    dashboard_b = FilterStore(db)
+    assert dashboard_a.all() == []
+    dashboard_b.add({'name': 'Karambit'})
+    assert [f['name'] for f in dashboard_a.all()] == ['Karambit']
+
+
+def test_imports_existing_json_once(tmp_path):
+    json_path = tmp_path / "saved_filters.json"
+    json_path.write_text(json.dumps([
+        {'id': 4, 'fname': 'old', 'name': 'Karambit', 'created_at': '2025-01-01T10:00:00'},
+        {'id': 9, 'fname': 'older', 'name': 'M9'},
+    ]))
+    store = FilterStore(str(tmp_path / "filters.db"), json_path=str(json_path))
+    assert [f['id'] for f in store.all()] == [4, 9]
+    assert store.add({'name': 'Bayonet'}) == 10
+
+    reopened = FilterStore(str(tmp_path / "filters.db"), json_path=str(json_path))
+    assert len(reopened.all()) == 3
+
+
+def test_adds_missing_columns_to_an_older_database(tmp_path):
+    db = str(tmp_path / "filters.db")
+    conn = sqlite3.connect(db)
+    conn.execute('CREATE TABLE filters (id INTEGER PRIMARY KEY AUTOINCREMENT, fname TEXT, name TEXT)')
+    conn.execute("INSERT INTO filters (fname, name) VALUES ('knives', 'Karambit')")
+    conn.commit()
+    conn.close()
+
+    store = FilterStore(db)
+    assert store.get(1)['name'] == 'Karambit' and store.get(1)['max_relative_price'] is None
+    second = store.add({'name': 'Bayonet', 'max_relative_price': '0.9', 'relative_to': 'mean'})
+    assert store.get(second)['max_relative_price'] == '0.9'
+    assert store.get(second)['relative_to'] == 'mean'
@@ -0,0 +1,52 @@
+import asyncio
+import json
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "core")))
+
+from heartbeat import Heartbeat, read_heartbeat
+
+
+def test_write_and_read(tmp_path):
+    filename = tmp_path / "logs" / "heartbeat.json"
+    heartbeat = Heartbeat(filename, details=lambda: {'workers': 2})
+    for _ in range(5):
+        heartbeat.beat()
+    heartbeat.write()
+
+    data = read_heartbeat(filename)
+    assert data['pid'] == os.getpid()
+    assert data['iterations'] == 5
+    assert data['rate'] is None  # no previous write to measure against
+    assert data['details'] == {'workers': 2}
+    assert not os.path.exists(str(filename) + '.tmp')
+
+    heartbeat._last_write -= 2.0
+    for _ in range(4):
+        heartbeat.beat()
+    heartbeat.write()
+    assert 1.0 < read_heartbeat(filename)['rate'] <= 2.0
+
+
+def test_read_missing_or_half_written(tmp_path):
+    filename = tmp_path / "heartbeat.json"
+    assert read_heartbeat(filename) is None
+    filename.write_text('{"pid": 1, "ti')
+    assert read_heartbeat(filename) is None
+
+
+def test_run_keeps_writing(tmp_path):
+    filename = tmp_path / "heartbeat.json"
+    heartbeat = Heartbeat(filename)
+
+    async def scenario():
+        task = asyncio.create_task(heartbeat.run(interval=0.01))
+        heartbeat.beat()
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(scenario())
+    data = json.loads(filename.read_text())
+    assert data['iterations'] == 1 and data['details'] is None
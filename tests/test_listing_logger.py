@@ -0,0 +1,33 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "core")))
+
+from listing_logger import ListingLog, read_latest
+
+
+def test_tail_returns_newest_first(tmp_path):
+    log = ListingLog(tmp_path / "listings.txt")
+    for i in range(100):
+        log.write(f"line {i}")
+    log.flush()
+    latest = log.tail(3)
+    assert [line.split(" - ", 1)[1] for line in latest] == ["line 99", "line 98", "line 97"]
+    log.close()
+
+
+def test_rotation_keeps_bounded_segments(tmp_path):
+    filename = tmp_path / "listings.txt"
+    log = ListingLog(filename, segment_bytes=200, keep_segments=2)
+    for i in range(200):
+        log.write(f"line {i}")
+        if i % 5 == 0:
+            log.flush()
+    log.close()
+
+    assert os.path.exists(f"{filename}.2")
+    assert not os.path.exists(f"{filename}.3")
+    # reading across segment boundaries still yields contiguous history
+    latest = read_latest(15, str(filename), keep_segments=2)
+    numbers = [int(line.rsplit(" ", 1)[1]) for line in latest]
+    assert numbers == list(range(199, 184, -1))
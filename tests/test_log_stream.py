@@ -0,0 +1,144 @@
+import asyncio
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "core")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "fastapi", "app", "routers")))
+
+from listing_logger import ListingLog
+from log_stream import LogBroadcaster
+
+
+def append(filename, *lines):
+    with open(filename, 'a', encoding='utf-8') as f:
+        f.writelines(f'{line}\n' for line in lines)
+
+
+def test_since_returns_lines_after_the_cursor(tmp_path):
+    filename = tmp_path / "listings.txt"
+    append(filename, "before")
+    broadcaster = LogBroadcaster(str(filename), backlog=3, initial_lines=["a", "b"])
+
+    # Existing content is covered by initial_lines, following starts at the end
+    assert broadcaster.since(0) == (2, ["a", "b"])
+    append(filename, "c", "d")
+    broadcaster.poll()
+    assert broadcaster.since(2) == (4, ["c", "d"])
+    assert broadcaster.since(4) == (4, [])
+    # Older than the ring buffer: only what is still kept
+    assert broadcaster.since(0) == (4, ["b", "c", "d"])
+
+
+def test_partial_lines_wait_for_their_newline(tmp_path):
+    filename = tmp_path / "listings.txt"
+    broadcaster = LogBroadcaster(str(filename))
+    with open(filename, 'w') as f:
+        f.write("first\nsec")
+    broadcaster.poll()
+    assert broadcaster.since(0) == (1, ["first"])
+    with open(filename, 'a') as f:
+        f.write("ond\n")
+    broadcaster.poll()
+    assert broadcaster.since(1) == (2, ["second"])
+
+
+def test_new_lines_fan_out_to_every_subscriber(tmp_path):
+    filename = tmp_path / "listings.txt"
+    append(filename, "old")
+
+    async def scenario():
+        broadcaster = LogBroadcaster(str(filename), interval=0.01)
+        first, second = broadcaster.subscribe(), broadcaster.subscribe()
+        append(filename, "new 1", "new 2")
+        received = [[await asyncio.wait_for(queue.get(), 5) for _ in range(2)] for queue in (first, second)]
+        broadcaster.unsubscribe(second)
+        append(filename, "new 3")
+        received.append(await asyncio.wait_for(first.get(), 5))
+        broadcaster._task.cancel()
+        return received, second.qsize()
+
+    received, left = asyncio.run(scenario())
+    assert received[0] == received[1] == [(1, "new 1"), (2, "new 2")]
+    assert received[2] == (3, "new 3") and left == 0
+
+
+def test_rotation_keeps_lines_written_before_it(tmp_path):
+    filename = tmp_path / "listings.txt"
+    append(filename, "line 0")
+    broadcaster = LogBroadcaster(str(filename))
+
+    # Appended and rotated away between two polls, new segment not created yet
+    append(filename, "line 1")
+    os.replace(filename, f"{filename}.1")
+    broadcaster.poll()
+    append(filename, "line 2")
+    broadcaster.poll()
+    assert broadcaster.since(0) == (2, ["line 1", "line 2"])
+
+    # Rotated twice between two polls: the skipped segment is read as well
+    append(filename, "line 3")
+    os.replace(f"{filename}.1", f"{filename}.2")
+    os.replace(filename, f"{filename}.1")
+    append(filename, "line 4")
+    os.replace(f"{filename}.2", f"{filename}.3")
+    os.replace(f"{filename}.1", f"{filename}.2")
+    os.replace(filename, f"{filename}.1")
+    append(filename, "line 5")
+    broadcaster.poll()
+    assert broadcaster.since(2) == (5, ["line 3", "line 4", "line 5"])
+
+
+def test_follows_a_rotating_listing_log(tmp_path):
+    filename = tmp_path / "listings.txt"
+    log = ListingLog(filename, segment_bytes=200, keep_segments=5)
+    broadcaster = LogBroadcaster(str(filename))
+    for i in range(40):
+        log.write(f"line {i}")
+        if i % 7 == 0:
+            log.flush()
+            broadcaster.poll()
+    log.close()
+    broadcaster.poll()
+
+    sequence, lines = broadcaster.since(0)
+    assert sequence == 40
+    assert [line.split(" - ", 1)[1] for line in lines] == [f"line {i}" for i in range(40)]
+
+
+def test_slow_subscriber_stream_ends(tmp_path):
+    filename = tmp_path / "listings.txt"
+    append(filename, "old")
+
+    async def scenario():
+        broadcaster = LogBroadcaster(str(filename), interval=3600)
+        slow = broadcaster.stream(cursor=0, keepalive=0.01)
+        assert await slow.__anext__() == ": keep-alive\n\n"
+        queue = next(iter(broadcaster._subscribers))
+        for i in range(queue.maxsize + 1):
+            broadcaster._append(f"line {i}")
+
+        # Dropped: the stream returns instead of sending keep-alives forever
+        rest = [chunk async for chunk in slow]
+        broadcaster._task.cancel()
+        return rest, broadcaster._subscribers
+
+    rest, subscribers = asyncio.run(scenario())
+    assert rest == [] and not subscribers
+
+
+def test_stream_sends_backlog_then_new_lines(tmp_path):
+    filename = tmp_path / "listings.txt"
+
+    async def scenario():
+        broadcaster = LogBroadcaster(str(filename), interval=0.01, initial_lines=["a", "b", "c"])
+        stream = broadcaster.stream(cursor=1)
+        chunks = [await stream.__anext__(), await stream.__anext__()]
+        append(filename, "d")
+        chunks.append(await asyncio.wait_for(stream.__anext__(), 5))
+        await stream.aclose()
+        broadcaster._task.cancel()
+        return chunks, broadcaster._subscribers
+
+    chunks, subscribers = asyncio.run(scenario())
+    assert chunks == ["id: 2\ndata: b\n\n", "id: 3\ndata: c\n\n", "id: 4\ndata: d\n\n"]
+    assert not subscribers
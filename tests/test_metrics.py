@@ -0,0 +1,69 @@
+import asyncio
+import os
+import socket
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "core")))
+
+import aiohttp
+
+from metrics import Registry, serve
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = Registry()
+    latency = registry.histogram('stage_seconds', 'Stage latency', ('stage',), buckets=(0.01, 0.1))
+    latency.observe(0.005, stage='filter')
+    latency.observe(0.05, stage='filter')
+    latency.observe(3, stage='filter')
+    latency.observe(0.05, stage='send')
+
+    text = registry.render()
+    assert '# TYPE stage_seconds histogram' in text
+    assert 'stage_seconds_bucket{stage="filter",le="0.01"} 1' in text
+    assert 'stage_seconds_bucket{stage="filter",le="0.1"} 2' in text
+    assert 'stage_seconds_bucket{stage="filter",le="+Inf"} 3' in text
+    assert 'stage_seconds_count{stage="filter"} 3' in text
+    assert 'stage_seconds_count{stage="send"} 1' in text
+    assert latency.count(stage='filter') == 3
+
+
+def test_counter_by_label():
+    registry = Registry()
+    sales = registry.counter('sales_total', 'Sales by outcome', ('event',))
+    sales.inc(5, event='seen')
+    sales.inc(event='matched')
+    sales.inc(2, event='seen')
+
+    text = registry.render()
+    assert 'sales_total{event="seen"} 7' in text
+    assert 'sales_total{event="matched"} 1' in text
+    assert sales.get(event='deduped') == 0
+
+
+def test_serve_metrics():
+    registry = Registry()
+    registry.counter('sales_total', 'Sales').inc(3)
+
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+
+    async def scenario():
+        server = asyncio.create_task(serve(port, source=registry))
+        try:
+            for _ in range(50):
+                try:
+                    async with aiohttp.ClientSession() as session:
+                        async with session.get(f'http://127.0.0.1:{port}/metrics') as response:
+                            return response.status, response.headers['Content-Type'], await response.text()
+                except aiohttp.ClientConnectionError:
+                    await asyncio.sleep(0.02)
+        finally:
+            server.cancel()
+            await asyncio.gather(server, return_exceptions=True)
+
+    status, content_type, text = asyncio.run(scenario())
+    assert status == 200
+    assert content_type.startswith('text/plain')
+    assert 'sales_total 3' in text
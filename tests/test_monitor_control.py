@@ -0,0 +1,96 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "core")))
+
+import metrics
+from monitor_control import MonitorControl, send_command
+
+
+def test_first_filtered_poll_is_timed_from_the_request():
+    now = [100.0]
+    reloads = []
+    control = MonitorControl(armed=False, on_arm=lambda: reloads.append(1), clock=lambda: now[0])
+    observed = metrics.start_seconds.count()
+
+    control.polled()
+    assert control.status()['start_to_first_poll_ms'] is None
+
+    control.arm(requested_at=99.5)
+    assert control.armed and reloads == [1]
+    now[0] = 100.25
+    control.polled()
+    now[0] = 105.0
+    control.polled()  # only the first filtered poll counts
+
+    assert control.status()['start_to_first_poll_ms'] == 750.0
+    assert metrics.start_seconds.count() == observed + 1
+
+    control.disarm()
+    assert control.status()['armed'] is False
+
+
+def test_arm_cuts_the_poll_delay_short():
+    async def scenario():
+        control = MonitorControl(armed=False)
+        asyncio.get_running_loop().call_later(0.05, control.arm)
+        started = time.perf_counter()
+        await control.wait(5)
+        return time.perf_counter() - started
+
+    assert asyncio.run(scenario()) < 1
+
+
+def test_commands_over_the_control_channel():
+    async def scenario():
+        changes = []
+        reload_threads = []
+        control = MonitorControl(armed=False, on_change=lambda: changes.append(control.armed),
+                                 on_arm=lambda: reload_threads.append(threading.current_thread()))
+        server = asyncio.create_task(control.serve(0))
+        while control.port is None:
+            await asyncio.sleep(0.01)
+        try:
+            armed = await send_command({'cmd': 'arm', 'requested_at': 1.0}, control.port)
+            status = await send_command({'cmd': 'status'}, control.port)
+            disarmed = await send_command({'cmd': 'disarm'}, control.port)
+            unknown = await send_command({'cmd': 'reboot'}, control.port)
+        finally:
+            server.cancel()
+            await asyncio.gather(server, return_exceptions=True)
+        return armed, status, disarmed, unknown, changes, reload_threads
+
+    armed, status, disarmed, unknown, changes, reload_threads = asyncio.run(scenario())
+    assert armed['ok'] and armed['armed'] and armed['requested_at'] == 1.0
+    assert status['armed'] and status['arms'] == 1
+    assert disarmed['ok'] and not disarmed['armed']
+    assert not unknown['ok']
+    assert changes == [True, False]
+    # The filter reload ran off the event loop
+    assert len(reload_threads) == 1 and reload_threads[0] is not threading.main_thread()
+
+
+def test_failed_reload_is_reported_and_stays_disarmed():
+    def reload():
+        raise ValueError("bad script_params.json")
+
+    async def scenario():
+        control = MonitorControl(armed=False, on_arm=reload)
+        server = asyncio.create_task(control.serve(0))
+        while control.port is None:
+            await asyncio.sleep(0.01)
+        try:
+            reply = await send_command({'cmd': 'arm'}, control.port)
+            invalid = await send_command(['arm'], control.port)
+        finally:
+            server.cancel()
+            await asyncio.gather(server, return_exceptions=True)
+        return reply, invalid, control.armed
+
+    reply, invalid, armed = asyncio.run(scenario())
+    assert reply == {'ok': False, 'error': "bad script_params.json"}
+    assert not armed
+    assert invalid['error'].startswith("invalid command")
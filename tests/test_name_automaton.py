@@ -0,0 +1,30 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "core")))
+
+from name_automaton import NameAutomaton
+
+
+def found(automaton, text):
+    return {automaton.names[name_id] for name_id in automaton.find(text)}
+
+
+def test_finds_overlapping_names():
+    automaton = NameAutomaton(["he", "she", "his", "hers", "she"])
+    assert len(automaton) == 4
+    assert found(automaton, "ushers") == {"he", "she", "hers"}
+    assert found(automaton, "this") == {"his"}
+    assert found(automaton, "xyz") == set()
+
+
+def test_market_names():
+    automaton = NameAutomaton(["ak-47", "ak-47 | redline", "redline (field-tested)", "m4a4"])
+    assert found(automaton, "stattrak ak-47 | redline (field-tested)") == {
+        "ak-47", "ak-47 | redline", "redline (field-tested)"}
+    # Repeated scans go through the cached transitions
+    assert found(automaton, "ak-47 | redline (minimal wear)") == {"ak-47", "ak-47 | redline"}
+
+
+def test_empty_automaton():
+    assert NameAutomaton([]).find("anything") == frozenset()
@@ -0,0 +1,112 @@
+import asyncio
+import json
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "core")))
+
+from bot.notifiers import CircuitBreaker, JsonlFileSink, NotificationFanout, Sink, SinkQueue
+from sale import Sale
+
+
+def make_sale(sale_id):
+    return Sale.from_event({"eventType": "listed", "timestamp": 1746650292048, "sale": {
+        "saleId": sale_id, "marketName": "AK-47 | Redline (Field-Tested)", "salePrice": 1234,
+        "wear": 0.2, "exterior": "Field-Tested"}})
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class RecordingSink(Sink):
+    def __init__(self, name, delay=0.0, fail=False):
+        super().__init__()
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.received = []
+        self.calls = 0
+
+    async def send(self, sales):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("backend down")
+        self.received.extend(sale.sale_id for sale in sales)
+
+
+def test_circuit_breaker_opens_and_recovers():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    assert not breaker.allow()
+
+    clock.now = 10
+    assert breaker.allow()       # trial batch
+    assert not breaker.allow()   # only one at a time
+    breaker.record_failure()
+    assert breaker.state == 'open'
+
+    clock.now = 20
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == 'closed'
+    assert breaker.trips == 2
+
+
+def test_slow_and_failing_sinks_do_not_delay_others(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    fast = JsonlFileSink(str(path))
+    slow = RecordingSink('slow', delay=5)
+    broken = RecordingSink('broken', fail=True)
+    failures = {}
+
+    async def scenario():
+        fanout = NotificationFanout([
+            SinkQueue(fast),
+            SinkQueue(slow, timeout=0.1),
+            SinkQueue(broken, breaker=CircuitBreaker(failure_threshold=1, reset_timeout=60)),
+        ])
+        fanout.on_failed = lambda sink, count: failures.__setitem__(sink, failures.get(sink, 0) + count)
+        fanout.start()
+        assert fanout.enqueue(make_sale(1))
+        await asyncio.sleep(0.02)
+        # The audit line is written long before the slow sink times out
+        assert path.exists()
+        for sale_id in (2, 3):
+            fanout.enqueue(make_sale(sale_id))
+        await asyncio.sleep(0.3)
+        stats = fanout.stats()
+        await fanout.stop()
+        return stats
+
+    stats = asyncio.run(scenario())
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["saleId"] for line in lines] == [1, 2, 3]
+    assert lines[0]["exterior"] == "Field-Tested"
+    assert stats['slow']['failed'] >= 1
+    # The breaker opened after the first failure; later sales were rejected without calling the backend
+    assert broken.calls == 1
+    assert stats['broken']['breaker'] == 'open'
+    assert stats['broken']['failed'] + stats['broken']['rejected'] == 3
+    assert failures['broken'] == 3
+
+
+def test_full_queue_drops():
+    async def scenario():
+        queue = SinkQueue(RecordingSink('idle'), maxsize=1)
+        assert queue.enqueue(make_sale(1))
+        assert not queue.enqueue(make_sale(2))
+        return queue.stats()
+
+    assert asyncio.run(scenario())['dropped'] == 1
@@ -0,0 +1,41 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "core")))
+
+from poll_scheduler import AdaptivePollScheduler
+
+
+def test_quiet_feed_backs_off_to_max_interval():
+    scheduler = AdaptivePollScheduler(min_interval=0.5, max_interval=5)
+    for _ in range(20):
+        scheduler.record(new_sales=0)
+    assert scheduler.interval == 5
+
+
+def test_new_sales_tighten_interval():
+    scheduler = AdaptivePollScheduler(min_interval=0.5, max_interval=5)
+    scheduler.interval = 4
+    scheduler.record(new_sales=3)
+    assert scheduler.interval == 2
+    for _ in range(10):
+        scheduler.record(new_sales=1)
+    assert scheduler.interval == 0.5
+
+
+def test_errors_back_off_and_reset():
+    scheduler = AdaptivePollScheduler(min_interval=0.5, max_interval=5, error_interval=30)
+    assert scheduler.record(error=True) == 5
+    assert scheduler.record(error=True) == 10
+    for _ in range(5):
+        scheduler.record(error=True)
+    assert scheduler.interval == 30
+    scheduler.record(new_sales=1)
+    assert scheduler.errors == 0
+    assert scheduler.interval == 2.5
+
+
+def test_processing_time_is_deducted():
+    scheduler = AdaptivePollScheduler(min_interval=1, max_interval=5)
+    assert scheduler.next_delay(0.25) == 0.75
+    assert scheduler.next_delay(3) == 0
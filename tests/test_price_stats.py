@@ -0,0 +1,77 @@
+import os
+import random
+import statistics
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "core")))
+
+from filter_engine import build_filter_index, filter_batch, filter_item
+from price_stats import P2Quantile, PriceStats
+from sale import Sale
+
+
+def make_sale(sale_id, name, price):
+    return Sale.from_event({"eventType": "listed", "sale": {
+        "saleId": sale_id, "marketName": name, "marketHashName": name, "salePrice": price,
+        "wear": 0.2, "exterior": "Field-Tested"}})
+
+
+def test_p2_median_tracks_stream():
+    rng = random.Random(4)
+    values = [rng.lognormvariate(8, 0.3) for _ in range(5000)]
+    estimate = P2Quantile(0.5)
+    for value in values:
+        estimate.add(value)
+    assert abs(estimate.value() - statistics.median(values)) / statistics.median(values) < 0.02
+
+
+def test_p2_exact_for_few_values():
+    estimate = P2Quantile(0.5)
+    assert estimate.value() is None
+    for value in (30, 10, 20):
+        estimate.add(value)
+    assert estimate.value() == 20
+
+
+def test_price_stats_is_bounded_lru():
+    stats = PriceStats(capacity=2, min_samples=1)
+    stats.observe("a", 100)
+    stats.observe("b", 200)
+    stats.observe("a", 110)
+    stats.observe("c", 300)
+    assert len(stats) == 2
+    assert stats.get("b") is None
+    assert stats.get("a").count == 2
+    assert stats.stats()["evictions"] == 1
+
+
+def test_annotate_needs_min_samples():
+    stats = PriceStats(min_samples=3, alpha=0.5)
+    sale = make_sale(1, "AK-47 | Redline (Field-Tested)", 800)
+    for price in (1000, 1000):
+        stats.observe(sale.market_hash_name, price)
+    stats.annotate([sale])
+    assert sale.median_price is None
+
+    stats.observe(sale.market_hash_name, 1000)
+    stats.annotate([sale])
+    assert sale.median_price == 1000
+    assert sale.mean_price == 1000
+
+
+def test_relative_price_filter():
+    stats = PriceStats(min_samples=3)
+    name = "AK-47 | Redline (Field-Tested)"
+    for sale_id, price in enumerate((1000, 1100, 900, 1000)):
+        stats.observe(name, price)
+
+    cheap, normal, unknown = make_sale(10, name, 750), make_sale(11, name, 1000), make_sale(12, "AWP | Asiimov", 10)
+    stats.annotate([cheap, normal, unknown])
+
+    params = {"filters": [{"name": "", "maxRelativePrice": "0.8"}]}
+    index = build_filter_index(params)
+    assert filter_item(cheap, index) == (True, params["filters"][0])
+    assert filter_item(normal, index) == (False, None)
+    # No typical price yet: never a match
+    assert filter_item(unknown, index) == (False, None)
+    assert filter_batch([cheap, normal, unknown], index) == [(cheap, params["filters"][0])]
@@ -0,0 +1,99 @@
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "fastapi", "app", "routers")))
+
+from process_status import ProcessStatus
+
+
+class FakeProcess:
+    def __init__(self, pid, returncode=None):
+        self.pid = pid
+        self.returncode = returncode
+
+    def poll(self):
+        return self.returncode
+
+
+def monitor_heartbeat(pid, armed=None, age=0.0):
+    details = {'control': {'armed': armed}} if armed is not None else None
+    return {'pid': pid, 'time': time.time() - age, 'iterations': 3, 'rate': 1.5, 'details': details}
+
+
+def test_pid_file_fallback(tmp_path):
+    pid_file = tmp_path / "script_pids.json"
+    status = ProcessStatus(str(pid_file), lambda: None)
+
+    status.refresh()
+    assert status.get()['processes'] == {} and not status.is_running()
+
+    pid_file.write_text("{not json")
+    status.refresh()
+    assert status.get()['processes'] == {}
+
+    # After a dashboard restart only the PID file is left; dead PIDs are skipped
+    pid_file.write_text(json.dumps({'python_pid': os.getpid(), 'node_pid': 2 ** 22 + 12345}))
+    status.refresh()
+    assert status.get()['processes'] == {'python_pid': os.getpid()}
+    assert status.is_running()
+
+    # Tracked Popen handles take precedence over the PID file
+    status.track('python_pid', FakeProcess(4242, returncode=0))
+    assert status.get()['processes'] == {} and not status.is_running()
+
+
+def test_stale_heartbeat(tmp_path):
+    heartbeat = [None]
+    status = ProcessStatus(str(tmp_path / "pids.json"), lambda: heartbeat[0], stale_after=15.0)
+    status.track('python_pid', FakeProcess(4242))
+    assert status.get()['stale'] and status.get()['last_heartbeat'] is None
+
+    heartbeat[0] = monitor_heartbeat(4242, age=1.0)
+    status.refresh()
+    snapshot = status.get()
+    assert not snapshot['stale']
+    assert snapshot['loop_rate'] == 1.5 and snapshot['iterations'] == 3
+    assert 0.9 < snapshot['heartbeat_age'] < 5
+
+    heartbeat[0] = monitor_heartbeat(4242, age=60.0)
+    status.refresh()
+    assert status.get()['stale']
+
+    # Nothing to be stale about once the monitor is gone
+    status.forget()
+    assert not status.get()['stale']
+
+
+def test_standby_and_armed_mapping(tmp_path):
+    heartbeat = [None]
+    status = ProcessStatus(str(tmp_path / "pids.json"), lambda: heartbeat[0])
+
+    # Standby spawn before its first heartbeat: alive, but not armed
+    status.track('python_pid', FakeProcess(4242), standby=True)
+    assert (status.get()['running'], status.get()['standby']) == (False, True)
+
+    # A heartbeat left behind by an earlier, armed monitor doesn't count
+    heartbeat[0] = monitor_heartbeat(1111, armed=True)
+    status.refresh()
+    assert (status.get()['running'], status.get()['standby']) == (False, True)
+
+    heartbeat[0] = monitor_heartbeat(4242, armed=False)
+    status.refresh()
+    assert (status.get()['running'], status.get()['standby']) == (False, True)
+
+    # Armed through the control channel
+    heartbeat[0] = monitor_heartbeat(4242, armed=True)
+    status.refresh()
+    assert (status.get()['running'], status.get()['standby']) == (True, False)
+
+    # A regular spawn is running right away
+    heartbeat[0] = None
+    status.forget()
+    status.track('python_pid', FakeProcess(5252))
+    assert (status.get()['running'], status.get()['standby']) == (True, False)
+
+    # An exited monitor is neither running nor on standby
+    status.track('python_pid', FakeProcess(5252, returncode=1))
+    assert (status.get()['running'], status.get()['standby']) == (False, False)
@@ -0,0 +1,83 @@
+import gzip
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "core")))
+
+from feed_capture import FeedRecorder, read_capture
+from filter_engine import build_filter_index
+from replay import replay
+
+
+def sale(sale_id, name, price):
+    return {"eventType": "listed", "timestamp": 1746650292048,
+            "sale": {"saleId": sale_id, "marketName": name, "salePrice": price, "wear": 0.1,
+                     "exterior": "Minimal Wear", "pattern": 1}}
+
+
+def test_capture_appends_across_runs(tmp_path):
+    path = str(tmp_path / "capture.jsonl.gz")
+    recorder = FeedRecorder(path)
+    recorder.record([sale(1, "AK-47 | Redline (Minimal Wear)", 1000)], received_at=1.0)
+    recorder.close()
+
+    recorder = FeedRecorder(path)
+    recorder.record([sale(2, "AWP | Asiimov (Minimal Wear)", 5000)], received_at=2.0)
+    recorder.close()
+
+    records = list(read_capture(path))
+    assert [t for t, _ in records] == [1.0, 2.0]
+    assert records[1][1][0]["sale"]["saleId"] == 2
+
+
+def test_truncated_capture_is_readable(tmp_path):
+    path = str(tmp_path / "capture.jsonl.gz")
+    recorder = FeedRecorder(path)
+    recorder.record([sale(1, "AK-47 | Redline (Minimal Wear)", 1000)])
+    recorder.record([sale(2, "AWP | Asiimov (Minimal Wear)", 5000)])
+    recorder.close()
+
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data[:-10])
+
+    assert [sales[0]["sale"]["saleId"] for _, sales in read_capture(path)][:1] == [1]
+
+
+def test_replay_counts_fired_filters():
+    responses = [
+        (1.0, [sale(1, "AK-47 | Redline (Minimal Wear)", 1000), sale(2, "AWP | Asiimov (Minimal Wear)", 5000)]),
+        # Overlapping poll: sale 2 must not be counted twice
+        (2.0, [sale(2, "AWP | Asiimov (Minimal Wear)", 5000), sale(3, "AK-47 | Redline (Minimal Wear)", 20000)]),
+    ]
+    index = build_filter_index({"filters": [
+        {"name": "AK-47", "maxPrice": "15000"},
+        {"name": "AWP"},
+        {"name": "M4A4"},
+    ]})
+
+    report = replay(responses, index)
+
+    assert report["responses"] == 2
+    assert report["sales"] == 4
+    assert report["unique_sales"] == 3
+    assert report["matches"] == 2
+    assert [entry["fired"] for entry in report["filters"]] == [1, 1, 0]
+
+
+def test_replay_dedupes_like_the_monitor():
+    ak = "AK-47 | Redline (Minimal Wear)"
+    responses = [
+        (100.0, [sale(1, ak, 1000), sale(2, ak, 1000)]),
+        (130.0, [sale(3, ak, 1000)]),
+        # Sale 1 was evicted (capacity 2), sale 2 expired (TTL 50s on the capture's clock), sale 3 is a duplicate
+        (155.0, [sale(3, ak, 1000), sale(1, ak, 1000), sale(2, ak, 1000)]),
+    ]
+    index = build_filter_index({"filters": [{"name": "AK-47"}]})
+
+    report = replay(responses, index, seen_capacity=2, seen_ttl=50)
+    assert report["unique_sales"] == 5
+    assert report["seen_sales"]["expirations"] == 1 and report["seen_sales"]["hits"] == 1
+
+    assert replay(responses, index)["unique_sales"] == 3
@@ -0,0 +1,69 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "core")))
+
+from filter_engine import build_filter_index, filter_batch, filter_item
+from sale import Exterior, Sale
+
+event = {
+    "eventType": "listed",
+    "sale": {
+        "saleId": 61598590,
+        "marketName": "★ Karambit | Tiger Tooth (Factory New)",
+        "marketHashName": "★ Karambit | Tiger Tooth (Factory New)",
+        "category": "Knife",
+        "salePrice": "20000",
+        "wear": "0.02453",
+        "pattern": 231,
+        "exterior": "Factory New",
+        "stattrak": False,
+        "currency": "EUR",
+        "image": "abc",
+        "url": "karambit-tiger-tooth",
+    },
+    "timestamp": 1746650292048,
+}
+
+
+def test_from_event_coerces_once():
+    sale = Sale.from_event(event)
+    assert sale.sale_id == 61598590
+    assert sale.price == 20000
+    assert sale.display_price == 200.0
+    assert sale.wear == 0.02453
+    assert sale.exterior is Exterior.FACTORY_NEW
+    assert sale.exterior.label == "Factory New"
+    assert sale.name_key == "karambit | tiger tooth (factory new)"
+    assert sale.timestamp == 1746650292048
+    # The raw event is left untouched
+    assert event["sale"]["salePrice"] == "20000"
+
+
+def test_unparsable_values_become_none():
+    sale = Sale.from_event({"eventType": "listed", "sale": {
+        "saleId": 1, "marketName": "AWP", "salePrice": "12.5", "wear": "bad", "pattern": "7", "exterior": "Mint"}})
+    assert sale.price is None
+    assert sale.wear is None
+    assert sale.pattern is None
+    assert sale.exterior is Exterior.UNKNOWN
+
+
+def test_exterior_parse():
+    assert Exterior.parse("field-tested") is Exterior.FIELD_TESTED
+    assert Exterior.parse(" Well-Worn ") is Exterior.WELL_WORN
+    assert Exterior.parse("") is Exterior.UNKNOWN
+
+
+def test_engine_accepts_sale_records():
+    params = {"filters": [
+        {"name": "Karambit", "maxPrice": "10000"},
+        {"name": "Karambit", "exterior": "Factory New", "patterns": "231", "maxWear": "0.03"},
+        {"name": "Karambit", "exterior": "Unknown label"},
+    ]}
+    index = build_filter_index(params)
+    sale = Sale.from_event(event)
+
+    assert filter_item(sale, index) == filter_item(event, index) == (True, params["filters"][1])
+    assert filter_item(sale, params) == (True, params["filters"][1])
+    assert filter_batch([sale], index) == [(sale, params["filters"][1])]
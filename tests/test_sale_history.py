@@ -0,0 +1,74 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "core")))
+
+from sale import Sale
+from sale_history import HistoryReader, HistoryWriter
+
+
+def make_sale(sale_id, name, price, wear=0.2, timestamp=None, pattern=7):
+    item = {"saleId": sale_id, "marketName": name, "marketHashName": name, "salePrice": price, "pattern": pattern}
+    if wear is not None:
+        item["wear"] = wear
+    return Sale.from_event({"eventType": "listed", "sale": item, "timestamp": timestamp})
+
+
+def test_round_trip_newest_first(tmp_path):
+    writer = HistoryWriter(tmp_path)
+    writer.append([make_sale(1, "AK-47 | Redline (Field-Tested)", 1250, timestamp=1000),
+                   make_sale(2, "★ Karambit | Fade (Factory New)", None, wear=None, timestamp=2000, pattern=None)])
+    reader = HistoryReader(tmp_path)
+
+    sales = reader.query()['sales']
+    assert [sale['saleId'] for sale in sales] == [2, 1]
+    assert sales[1] == {"saleId": 1, "timestamp": 1000, "marketHashName": "AK-47 | Redline (Field-Tested)",
+                        "salePrice": 1250, "wear": 0.2, "pattern": 7}
+    assert sales[0]['salePrice'] is None and sales[0]['wear'] is None and sales[0]['pattern'] is None
+
+    # Rows written after the reader opened the segment show up on the next query
+    writer.append([make_sale(3, "AK-47 | Redline (Field-Tested)", 900, timestamp=3000)])
+    assert [sale['saleId'] for sale in reader.query(item="AK-47 | Redline")['sales']] == [3, 1]
+    # Unknown prices never match a price bound
+    assert [sale['saleId'] for sale in reader.query(max_price=1000)['sales']] == [3]
+    writer.close()
+
+
+def test_range_queries_skip_segments(tmp_path):
+    writer = HistoryWriter(tmp_path, segment_rows=10)
+    sales = [make_sale(n, "AWP | Asiimov (Field-Tested)" if n < 10 else "M4A4 | Howl (Minimal Wear)",
+                       price=100 * n, wear=n / 100, timestamp=n * 1000) for n in range(25)]
+    writer.append(sales[:7])
+    writer.append(sales[7:])
+    assert sorted(os.listdir(tmp_path)) == ['names.txt', 'segment-000001.idx', 'segment-000001.seg',
+                                            'segment-000002.idx', 'segment-000002.seg', 'segment-000003.seg']
+
+    reader = HistoryReader(tmp_path)
+    result = reader.query(since=12, until=14)
+    assert [sale['saleId'] for sale in result['sales']] == [14, 13, 12]
+    assert (result['segments_scanned'], result['segments_skipped']) == (1, 2)
+
+    result = reader.query(item="asiimov", min_wear=0.05)
+    assert [sale['saleId'] for sale in result['sales']] == [9, 8, 7, 6, 5]
+    assert result['segments_scanned'] == 1
+
+    assert [sale['saleId'] for sale in reader.query(min_price=1500, max_price=2100, limit=3)['sales']] == [21, 20, 19]
+    assert reader.query(item="karambit")['sales'] == []
+    writer.close()
+
+
+def test_writer_resumes_and_prunes(tmp_path):
+    writer = HistoryWriter(tmp_path, segment_rows=4, max_segments=2)
+    writer.append([make_sale(n, f"Item {n % 3}", 100) for n in range(6)])
+    writer.close()
+
+    writer = HistoryWriter(tmp_path, segment_rows=4, max_segments=2)
+    writer.append([make_sale(n, f"Item {n % 4}", 100) for n in range(6, 13)])
+    assert writer.stats()['names'] == 4
+    writer.close()
+
+    reader = HistoryReader(tmp_path)
+    sales = reader.query(limit=50)['sales']
+    # 13 rows in segments of 4: the oldest two segments were dropped
+    assert [sale['saleId'] for sale in sales] == [12, 11, 10, 9, 8]
+    assert [sale['marketHashName'] for sale in sales] == ["Item 0", "Item 3", "Item 2", "Item 1", "Item 0"]
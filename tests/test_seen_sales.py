@@ -0,0 +1,43 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "core")))
+
+from seen_sales import SeenSales
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_duplicates_are_hits():
+    seen = SeenSales(capacity=3)
+    assert seen.add(1)
+    assert not seen.add(1)
+    assert seen.stats()['hits'] == 1
+    assert seen.stats()['misses'] == 1
+
+
+def test_capacity_evicts_oldest_first():
+    seen = SeenSales(capacity=2)
+    for sale_id in (1, 2, 3):
+        seen.add(sale_id)
+    assert 1 not in seen
+    assert 2 in seen and 3 in seen
+    assert seen.evictions == 1
+
+
+def test_ttl_expires_old_ids():
+    clock = FakeClock()
+    seen = SeenSales(capacity=10, ttl=5, clock=clock)
+    seen.add(1)
+    clock.now = 3
+    seen.add(2)
+    clock.now = 6
+    assert 1 not in seen
+    assert 2 in seen
+    assert seen.expirations == 1
@@ -0,0 +1,102 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "core")))
+
+from filter_engine import build_filter_index, filter_batch
+from sale import Sale
+from sharded_engine import ShardedFilterEngine
+
+
+def make_sale(sale_id, name, price, exterior="Minimal Wear"):
+    return Sale.from_event({"eventType": "listed", "sale": {
+        "saleId": sale_id, "marketName": f"{name} ({exterior})", "salePrice": price,
+        "wear": 0.1, "pattern": 5, "exterior": exterior}})
+
+
+sales = [
+    make_sale(1, "AK-47 | Redline", 1000),
+    make_sale(2, "AWP | Asiimov", 5000),
+    make_sale(3, "M4A4 | Howl", 200000, "Factory New"),
+    make_sale(4, "Glock-18 | Fade", 30000),
+]
+
+params = {"filters": [
+    {"name": "Howl", "exterior": "Factory New"},
+    {"name": "AK-47", "maxPrice": "500"},
+    {"name": "Asiimov"},
+    {"name": "AK-47"},
+    {"maxPrice": "5000"},
+]}
+
+
+def as_ids(pairs):
+    return [(id(sale), id(config)) for sale, config in pairs]
+
+
+def test_sharded_matches_single_process():
+    with ShardedFilterEngine(workers=2) as engine:
+        engine.update(params)
+        assert len(engine) == 5
+        expected = filter_batch(sales, build_filter_index(params))
+        assert as_ids(engine.filter_batch(sales)) == as_ids(expected)
+        # First match in filter order, even though it lives in the second shard
+        assert engine.filter_batch(sales)[0][1] is params["filters"][3]
+
+
+def test_update_and_worker_restart():
+    with ShardedFilterEngine(workers=2) as engine:
+        engine.update(params)
+        engine.update({"filters": [{"name": "Glock"}]})
+        assert [sale.sale_id for sale, _ in engine.filter_batch(sales)] == [4]
+
+        process, _ = engine._shards[0]
+        process.kill()
+        process.join()
+        assert [sale.sale_id for sale, _ in engine.filter_batch(sales)] == [4]
+        assert engine.stats()["restarts"] == 1
+        assert engine.stats()["alive"] == 2
+
+
+def test_failed_update_keeps_previous_filters():
+    with ShardedFilterEngine(workers=2) as engine:
+        engine.update(params)
+        previous = engine._configs
+        distribute = engine._distribute
+
+        def broken(configs=None):
+            if configs is not None and configs is not previous:
+                raise EOFError("worker died")
+            distribute(configs)
+
+        engine._distribute = broken
+        try:
+            engine.update({"filters": [{"name": "Glock"}]})
+        except EOFError:
+            pass
+        else:
+            raise AssertionError("failed update was not reported")
+        engine._distribute = distribute
+
+        assert engine._configs is previous
+        assert as_ids(engine.filter_batch(sales)) == as_ids(filter_batch(sales, build_filter_index(params)))
+
+
+def test_workers_do_not_import_the_main_script(tmp_path):
+    # Stand-in for data_parser.py: a main script with import side effects
+    script = tmp_path / "monitor.py"
+    script.write_text(textwrap.dedent(f"""
+        import sys
+        sys.path.append({os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "core")!r})
+        print("main imported", flush=True)
+
+        if __name__ == "__main__":
+            from sharded_engine import ShardedFilterEngine
+            with ShardedFilterEngine(workers=2) as engine:
+                engine.update({{"filters": [{{"name": "AK-47"}}]}})
+    """))
+    output = subprocess.run([sys.executable, str(script)], capture_output=True, text=True, timeout=60)
+    assert output.returncode == 0, output.stderr
+    assert output.stdout.count("main imported") == 1
@@ -0,0 +1,106 @@
+import sys
+import os
+import asyncio
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "core")))
+
+from supervisor import Supervisor, TaskWorker, Worker, FeedLiveness
+
+
+class FakeWorker(Worker):
+    def __init__(self, events, generation=0, ready=True):
+        self.name = 'fake'
+        self.events = events
+        self.generation = generation
+        self.is_ready = ready
+        self.broken = False
+
+    async def start(self):
+        self.events.append(('start', self.generation))
+
+    async def ready(self, timeout):
+        return self.is_ready
+
+    async def stop(self):
+        self.events.append(('stop', self.generation))
+
+    def health(self):
+        return "broken" if self.broken else None
+
+    def replacement(self):
+        return FakeWorker(self.events, self.generation + 1, self.is_ready)
+
+
+def test_overlap_handover_starts_new_before_stopping_old():
+    events = []
+    worker = FakeWorker(events)
+    supervisor = Supervisor()
+    supervisor.add(worker)
+    worker.broken = True
+
+    asyncio.run(supervisor.check())
+
+    assert events == [('start', 1), ('stop', 0)]
+    assert supervisor.workers['fake'].generation == 1
+    assert supervisor.stats()['fake']['restarts'] == 1
+    assert supervisor.stats()['fake']['last_reason'] == "broken"
+
+
+def test_failed_handover_keeps_old_worker_and_backs_off():
+    events = []
+    worker = FakeWorker(events, ready=False)
+    supervisor = Supervisor(base_backoff=60)
+    supervisor.add(worker)
+    worker.broken = True
+
+    async def run():
+        await supervisor.check()
+        await supervisor.check()  # still inside the backoff window
+
+    asyncio.run(run())
+
+    assert supervisor.workers['fake'] is worker
+    assert events == [('start', 1), ('stop', 1)]
+    assert supervisor.stats()['fake']['failed_restarts'] == 1
+
+
+def test_task_worker_restarts_exited_task():
+    runs = []
+
+    async def job():
+        runs.append(1)
+
+    async def run():
+        supervisor = Supervisor()
+        supervisor.add(TaskWorker('job', job))
+        await supervisor.workers['job'].start()
+        await asyncio.sleep(0)
+        await supervisor.check()
+        await asyncio.sleep(0)
+        await supervisor.stop()
+        return supervisor.stats()
+
+    stats = asyncio.run(run())
+    assert len(runs) == 2
+    assert stats['job']['restarts'] == 1
+
+
+def test_feed_liveness_reports_stall():
+    liveness = FeedLiveness()
+    liveness.last_ok -= 100
+    assert "no successful feed response" in liveness.stalled(ok_timeout=30, event_timeout=300)
+    liveness.mark_ok()
+    assert liveness.stalled(ok_timeout=30, event_timeout=300) is None
+
+
+def test_worker_without_stop_fails_when_created():
+    class Incomplete(Worker):
+        async def start(self):
+            pass
+
+    try:
+        Incomplete()
+    except TypeError as e:
+        assert 'stop' in str(e)
+    else:
+        raise AssertionError("missing stop() was not rejected")